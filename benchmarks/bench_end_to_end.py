@@ -0,0 +1,219 @@
+"""
+End-to-end benchmark of the HTTP entry points against a local UBA stub and in-memory sinks.
+
+    python benchmarks/bench_end_to_end.py --stations 5 --components 5 --hours 24 --runs 5
+    python benchmarks/bench_end_to_end.py --entry main_async --stations 50
+    python benchmarks/bench_end_to_end.py --sink local --stations 400 --hours 168
+    python benchmarks/bench_end_to_end.py --compare benchmarks/results/<commit>.json
+
+Each run gets fresh sinks, either in memory or the local backend (directory
+archive + DuckDB warehouse in a temp dir), so the freshness probe and work
+queue start empty. Timed runs are followed by one extra run
+under tracemalloc for peak memory. Results are written to
+benchmarks/results/<commit>.json for comparison between commits.
+"""
+import argparse
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS = Path(__file__).resolve().parent / "results"
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "tests"))
+
+import flask
+import main
+from config import constants
+from services.api_client import LuftdatenAPIClient
+from services.async_api_client import AsyncLuftdatenAPIClient
+from services.local_archive import LocalArchive
+from services.local_warehouse import LocalWarehouse
+from fake_gcs import FakeGCS
+from uba_stub import UBAStub
+from payloads import COMPONENTS
+
+
+class MemoryBigQuery:
+    """BigQueryClient stand-in that drains the rows it is given and counts them per table"""
+
+    def __init__(self):
+        self.rows = Counter()
+        self.loads = 0
+
+    def load_table(self, *, rows, table_id, schema, write_disposition="WRITE_TRUNCATE"):
+        self.rows[table_id.split("$")[0]] += sum(1 for _ in rows)
+        self.loads += 1
+
+    def close(self):
+        pass
+
+
+class BenchRequest:
+    args = {}
+    headers = {}
+
+
+def stub_components(count: int) -> dict:
+    """UBA-shaped components: the real ones first, then synthetic ids"""
+    components = [(c["id"], c["code"], c["unit"]) for c in COMPONENTS]
+    components += [(100 + i, f"X{i}", "µg/m³") for i in range(max(0, count - len(components)))]
+    return {code: [str(cid), code, code, unit, code] for cid, code, unit in components[:count]}
+
+
+def load_recorded(directory: Path) -> dict:
+    """Recorded bodies named like UBAStub.recorded_key with '/' replaced by '_'"""
+    return {path.stem.replace("_", "/"): json.loads(path.read_text())
+            for path in sorted(directory.glob("*.json"))}
+
+
+@contextmanager
+def offline_pipeline(stub: UBAStub, gcs, bq):
+    """Point the entry points at the stub and the given sinks"""
+    saved = (main.build_archive, main.build_bigquery_sink,
+             LuftdatenAPIClient.BASE_URL, AsyncLuftdatenAPIClient.BASE_URL, dict(constants.CONFIG))
+    main.build_archive = lambda: gcs
+    main.build_bigquery_sink = lambda: bq
+    LuftdatenAPIClient.BASE_URL = AsyncLuftdatenAPIClient.BASE_URL = stub.url
+    # Ingest every stub station through the station index
+    constants.CONFIG["station_selection"] = {"bbox": [-90, -180, 90, 180]}
+    constants.CONFIG["run_budget_seconds"] = 10 ** 6
+    try:
+        yield
+    finally:
+        (main.build_archive, main.build_bigquery_sink,
+         LuftdatenAPIClient.BASE_URL, AsyncLuftdatenAPIClient.BASE_URL, config) = saved
+        constants.CONFIG.clear()
+        constants.CONFIG.update(config)
+
+
+def local_sinks():
+    root = Path(tempfile.mkdtemp(prefix="bench-sink-"))
+    return LocalArchive(root / "archive"), LocalWarehouse(root / "warehouse.duckdb")
+
+
+def run_once(app: flask.Flask, stub: UBAStub, entry: str, sink: str = "memory",
+             trace_memory: bool = False) -> dict:
+    gcs, bq = local_sinks() if sink == "local" else (FakeGCS(), MemoryBigQuery())
+    stub.requests.clear()
+    with offline_pipeline(stub, gcs, bq), app.app_context():
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        response, status = getattr(main, entry)(BenchRequest())
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+
+    if sink == "local":
+        # The entry point closed the warehouse; reopen the file to count
+        warehouse = LocalWarehouse(bq.path)
+        raw_rows = warehouse.query("SELECT COUNT(*) AS n FROM `airquality.raw_measures`")[0]["n"]
+        warehouse.close()
+        blobs = len(gcs.list_blobs(""))
+    else:
+        raw_rows, blobs = bq.rows["raw_measures"], len(gcs.blobs)
+    body = response.get_json()
+    if status != 200 or body["status"] != "success":
+        raise RuntimeError(f"{entry} failed: {body.get('message', body)}")
+    return {
+        "seconds": seconds,
+        "rows": raw_rows,
+        "components_processed": body["components_processed"],
+        "api_calls": dict(Counter(endpoint for endpoint, _ in stub.requests)),
+        "archived_blobs": blobs,
+        "peak_bytes": peak,
+        "metrics": body.get("metrics"),
+    }
+
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def benchmark(args) -> dict:
+    recorded = load_recorded(Path(args.recorded)) if args.recorded else None
+    station_ids = range(100, 100 + args.stations)
+    app = flask.Flask("bench")
+    constants.CONFIG["measure_hours_back"] = args.hours
+    with UBAStub(station_ids=station_ids, components=stub_components(args.components),
+                 hours=args.hours, recorded=recorded) as stub:
+        run_once(app, stub, args.entry, args.sink)  # warm-up: imports, station index, pool
+        runs = [run_once(app, stub, args.entry, args.sink) for _ in range(args.runs)]
+        memory = run_once(app, stub, args.entry, args.sink, trace_memory=True)
+
+    seconds = [run["seconds"] for run in runs]
+    median = statistics.median(seconds)
+    return {
+        "commit": git_commit(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "params": {"entry": args.entry, "sink": args.sink, "stations": args.stations,
+                   "components": args.components, "hours": args.hours, "runs": args.runs, "recorded": args.recorded},
+        "results": {
+            "median_seconds": round(median, 4),
+            "runs_per_second": round(1 / median, 3),
+            "rows_per_run": runs[-1]["rows"],
+            "rows_per_second": round(runs[-1]["rows"] / median, 1),
+            "peak_memory_mb": round(memory["peak_bytes"] / 2 ** 20, 2),
+            "api_calls_per_run": runs[-1]["api_calls"],
+            "components_processed": runs[-1]["components_processed"],
+            "archived_blobs": runs[-1]["archived_blobs"],
+            "stage_seconds": {stage: span["seconds"]
+                              for stage, span in runs[-1]["metrics"]["spans"].items()},
+        },
+    }
+
+
+def compare(current: dict, baseline: dict) -> None:
+    print(f"{'metric':<22} {baseline['commit']:>14} {current['commit']:>14} {'change':>9}")
+    for key in ("median_seconds", "runs_per_second", "rows_per_second", "peak_memory_mb"):
+        old, new = baseline["results"][key], current["results"][key]
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        print(f"{key:<22} {old:>14} {new:>14} {change:>9}")
+    old_calls = sum(baseline["results"]["api_calls_per_run"].values())
+    new_calls = sum(current["results"]["api_calls_per_run"].values())
+    print(f"{'api_calls_per_run':<22} {old_calls:>14} {new_calls:>14}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entry", choices=["main", "main_async"], default="main")
+    parser.add_argument("--sink", choices=["memory", "local"], default="memory")
+    parser.add_argument("--stations", type=int, default=5)
+    parser.add_argument("--components", type=int, default=5)
+    parser.add_argument("--hours", type=int, default=24)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--recorded", help="directory of recorded UBA responses to replay")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    result = benchmark(args)
+    print(json.dumps(result["results"], indent=2))
+
+    if args.compare:
+        compare(result, json.loads(Path(args.compare).read_text()))
+    if not args.no_save:
+        RESULTS.mkdir(exist_ok=True)
+        path = RESULTS / f"{result['commit']}.json"
+        path.write_text(json.dumps(result, indent=2))
+        print(f"Saved {path.relative_to(ROOT)}")
@@ -0,0 +1,79 @@
+"""
+Measure the CPU a run spends on JSON with the stdlib path versus utils.json_codec.
+
+    python benchmarks/bench_json_codec.py --stations 20 --hours 24
+    python benchmarks/bench_json_codec.py --stations 5 --hours 8760 --repeat 5
+
+One run is modelled as, per (station, component) response: decode the body,
+archive the payload, then serialize every validated row into the NDJSON load
+file. The stdlib path re-encodes the payload for the archive; the codec path
+hands the original response bytes through. Times are process CPU seconds.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.measures_validator import MeasuresValidator
+from utils import json_codec
+from utils.json_codec import JSONPayload
+from payloads import COMPONENTS, measures_payload
+
+
+def stdlib_run(bodies, rows):
+    for body, payload_rows in zip(bodies, rows):
+        payload = json.loads(body)
+        json.dumps(payload).encode()
+        for row in payload_rows:
+            json.dumps(row, ensure_ascii=False).encode("utf-8")
+
+
+def codec_run(bodies, rows):
+    for body, payload_rows in zip(bodies, rows):
+        payload = JSONPayload.from_bytes(body)
+        json_codec.dumps(payload)
+        for row in payload_rows:
+            json_codec.dumps(row)
+
+
+def cpu_seconds(fn, *args, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.process_time()
+        fn(*args)
+        timings.append(time.process_time() - started)
+    return min(timings)
+
+
+def run(stations: int, hours: int, repeat: int) -> None:
+    validator = MeasuresValidator()
+    bodies, rows = [], []
+    for station_id in range(100, 100 + stations):
+        for component in COMPONENTS:
+            payload = measures_payload(station_id, component["id"], hours)
+            bodies.append(json.dumps(payload).encode())
+            rows.append(validator.validate(component, station_id,
+                                           payload["data"][str(station_id)]).rows)
+    total_bytes = sum(map(len, bodies))
+    total_rows = sum(map(len, rows))
+    print(f"{len(bodies)} responses, {total_bytes / 2 ** 20:.1f} MiB, {total_rows} rows, "
+          f"codec backend: {json_codec.BACKEND}")
+
+    baseline = cpu_seconds(stdlib_run, bodies, rows, repeat=repeat)
+    codec = cpu_seconds(codec_run, bodies, rows, repeat=repeat)
+    print(f"{'path':>8} {'cpu s/run':>10} {'MiB/s':>9}")
+    for name, seconds in (("stdlib", baseline), ("codec", codec)):
+        print(f"{name:>8} {seconds:>10.4f} {total_bytes / 2 ** 20 / seconds:>9.1f}")
+    print(f"saved {baseline - codec:.4f} cpu s per run ({baseline / codec:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--stations", type=int, default=20)
+    parser.add_argument("--hours", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.stations, args.hours, args.repeat)
@@ -0,0 +1,44 @@
+"""
+Measure how the ParallelTransformer scales from 1 to N worker processes.
+
+    python benchmarks/bench_parallel_transform.py --stations 20 --hours 8760 --workers 1 2 4
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.parallel_transformer import ParallelTransformer
+from payloads import backfill_tasks
+
+
+def run(stations: int, hours: int, workers: list, chunk_rows: int, repeat: int) -> None:
+    tasks = backfill_tasks(stations, hours)
+    total = sum(len(task[2]) for task in tasks)
+    print(f"{len(tasks)} payloads, {total} measures")
+    print(f"{'workers':>8} {'best s':>9} {'rows/s':>12} {'speedup':>8}")
+
+    baseline = None
+    for n in workers:
+        transformer = ParallelTransformer(workers=n, chunk_rows=chunk_rows)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            batch, _, _ = transformer.transform(tasks)
+            timings.append(time.perf_counter() - started)
+        best = min(timings)
+        baseline = baseline or best
+        print(f"{n:>8} {best:>9.3f} {len(batch) / best:>12,.0f} {baseline / best:>7.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--stations", type=int, default=10)
+    parser.add_argument("--hours", type=int, default=24 * 365)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.stations, args.hours, args.workers, args.chunk_rows, args.repeat)
@@ -0,0 +1,96 @@
+"""Synthetic, UBA-shaped payload generator shared by the benchmarks."""
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Tuple
+
+COMPONENTS = [
+    {"id": 1, "code": "PM10", "unit": "µg/m³"},
+    {"id": 2, "code": "CO", "unit": "mg/m³"},
+    {"id": 3, "code": "O3", "unit": "µg/m³"},
+    {"id": 5, "code": "NO2", "unit": "µg/m³"},
+    {"id": 9, "code": "PM2", "unit": "µg/m³"},
+]
+
+START = datetime(2024, 1, 1)
+
+
+def uba_timestamp(ts: datetime) -> str:
+    """Format like the UBA API, which writes midnight as 24:00:00 of the previous day"""
+    if ts.hour == 0 and ts.minute == 0:
+        return (ts - timedelta(days=1)).strftime("%Y-%m-%d") + " 24:00:00"
+    return ts.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def station_series(station_id: int, component_id: int, hours: int,
+                   scope_id: int = 2, start: datetime = START,
+                   null_ratio: float = 0.02, seed: int = 0) -> Dict[str, list]:
+    """{timestamp: [component, scope, value, end, index]} for one station"""
+    rng = random.Random(seed * 1_000_003 + station_id * 101 + component_id)
+    series = {}
+    for h in range(hours):
+        begin = start + timedelta(hours=h)
+        value = None if rng.random() < null_ratio else round(rng.uniform(1, 80), 1)
+        series[uba_timestamp(begin)] = [
+            component_id, scope_id, value,
+            uba_timestamp(begin + timedelta(hours=1)),
+            str(rng.randint(0, 4)) if value is not None else None
+        ]
+    return series
+
+
+def measures_payload(station_id: int, component_id: int, hours: int,
+                     **kwargs) -> Dict[str, Any]:
+    """Full measures/json response body for one (station, component)"""
+    return {
+        "request": {"station": str(station_id), "component": str(component_id)},
+        "indices": {"data": {"station id": {"date start": [
+            "component id", "scope id", "value", "date end", "index"]}}},
+        "data": {str(station_id): station_series(station_id, component_id, hours, **kwargs)},
+    }
+
+
+def backfill_tasks(stations: int, hours: int, components: List[Dict[str, Any]] = None
+                   ) -> List[Tuple[Dict[str, Any], int, Dict[str, list]]]:
+    """(component, station_id, station_data) tasks as fed to ParallelTransformer"""
+    return [
+        (component, station_id, station_series(station_id, component["id"], hours))
+        for station_id in range(100, 100 + stations)
+        for component in (components or COMPONENTS)
+    ]
+
+
+def timestamps(rows: int, start: datetime = START) -> List[str]:
+    """Hourly UBA timestamps, every 24th one written as 24:00:00"""
+    return [uba_timestamp(start + timedelta(hours=h)) for h in range(rows)]
+
+
+def components_payload(rows: int) -> Dict[str, Any]:
+    """components/json body with ``rows`` components plus the meta keys"""
+    body: Dict[str, Any] = {"count": rows, "indices": ["0: Id", "1: Code", "2: Symbol",
+                                                       "3: Unit", "4: Translated name"]}
+    for i in range(rows):
+        code = COMPONENTS[i]["code"] if i < len(COMPONENTS) else f"X{i}"
+        body[code] = [str(i + 1), code, code, "µg/m³", f"Component {i}"]
+    return body
+
+
+def stations_payload(rows: int, seed: int = 0) -> Dict[str, Any]:
+    """stations/json body; about 1 in 50 stations lacks coordinates"""
+    rng = random.Random(seed)
+    data = {}
+    for i in range(rows):
+        located = rng.random() >= 0.02
+        data[str(i)] = [
+            str(i + 1), f"DE{i:05}", f"Station {i}", "Stadt", "", "2000-01-01", None,
+            f"{rng.uniform(5.8, 15.1):.6f}" if located else None,
+            f"{rng.uniform(47.2, 55.1):.6f}" if located else "",
+        ]
+    return {"request": {}, "indices": [], "count": rows, "data": data}
+
+
+def scopes_payload(rows: int) -> Dict[str, Any]:
+    """scopes/json body with ``rows`` scopes"""
+    body: Dict[str, Any] = {"count": rows, "indices": []}
+    for i in range(rows):
+        body[str(i + 1)] = [str(i + 1), f"S{i}", "hour", "3600", "x", f"Scope {i}", "y"]
+    return body
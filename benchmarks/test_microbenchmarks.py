@@ -0,0 +1,142 @@
+"""
+Microbenchmarks for the transform and parse hot paths (pytest-benchmark).
+
+Skipped unless RUN_BENCHMARKS=1. Sizes run from 10^3 rows up to
+BENCH_MAX_ROWS (default 10^5, at most 10^7):
+
+    RUN_BENCHMARKS=1 python -m pytest benchmarks -q
+    RUN_BENCHMARKS=1 BENCH_MAX_ROWS=10000000 python -m pytest benchmarks --benchmark-autosave
+    RUN_BENCHMARKS=1 python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:15%
+
+Every benchmark also checks its mean time per row against
+thresholds.json and fails when it is exceeded.
+"""
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from config import constants
+from core.data_transformer import DataTransformer
+from core.measures_processor import MeasuresProcessor
+from core.measures_validator import MeasuresValidator, build_columns
+from utils.time_utils import parse_airquality_timestamp, parse_airquality_timestamps
+from payloads import (components_payload, measures_payload, scopes_payload,
+                      stations_payload, timestamps)
+
+pytestmark = pytest.mark.skipif(os.getenv("RUN_BENCHMARKS") != "1",
+                                reason="set RUN_BENCHMARKS=1 to run microbenchmarks")
+
+MAX_ROWS = int(os.getenv("BENCH_MAX_ROWS", 10 ** 5))
+ROW_COUNTS = [10 ** e for e in range(3, 8) if 10 ** e <= MAX_ROWS]
+THRESHOLDS = json.loads((Path(__file__).parent / "thresholds.json").read_text())
+STATION_ID = constants.CONFIG["station_id"]
+
+
+class NullGCS:
+    def upload_json(self, data, blob_name):
+        return True
+
+
+class StaticAPI:
+    """Serves one measures payload for every request"""
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def get_measures(self, component_id, station_id, hours_back=24, scope_id=2, now=None):
+        return self.payload
+
+
+class NullBQ:
+    def load_table(self, *, rows, table_id, schema, write_disposition):
+        for _ in rows:
+            pass
+
+
+def check_threshold(benchmark, name: str, rows: int) -> None:
+    ns_per_row = benchmark.stats.stats.mean / rows * 1e9
+    benchmark.extra_info["ns_per_row"] = round(ns_per_row, 1)
+    limit = THRESHOLDS[name]
+    assert ns_per_row <= limit, f"{name}: {ns_per_row:.0f} ns/row exceeds threshold {limit} ns/row"
+
+
+@lru_cache(maxsize=None)
+def _measures(rows: int):
+    return measures_payload(STATION_ID, 1, rows, null_ratio=0.02)
+
+
+@lru_cache(maxsize=None)
+def _timestamps(rows: int):
+    return timestamps(rows)
+
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+def test_transform_stations(benchmark, rows):
+    payload = stations_payload(rows)
+    result = benchmark(DataTransformer.transform_stations, payload)
+    assert len(result) == rows
+    check_threshold(benchmark, "transform_stations", rows)
+
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+def test_transform_components(benchmark, rows):
+    payload = components_payload(rows)
+    result = benchmark(DataTransformer.transform_components, payload)
+    assert len(result) == rows
+    check_threshold(benchmark, "transform_components", rows)
+
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+def test_transform_scopes(benchmark, rows):
+    payload = scopes_payload(rows)
+    result = benchmark(DataTransformer.transform_scopes, payload)
+    assert len(result) == rows
+    check_threshold(benchmark, "transform_scopes", rows)
+
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+def test_parse_airquality_timestamp(benchmark, rows):
+    stamps = _timestamps(rows)
+    result = benchmark(lambda: [parse_airquality_timestamp(ts) for ts in stamps])
+    assert len(result) == rows
+    check_threshold(benchmark, "parse_airquality_timestamp", rows)
+
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+def test_parse_airquality_timestamps_vectorised(benchmark, rows):
+    stamps = _timestamps(rows)
+    result = benchmark(parse_airquality_timestamps, stamps)
+    assert len(result) == rows
+    check_threshold(benchmark, "parse_airquality_timestamps", rows)
+
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+def test_measures_validate(benchmark, rows):
+    component = {"id": 1, "code": "PM10", "unit": "µg/m³"}
+    station_data = _measures(rows)["data"][str(STATION_ID)]
+    result = benchmark(MeasuresValidator().validate, component, STATION_ID, station_data)
+    assert len(result.rows) + len(result.quarantine) == rows
+    check_threshold(benchmark, "measures_validate", rows)
+
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+def test_build_rows(benchmark, rows):
+    cols = build_columns(STATION_ID, _measures(rows)["data"][str(STATION_ID)])
+    mask = np.ones(rows, dtype=bool)
+    result = benchmark(MeasuresValidator._build_rows, cols, mask)
+    assert len(result) == rows
+    check_threshold(benchmark, "build_rows", rows)
+
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+def test_process_and_load(benchmark, rows, monkeypatch):
+    monkeypatch.setitem(constants.CONFIG, "measure_scopes", [2])
+    processor = MeasuresProcessor(StaticAPI(_measures(rows)), gcs=NullGCS(), bq=NullBQ())
+    component = {"id": 1, "code": "PM10", "unit": "µg/m³"}
+    benchmark(lambda: processor.load_rows(list(processor.process_component(component, set()))))
+    check_threshold(benchmark, "process_and_load", rows)
@@ -11,5 +11,78 @@ CONFIG = {
     "dimension_tables": ["components", "stations", "scopes"],
     "excluded_component_keys": ["count", "indices"],
     "excluded_station_keys": ["request", "count", "indices"],
-    "excluded_scope_keys": ["request", "count", "indices"]
+    "excluded_scope_keys": ["request", "count", "indices"],
+    # dim_scopes ids to ingest; the first one drives availability checks.
+    # 2 = hourly mean, 4 = 8h moving average, 1 = daily mean
+    "measure_scopes": [2, 4, 1],
+    "measure_hours_back": 24,
+    # Rows per BigQuery load job / async pipeline batch; bounds peak memory
+    "load_batch_rows": 5000,
+    "async_queue_batches": 4,
+    # asyncio pipeline: pooled connections and concurrent (station, component) requests
+    "async_pool_size": 100,
+    "async_keepalive_seconds": 30,
+    "async_max_in_flight": 200,
+    # Shared HTTP transport (services/transport.py): keep-alive pools per
+    # upstream reused across sessions and warm invocations, default timeouts
+    "http_pool_connections": 10,
+    "http_pool_maxsize": 32,
+    "http_connect_timeout": 5,
+    "http_read_timeout": 60,
+    "http_keepalive_idle_seconds": 30,
+    # Sinks: "gcp" (GCS + BigQuery) or "local" (directory archive + DuckDB
+    # warehouse under local_sink_root) for offline runs
+    "sink_backend": os.getenv("SINK_BACKEND", "gcp"),
+    "local_sink_root": os.getenv("LOCAL_SINK_ROOT", ".local_sink"),
+    # BigQuery sink: "load" (batch load jobs) or "stream" (Storage Write API)
+    "bq_sink_mode": os.getenv("BQ_SINK_MODE", "load"),
+    "bq_stream_batch_rows": 500,
+    # Process-pool transform for backfills (0 workers = one per CPU)
+    "transform_workers": 0,
+    "transform_chunk_rows": 50000,
+    # Raw archive compaction into daily Parquet partitions
+    "compaction_delete_sources": False,
+    "gcs_io_workers": 16,
+    "replay_load_workers": 4,
+    # Skip runs when the UBA has not published a new hour; the sentinel is
+    # probed with one request and the last N publication delays are kept
+    "freshness_probe_enabled": True,
+    "freshness_sentinel_component": 1,
+    "freshness_delay_window": 48,
+    # Gap repair over raw_measures: scanned days, hours left for late
+    # publication, gaps closer than merge_hours share one request
+    "gap_lookback_days": 7,
+    "gap_settle_hours": 3,
+    "gap_merge_hours": 6,
+    "gap_max_window_hours": 72,
+    # Time-budgeted measures runs: stop run_safety_seconds before the budget
+    # and carry unfinished (station, component) work over to the next run
+    "run_budget_seconds": int(os.getenv("RUN_BUDGET_SECONDS", "480")),
+    "run_safety_seconds": 30,
+    "priority_components": ["PM2", "PM10", "NO2"],
+    "scheduler_default_cost_seconds": 5,
+    "scheduler_cost_alpha": 0.3,
+    # Reserved for the final batch load until load times have been measured
+    "scheduler_default_load_seconds": 10,
+    # Rows included in sampled structured logs
+    "log_sample_rows": 3,
+    # On-demand profiling (?profile=1 plus X-Profile-Token matching PROFILE_TOKEN)
+    "profile_token": os.getenv("PROFILE_TOKEN"),
+    "profile_top_entries": 40,
+    "profile_traceback_frames": 1,
+    # Stations to ingest, resolved through the station index:
+    # {"near": [lat, lon], "k": 3, "max_km": 10} or {"bbox": [min_lat, min_lon, max_lat, max_lon]}.
+    # None ingests only station_id.
+    "station_selection": None,
+    # Dashboard reads: results are cached per (query, params) until an ingestion
+    # run rewrites a table they read; least recently used entries are evicted
+    "query_cache_max_entries": 256,
+    "dashboard_current_lookback_hours": 6,
+    "dashboard_default_days": 7,
+    # Plausible [min, max] value per component unit; anything outside is quarantined
+    "measure_value_ranges": {
+        "µg/m³": [0, 2000],
+        "mg/m³": [0, 100],
+        "default": [0, 10000]
+    }
 }
\ No newline at end of file
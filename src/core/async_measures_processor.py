@@ -0,0 +1,107 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Set, Tuple
+from config import constants
+from core.measures_processor import MeasuresProcessor
+from services.async_api_client import AsyncLuftdatenAPIClient
+from services.gcs_uploader import GCSUploader
+from services.bigquery_client import BigQueryClient
+
+
+class AsyncMeasuresProcessor:
+    """
+    asyncio variant of MeasuresProcessor for many stations at once.
+
+    Every (station, component) pair is a task; up to ``max_in_flight`` API
+    requests run concurrently over the client's pooled session. Archive
+    uploads and validation run in worker threads. Validated rows flow through
+    a bounded queue to a single loader that writes BigQuery batches of
+    ``load_batch_rows``; when loading falls behind, producers block on the
+    queue, which caps memory regardless of how many pairs the run covers.
+    """
+
+    def __init__(self, api_client: AsyncLuftdatenAPIClient,
+                 gcs: GCSUploader, bq: BigQueryClient,
+                 station_ids: List[int] = None, max_in_flight: int = None):
+        self.api = api_client
+        self.gcs = gcs
+        self.bq = bq
+        self.utc_now = datetime.now(timezone.utc)
+        self.station_ids = station_ids or [constants.CONFIG["station_id"]]
+        self.scopes = constants.CONFIG["measure_scopes"]
+        self.hours_back = constants.CONFIG["measure_hours_back"]
+        self.max_in_flight = max_in_flight or constants.CONFIG["async_max_in_flight"]
+        self.load_batch_rows = constants.CONFIG["load_batch_rows"]
+        self.queue_batches = constants.CONFIG["async_queue_batches"]
+        # Per-station processors provide the shared archive/validation logic
+        self.stores = {
+            station_id: MeasuresProcessor(None, gcs, bq, station_id=station_id)
+            for station_id in self.station_ids
+        }
+        for store in self.stores.values():
+            store.utc_now = self.utc_now
+
+    async def process_measures(self) -> int:
+        """Orchestrate concurrent measures processing; returns (station, component) successes"""
+        components = MeasuresProcessor.parse_components(await self.api.get_components())
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_batches)
+        loader = asyncio.create_task(self._load_from(queue))
+
+        results = await asyncio.gather(*(
+            self._process_pair(semaphore, queue, station_id, component)
+            for station_id in self.station_ids
+            for component in components
+        ))
+        await queue.put(None)
+        failed = await loader
+
+        processed = {pair for pair in results if pair is not None}
+        return len(processed - failed)
+
+    async def _process_pair(self, semaphore: asyncio.Semaphore, queue: asyncio.Queue,
+                            station_id: int, component: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+        """Fetch all scopes for one (station, component); None if unavailable or failed"""
+        store = self.stores[station_id]
+        try:
+            for scope_id in self.scopes:
+                async with semaphore:
+                    measures = await self.api.get_measures(
+                        component['id'], station_id, hours_back=self.hours_back,
+                        scope_id=scope_id, now=self.utc_now
+                    )
+                # The primary scope doubles as the availability check
+                if scope_id == self.scopes[0] and not measures.get('data', {}).get(str(station_id)):
+                    return None
+                rows = await asyncio.to_thread(store.archive_and_transform, component, scope_id, measures)
+                del measures
+                await queue.put(rows)
+            return station_id, component['id']
+        except Exception as e:
+            logging.error(f"Failed processing {component['code']} "
+                          f"for station {station_id}: {str(e)}")
+            return None
+
+    async def _load_from(self, queue: asyncio.Queue) -> Set[Tuple[int, int]]:
+        """Drain the queue into load batches; returns pairs whose batch failed"""
+        failed: Set[Tuple[int, int]] = set()
+        buffer: List[Dict[str, Any]] = []
+
+        async def flush() -> None:
+            batch = buffer[:]
+            buffer.clear()
+            try:
+                await asyncio.to_thread(self.stores[self.station_ids[0]].load_rows, batch)
+            except Exception as e:
+                logging.error(f"Failed loading {len(batch)} measures: {str(e)}")
+                failed.update((row["station_id"], row["component_id"]) for row in batch)
+
+        while (rows := await queue.get()) is not None:
+            buffer.extend(rows)
+            if len(buffer) >= self.load_batch_rows:
+                await flush()
+        if buffer:
+            await flush()
+        return failed
+
@@ -0,0 +1,101 @@
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Any, Callable, List
+from config import constants
+from services.query_cache import QueryCache, query_cache, cache_key, table_generations
+from services.sinks import ArchiveSink, QueryableTableSink
+
+logger = logging.getLogger(__name__)
+
+CURRENT_AIR_QUALITY_SQL = """
+SELECT rm.component_id, dc.code AS component_code, dc.unit, rm.value,
+       rm.measure_start_time, rm.measure_end_time
+FROM `{project}.{dataset}.raw_measures` rm
+JOIN `{project}.{dataset}.dim_components` dc ON rm.component_id = dc.id
+WHERE rm.station_id = @station_id
+  AND rm.scope_id = @scope_id
+  AND rm.value IS NOT NULL
+  AND rm.measure_start_time >= @since
+QUALIFY ROW_NUMBER() OVER (PARTITION BY rm.component_id ORDER BY rm.measure_start_time DESC) = 1
+ORDER BY component_code
+"""
+
+DAILY_CIGARETTES_SQL = """
+SELECT measurement_day, daily_avg_pm, measure_count, cigarettes_equivalent,
+       cigarette_text, data_quality
+FROM `{project}.{dataset}.v_daily_pm_to_cigarettes`
+WHERE station_id = @station_id
+  AND measurement_day >= @since
+ORDER BY measurement_day DESC
+"""
+
+# Tables each query reads, directly or through the view
+CURRENT_AIR_QUALITY_TABLES = ("raw_measures", "dim_components")
+DAILY_CIGARETTES_TABLES = ("raw_measures", "dim_components")
+
+
+def _json_ready(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value.isoformat() if isinstance(value, (date, datetime)) else value
+            for key, value in row.items()}
+
+
+class DashboardReader:
+    """
+    Read API behind the dashboard: latest values per component and daily
+    cigarette equivalents for a station, served from a QueryCache.
+
+    Query windows start on whole hours/days so repeated views share one
+    cache key; entries are dropped once an ingestion run records a write to
+    a table they read (see services.query_cache.record_table_writes).
+    The warehouse client is only created by ``connect`` on a cache miss.
+    """
+
+    def __init__(self, connect: Callable[[], QueryableTableSink], gcs: ArchiveSink,
+                 cache: QueryCache = None, now: datetime = None):
+        self.connect = connect
+        self.gcs = gcs
+        self.cache = cache or query_cache
+        self.now = now or datetime.now(timezone.utc)
+        self.bq = None
+        self._generations = None
+
+    def current_air_quality(self, station_id: int = None) -> List[Dict[str, Any]]:
+        """Most recent value per component within the configured lookback"""
+        hour = self.now.replace(minute=0, second=0, microsecond=0)
+        since = hour - timedelta(hours=constants.CONFIG["dashboard_current_lookback_hours"])
+        return self._cached(CURRENT_AIR_QUALITY_SQL, CURRENT_AIR_QUALITY_TABLES, {
+            "station_id": station_id or constants.CONFIG["station_id"],
+            "scope_id": constants.CONFIG["measure_scopes"][0],
+            "since": since,
+        })
+
+    def daily_cigarettes(self, station_id: int = None, days: int = None) -> List[Dict[str, Any]]:
+        """Daily PM2.5 averages as cigarette equivalents, newest day first"""
+        days = days or constants.CONFIG["dashboard_default_days"]
+        day = self.now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return self._cached(DAILY_CIGARETTES_SQL, DAILY_CIGARETTES_TABLES, {
+            "station_id": station_id or constants.CONFIG["station_id"],
+            "since": day - timedelta(days=days - 1),
+        })
+
+    def _cached(self, template: str, tables, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        sql = template.format(project=constants.CONFIG["project"],
+                              dataset=constants.CONFIG["bq_dataset"])
+        key = cache_key(sql, params)
+        if self._generations is None:
+            self._generations = table_generations(self.gcs)
+        generation = tuple(self._generations.get(table) for table in tables)
+
+        rows = self.cache.get(key, generation)
+        if rows is None:
+            if self.bq is None:
+                self.bq = self.connect()
+            rows = [_json_ready(row) for row in self.bq.query(sql, params)]
+            self.cache.put(key, generation, rows)
+            logger.info(f"Cached {len(rows)} dashboard rows for {params}")
+        return rows
+
+    def close(self) -> None:
+        if self.bq is not None:
+            self.bq.close()
+            self.bq = None
@@ -4,9 +4,10 @@ from typing import Dict, Any
 from google.cloud import bigquery
 from config import constants, schemas
 from core.data_transformer import DataTransformer
-from services.gcs_uploader import GCSUploader
+from core.station_index import update_station_index
+from utils.instrumentation import log_sample
 from services.api_client import LuftdatenAPIClient
-from services.bigquery_client import BigQueryClient
+from services.sinks import ArchiveSink, TableSink
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -14,7 +15,7 @@ logging.basicConfig(level=logging.INFO)
 
 class DimensionManager:
     def __init__(self, api_client: LuftdatenAPIClient, 
-                 gcs: GCSUploader, bq: BigQueryClient):
+                 gcs: ArchiveSink, bq: TableSink):
         self.api = api_client
         self.gcs = gcs
         self.bq = bq
@@ -43,16 +44,23 @@ class DimensionManager:
         )
         self.gcs.upload_json(data, blob_name)
 
+    def load_snapshot(self, entity: str, data: Dict[str, Any]) -> None:
+        """Replace dim_<entity> with a raw API snapshot (e.g. one read back from the archive)"""
+        self._load_to_bigquery(entity, data)
+
     def _load_to_bigquery(self, entity: str, data: Dict[str, Any]) -> None:
         """Transform and load dimension data to BigQuery"""
         transformer = getattr(DataTransformer, f"transform_{entity}")
         rows = transformer(data)
-        logging.info(f"Transformed rows: {rows}")  # Check field names
+        log_sample(logger, f"Transformed {entity}", rows)
 
         if not rows:
             logging.warning(f"No rows to load for {entity}")
             return
 
+        if entity == "stations":
+            update_station_index(rows)
+
         self.bq.load_table(
             rows=rows,
             table_id=f"dim_{entity}",
@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Tuple
+from config import constants
+from services.api_client import LuftdatenAPIClient
+from utils.instrumentation import metrics
+
+
+class FetchPlanner:
+    """
+    Plans measures requests for one station across several scopes.
+
+    All scopes share a single time window (one fixed ``now``), the API
+    client's pooled session, and the availability check: the payload fetched
+    to test a component against the primary scope is kept and reused as that
+    scope's data instead of being requested a second time.
+    """
+
+    def __init__(self, api_client: LuftdatenAPIClient, station_id: int,
+                 scopes: List[int] = None, hours_back: int = None,
+                 now: datetime = None):
+        self.api = api_client
+        self.station_id = station_id
+        self.scopes = list(scopes or constants.CONFIG["measure_scopes"])
+        self.hours_back = hours_back or constants.CONFIG["measure_hours_back"]
+        self.now = now or datetime.now(timezone.utc)
+        self._payloads: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self._available: Dict[int, bool] = {}
+
+    @property
+    def primary_scope(self) -> int:
+        return self.scopes[0]
+
+    def fetch(self, component_id: int, scope_id: int) -> Dict[str, Any]:
+        """Return the measures payload, requesting it at most once"""
+        key = (component_id, scope_id)
+        if key in self._payloads:
+            metrics.incr("fetch_cache_hits")
+        else:
+            self._payloads[key] = self.api.get_measures(
+                component_id, self.station_id,
+                hours_back=self.hours_back, scope_id=scope_id, now=self.now
+            )
+        return self._payloads[key]
+
+    def take(self, component_id: int, scope_id: int) -> Dict[str, Any]:
+        """Fetch a payload and drop it from the cache once handed out"""
+        payload = self.fetch(component_id, scope_id)
+        self._payloads.pop((component_id, scope_id), None)
+        return payload
+
+    def is_available(self, component_id: int) -> bool:
+        """Check the primary scope once; other scopes are derived from it"""
+        if component_id not in self._available:
+            payload = self.fetch(component_id, self.primary_scope)
+            self._available[component_id] = bool(
+                payload.get('data', {}).get(str(self.station_id))
+            )
+            if not self._available[component_id]:
+                self._payloads.pop((component_id, self.primary_scope), None)
+        return self._available[component_id]
+
@@ -0,0 +1,114 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional
+import numpy as np
+from config import constants
+from services.api_client import LuftdatenAPIClient
+from services.gcs_uploader import GCSUploader
+from utils.time_utils import airquality_timestamp_to_utc
+
+logger = logging.getLogger(__name__)
+
+STATE_BLOB = "state/freshness.json"
+
+
+class FreshnessProbe:
+    """
+    Cheap check whether the UBA has published a newer hour than we ingested.
+
+    One single-scope measures/json request for a sentinel component, over a
+    window ending at the current Berlin hour, gives the latest published hour
+    (UBA local time, converted to UTC). It is compared with the last ingested
+    hour kept in GCS (state/freshness.json). Each time a new hour shows up,
+    the delay between the end of that hour and its first sighting is
+    recorded; the rolling median/p90 of those delays suggest when the next
+    run should fire.
+    """
+
+    def __init__(self, api_client: LuftdatenAPIClient, gcs: GCSUploader,
+                 station_id: int = None, component_id: int = None, now: datetime = None):
+        self.api = api_client
+        self.gcs = gcs
+        self.station_id = station_id or constants.CONFIG["station_id"]
+        self.component_id = component_id or constants.CONFIG["freshness_sentinel_component"]
+        self.now = now or datetime.now(timezone.utc)
+        self.state = self._load_state()
+        self.latest_hour: Optional[datetime] = None
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self.gcs.exists(STATE_BLOB):
+            return self.gcs.download_json(STATE_BLOB)
+        return {"last_ingested_hour": None, "last_empty_probe": None, "delays_minutes": []}
+
+    def _save_state(self) -> None:
+        self.gcs.upload_json(self.state, STATE_BLOB)
+
+    def has_new_data(self) -> bool:
+        """Probe the API; True when an hour newer than the last ingested one is out"""
+        payload = self.api.get_measures(self.component_id, self.station_id, hours_back=1,
+                                        scope_id=constants.CONFIG["measure_scopes"][0],
+                                        now=self.now)
+        station_data = payload.get("data", {}).get(str(self.station_id), {})
+        hours = []
+        for ts in station_data:
+            try:
+                hours.append(airquality_timestamp_to_utc(ts))
+            except ValueError:
+                logger.warning(f"Freshness probe skipped unparseable timestamp {ts}")
+        self.latest_hour = max(hours, default=None)
+
+        last = self.state["last_ingested_hour"]
+        if self.latest_hour is not None and (last is None or self.latest_hour.isoformat() > last):
+            self._record_delay(self.latest_hour)
+            return True
+
+        logger.info(f"No new data since {last} (latest published: {self.latest_hour})")
+        self.state["last_empty_probe"] = self.now.isoformat()
+        self._save_state()
+        return False
+
+    def _record_delay(self, hour: datetime) -> None:
+        """Publication delay of ``hour``, narrowed by the last probe that missed it"""
+        hour_end = hour + timedelta(hours=1)
+        seen = self.now
+        empty = self.state.get("last_empty_probe")
+        if empty and datetime.fromisoformat(empty) > hour_end:
+            seen = datetime.fromisoformat(empty) + (self.now - datetime.fromisoformat(empty)) / 2
+        delay = (seen - hour_end).total_seconds() / 60
+        # Only a sighting right after publication says anything about the delay
+        if 0 <= delay <= 180:
+            window = constants.CONFIG["freshness_delay_window"]
+            self.state["delays_minutes"] = (self.state["delays_minutes"] + [round(delay, 1)])[-window:]
+
+    def mark_ingested(self) -> None:
+        """Store the probed hour as ingested after a successful run"""
+        if self.latest_hour is None:
+            return
+        self.state["last_ingested_hour"] = self.latest_hour.isoformat()
+        self.state["last_empty_probe"] = None
+        self._save_state()
+
+    def publication_delay(self) -> Dict[str, Optional[float]]:
+        delays: List[float] = self.state["delays_minutes"]
+        if not delays:
+            return {"median": None, "p90": None, "samples": 0}
+        return {"median": float(np.median(delays)),
+                "p90": float(np.percentile(delays, 90)),
+                "samples": len(delays)}
+
+    def next_run_at(self) -> Optional[datetime]:
+        """End of the current hour plus the p90 publication delay"""
+        p90 = self.publication_delay()["p90"]
+        if p90 is None:
+            return None
+        hour_end = self.now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        return hour_end + timedelta(minutes=p90)
+
+    def report(self) -> Dict[str, Any]:
+        next_run = self.next_run_at()
+        return {
+            "last_ingested_hour": self.state["last_ingested_hour"],
+            "latest_published_hour": self.latest_hour.isoformat() if self.latest_hour else None,
+            "publication_delay_minutes": self.publication_delay(),
+            "next_run_at": next_run.isoformat() if next_run else None,
+        }
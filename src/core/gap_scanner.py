@@ -0,0 +1,169 @@
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterable, List, Tuple
+import numpy as np
+from config import constants
+from core.measures_processor import MeasuresProcessor
+from services.api_client import LuftdatenAPIClient
+from services.bigquery_client import BigQueryClient
+from services.gcs_uploader import GCSUploader
+from utils.batching import batched
+
+logger = logging.getLogger(__name__)
+
+PRESENT_HOURS_SQL = """
+SELECT DISTINCT
+  station_id,
+  component_id,
+  TIMESTAMP_DIFF(TIMESTAMP_TRUNC(measure_start_time, HOUR), @window_start, HOUR) AS hour
+FROM `{project}.{dataset}.raw_measures`
+WHERE scope_id = @scope_id
+  AND station_id IN UNNEST(@station_ids)
+  AND measure_start_time >= @window_start
+  AND measure_start_time < @window_end
+"""
+
+
+@dataclass
+class HourBitmap:
+    """Presence of hourly measures for one (station, component), one bit per hour"""
+    bits: np.ndarray    # packed uint8
+
+    @classmethod
+    def from_hours(cls, hours: List[int], size: int) -> "HourBitmap":
+        present = np.zeros(size, dtype=bool)
+        present[np.asarray(hours, dtype=np.int64)] = True
+        return cls(np.packbits(present))
+
+    def missing_runs(self, size: int) -> List[Tuple[int, int]]:
+        """Inclusive (first, last) hour offsets of each run of missing hours"""
+        missing = ~np.unpackbits(self.bits, count=size).astype(bool)
+        edges = np.diff(np.concatenate(([0], missing.view(np.int8), [0])))
+        starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1
+        return list(zip(starts.tolist(), ends.tolist()))
+
+
+@dataclass
+class FetchWindow:
+    station_id: int
+    component_id: int
+    first_hour: int
+    last_hour: int
+    missing: List[int]
+
+
+class GapScanner:
+    """
+    Finds and refetches missing hourly measures in raw_measures.
+
+    One query returns the hours present per (station, component) for the
+    primary scope over the last ``lookback_days``; each pair becomes a packed
+    HourBitmap. Runs of missing hours closer than ``merge_hours`` are merged
+    and windows are capped at ``max_window_hours``, giving the fewest API
+    requests that cover every gap. The newest ``settle_hours`` are ignored as
+    not yet published. Only rows for the missing hours are loaded.
+
+    Pairs without a single row in the window are only repaired when the
+    station currently reports the component, so components a station never
+    measures cost one availability request rather than full-window refetches.
+    """
+
+    def __init__(self, api_client: LuftdatenAPIClient, gcs: GCSUploader, bq: BigQueryClient,
+                 station_ids: List[int] = None, lookback_days: int = None,
+                 now: datetime = None):
+        self.api = api_client
+        self.gcs = gcs
+        self.bq = bq
+        self.station_ids = station_ids or [constants.CONFIG["station_id"]]
+        self.scope_id = constants.CONFIG["measure_scopes"][0]
+        self.merge_hours = constants.CONFIG["gap_merge_hours"]
+        self.max_window_hours = constants.CONFIG["gap_max_window_hours"]
+        lookback = lookback_days or constants.CONFIG["gap_lookback_days"]
+        now = now or datetime.now(timezone.utc)
+        self.window_end = (now.replace(minute=0, second=0, microsecond=0)
+                           - timedelta(hours=constants.CONFIG["gap_settle_hours"]))
+        self.window_start = self.window_end - timedelta(days=lookback)
+        self.size = lookback * 24
+        self.stores: Dict[int, MeasuresProcessor] = {}
+
+    def _store(self, station_id: int) -> MeasuresProcessor:
+        if station_id not in self.stores:
+            self.stores[station_id] = MeasuresProcessor(self.api, self.gcs, self.bq, station_id=station_id)
+        return self.stores[station_id]
+
+    def scan(self, component_ids: Iterable[int] = ()) -> Dict[Tuple[int, int], HourBitmap]:
+        """
+        Bitmap of present hours per (station, component). Pairs of
+        station_ids x component_ids without a single row in the window get an
+        empty bitmap (one long gap) when the component is available for the
+        station, and are left out otherwise.
+        """
+        rows = self.bq.query(
+            PRESENT_HOURS_SQL.format(project=self.bq.project, dataset=self.bq.dataset_id),
+            {"scope_id": self.scope_id, "station_ids": self.station_ids,
+             "window_start": self.window_start, "window_end": self.window_end}
+        )
+        hours: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for row in rows:
+            hours[(row["station_id"], row["component_id"])].append(row["hour"])
+        for station_id in self.station_ids:
+            for component_id in component_ids:
+                if ((station_id, component_id) not in hours
+                        and self._store(station_id).component_available(component_id)):
+                    hours[(station_id, component_id)] = []
+        return {key: HourBitmap.from_hours(present, self.size) for key, present in hours.items()}
+
+    def plan(self, bitmaps: Dict[Tuple[int, int], HourBitmap]) -> List[FetchWindow]:
+        """Group missing hours into the fewest contiguous request windows"""
+        windows = []
+        for (station_id, component_id), bitmap in sorted(bitmaps.items()):
+            current = None
+            # Greedy sweep: extend the open window while the gap stays small and it fits the cap
+            for first, last in bitmap.missing_runs(self.size):
+                for hour in range(first, last + 1):
+                    if (current is not None and hour - current.last_hour - 1 <= self.merge_hours
+                            and hour - current.first_hour < self.max_window_hours):
+                        current.last_hour = hour
+                        current.missing.append(hour)
+                    else:
+                        current = FetchWindow(station_id, component_id, hour, hour, [hour])
+                        windows.append(current)
+        return windows
+
+    def repair(self) -> Dict[str, int]:
+        """Scan, plan and refetch; returns summary counts"""
+        components = {c["id"]: c for c in MeasuresProcessor.parse_components(self.api.get_components())}
+        windows = self.plan(self.scan(components))
+
+        summary = {"gaps": sum(len(w.missing) for w in windows), "windows": len(windows),
+                   "failed_windows": 0, "rows": 0}
+        for window in windows:
+            try:
+                summary["rows"] += self._refetch(self._store(window.station_id), components, window)
+            except Exception as e:
+                summary["failed_windows"] += 1
+                logger.error(f"Refetch failed for station {window.station_id} component "
+                             f"{window.component_id} hours {window.first_hour}-{window.last_hour}: {str(e)}")
+        logger.info(f"Gap repair {self.window_start.isoformat()}..{self.window_end.isoformat()}: {summary}")
+        return summary
+
+    def _refetch(self, store: MeasuresProcessor, components: Dict[int, Dict[str, Any]],
+                 window: FetchWindow) -> int:
+        component = components.get(window.component_id, {
+            "id": window.component_id, "code": str(window.component_id), "unit": None})
+        measures = self.api.get_measures_window(
+            window.component_id, window.station_id,
+            start=self._hour(window.first_hour), end=self._hour(window.last_hour),
+            scope_id=self.scope_id
+        )
+        wanted = {self._hour(h).strftime("%Y-%m-%dT%H") for h in window.missing}
+        rows = [row for row in store.archive_and_transform(component, self.scope_id, measures)
+                if row["measure_start_time"][:13] in wanted]
+        for batch in batched(rows, store.load_batch_rows):
+            store.load_rows(batch)
+        return len(rows)
+
+    def _hour(self, offset: int) -> datetime:
+        return self.window_start + timedelta(hours=offset)
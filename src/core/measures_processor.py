@@ -1,42 +1,76 @@
 import logging
 from datetime import datetime, timezone
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator, Set
 from config import constants, schemas
-from google.cloud import bigquery
 from tenacity import retry, stop_after_attempt, wait_exponential
-from services.gcs_uploader import GCSUploader
 from services.api_client import LuftdatenAPIClient
-from services.bigquery_client import BigQueryClient
-from utils.time_utils import parse_airquality_timestamp
+from services.sinks import ArchiveSink, TableSink
+from core.measures_validator import MeasuresValidator
+from core.fetch_planner import FetchPlanner
+from utils.batching import batched
+from utils.instrumentation import metrics
 
 
 class MeasuresProcessor:
+    """
+    Fetches, archives, validates and loads measures for one station.
+
+    Besides process_measures, the steps are public so other drivers
+    (AsyncMeasuresProcessor, WorkScheduler, GapScanner, ReplayEngine) can
+    compose them: parse_components/fetch_components, component_available,
+    process_component, archive_and_transform (upload_raw_measures +
+    transform) and load_rows.
+    """
+
     def __init__(self, api_client: LuftdatenAPIClient,
-                 gcs: GCSUploader, bq: BigQueryClient):
+                 gcs: ArchiveSink, bq: TableSink, station_id: int = None):
         self.api = api_client
         self.gcs = gcs
         self.bq = bq
         self.utc_now = datetime.now(timezone.utc)
-        self.station_id = constants.CONFIG["station_id"]
+        self.station_id = station_id or constants.CONFIG["station_id"]
+        self.validator = MeasuresValidator()
+        self.planner = FetchPlanner(api_client, self.station_id, now=self.utc_now)
+        self.load_batch_rows = constants.CONFIG["load_batch_rows"]
 
     def process_measures(self) -> int:
-        """Orchestrate measures processing pipeline"""
-        components = self._get_valid_components()
-        return sum(
-            self._process_component(component)
-            for component in components
+        """
+        Orchestrate measures processing as a pull-based generator pipeline:
+        components -> fetch -> archive -> validate -> batched load.
+
+        Only the payload currently being handled and one load batch are held
+        in memory; the next component is fetched only once the loader asks
+        for more rows, so peak memory does not grow with the run size.
+        """
+        processed: Set[int] = set()
+        failed: Set[int] = set()
+        rows = (
+            row
+            for component in self._get_valid_components()
+            for row in self.process_component(component, processed)
         )
+        for batch in batched(rows, self.load_batch_rows):
+            try:
+                self.load_rows(batch)
+            except Exception as e:
+                logging.error(f"Failed loading {len(batch)} measures: {str(e)}")
+                failed.update(row["component_id"] for row in batch)
+        return len(processed - failed)
 
-    def _get_valid_components(self) -> List[Dict[str, Any]]:
-        """Get components with availability checks"""
-        return [
-            comp for comp in self._fetch_components()
-            if self._component_available(comp['id'])
-        ]
+    def _get_valid_components(self) -> Iterator[Dict[str, Any]]:
+        """Lazily yield components that pass the availability check"""
+        return (
+            comp for comp in self.fetch_components()
+            if self.component_available(comp['id'])
+        )
 
-    def _fetch_components(self) -> List[Dict[str, Any]]:
+    def fetch_components(self) -> List[Dict[str, Any]]:
         """Retrieve and transform components from API"""
-        raw_components = self.api.get_components()
+        return self.parse_components(self.api.get_components())
+
+    @staticmethod
+    def parse_components(raw_components: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """components/json body -> [{"id", "code", "unit"}] minus excluded keys"""
         return [
             {"id": int(values[0]), "code": key, "unit": values[3]}
             for key, values in raw_components.items()
@@ -44,70 +78,78 @@ class MeasuresProcessor:
         ]
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1))
-    def _component_available(self, component_id: int) -> bool:
+    def component_available(self, component_id: int) -> bool:
         """Check if component has data for our station"""
         try:
-            test_data = self.api.get_measures(component_id, self.station_id)
-            return bool(test_data.get('data', {}).get(str(self.station_id)))
+            return self.planner.is_available(component_id)
         except Exception as e:
             logging.warning(f"Component check failed: {component_id} - {str(e)}")
             return False
 
-    def _process_component(self, component: Dict[str, Any]) -> int:
-        """Process individual component"""
+    def process_component(self, component: Dict[str, Any],
+                          processed: Set[int]) -> Iterator[Dict[str, Any]]:
+        """Archive and validate one component across all scopes, yielding rows"""
         try:
-            measures = self.api.get_measures(component['id'], self.station_id)
-            self._upload_raw_measures(component, measures)
-            self._transform_and_load(component, measures)
-            return 1
+            for scope_id in self.planner.scopes:
+                measures = self.planner.take(component['id'], scope_id)
+                rows = self.archive_and_transform(component, scope_id, measures)
+                del measures
+                yield from rows
+            processed.add(component['id'])
         except Exception as e:
             logging.error(f"Failed processing {component['code']}: {str(e)}")
-            return 0
 
-    def _upload_raw_measures(self, component: Dict[str, Any],
-                            measures: Dict[str, Any]) -> None:
+    def archive_and_transform(self, component: Dict[str, Any], scope_id: int,
+                              measures: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Archive one raw payload, then validate it into load-ready rows"""
+        self.upload_raw_measures(component, scope_id, measures)
+        return self.transform(component, scope_id, measures)
+
+    def upload_raw_measures(self, component: Dict[str, Any], scope_id: int,
+                           measures: Dict[str, Any]) -> None:
         """Upload raw measures to GCS"""
         blob_path = (
             f"raw/station_id={self.station_id}/"
             f"component_id={component['id']}/"
+            f"scope_id={scope_id}/"
             f"year={self.utc_now.year}/month={self.utc_now.month:02}/"
             f"{self.utc_now.isoformat()}.json"
         )
         self.gcs.upload_json(measures, blob_path)
 
-    def _transform_and_load(self, component: Dict[str, Any],
-                           measures: Dict[str, Any]) -> None:
-        """Transform and load measures data"""
-        rows = []
+    def _upload_quarantine(self, component: Dict[str, Any], scope_id: int,
+                           quarantine: List[Dict[str, Any]]) -> None:
+        """Upload rejected measures to GCS for later inspection"""
+        blob_path = (
+            f"quarantine/station_id={self.station_id}/"
+            f"component_id={component['id']}/"
+            f"scope_id={scope_id}/"
+            f"year={self.utc_now.year}/month={self.utc_now.month:02}/"
+            f"{self.utc_now.isoformat()}.json"
+        )
+        self.gcs.upload_json(quarantine, blob_path)
+
+    def transform(self, component: Dict[str, Any], scope_id: int,
+                  measures: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Validate measures into rows, quarantining rejected ones"""
         station_data = measures.get('data', {}).get(str(self.station_id), {})
-        
-        for measure_ts, values in station_data.items():
-            try:
-                row = self._create_measure_row(component, measure_ts, values)
-                rows.append(row)
-            except (ValueError, KeyError) as e:
-                logging.error(f"Skipping invalid measure: {str(e)}")
-
-        if rows:
-            self.bq.load_table(
-                rows=rows,
-                table_id="raw_measures",
-                schema=schemas.RAW_MEASURES_SCHEMA,
-                write_disposition="WRITE_APPEND"
-            )
-
-    def _create_measure_row(self, component: Dict[str, Any],
-                           measure_ts: str, values: list) -> Dict[str, Any]:
-        """Create a single measure row with validation"""
-        if component['id'] != values[0]:
-            raise ValueError(f"Component ID mismatch: {component['id']} vs {values[0]}")
-
-        return {
-            "station_id": self.station_id,
-            "measure_start_time": parse_airquality_timestamp(measure_ts).isoformat(),
-            "component_id": values[0],
-            "scope_id": values[1],
-            "value": values[2],
-            "measure_end_time": parse_airquality_timestamp(values[3]).isoformat(),
-            "index": str(values[4]) if values[4] is not None else None
-        }
\ No newline at end of file
+        # Keyed on the id like the API clients' fetch/parse spans
+        with metrics.span("transform", component['id']):
+            result = self.validator.validate(component, self.station_id, station_data)
+        metrics.incr("rows_valid", len(result.rows))
+        metrics.incr("rows_quarantined", len(result.quarantine))
+
+        if result.quarantine:
+            logging.warning(f"Quarantined {len(result.quarantine)} measures "
+                            f"for {component['code']} (scope {scope_id}): {result.summary}")
+            self._upload_quarantine(component, scope_id, result.quarantine)
+        return result.rows
+
+    def load_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Append validated rows to raw_measures"""
+        self.bq.load_table(
+            rows=rows,
+            table_id="raw_measures",
+            schema=schemas.RAW_MEASURES_SCHEMA,
+            write_disposition="WRITE_APPEND"
+        )
@@ -0,0 +1,213 @@
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Tuple
+import numpy as np
+from config import constants
+from utils.time_utils import parse_airquality_timestamps
+
+# Checks run in this order; a row is quarantined with the first reason it hits
+QUARANTINE_REASONS = (
+    "malformed",
+    "component_mismatch",
+    "bad_timestamp",
+    "null_value",
+    "out_of_range",
+    "bad_interval",
+    "duplicate",
+)
+
+
+@dataclass
+class MeasureColumns:
+    """Columnar view of one station's measures payload, ordered by start (NaT last)"""
+    station_id: int
+    raw_start: np.ndarray       # original timestamp keys (object)
+    raw_values: np.ndarray      # original value lists (object)
+    component_id: np.ndarray    # int64, -1 when missing
+    scope_id: np.ndarray        # int64, -1 when missing
+    value: np.ndarray           # float64, NaN when null
+    start: np.ndarray           # datetime64[s], NaT when unparseable
+    end: np.ndarray             # datetime64[s], NaT when unparseable
+    index: np.ndarray           # object
+    malformed: np.ndarray       # bool
+
+    def __len__(self) -> int:
+        return self.raw_start.size
+
+
+@dataclass
+class ValidationResult:
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    quarantine: List[Dict[str, Any]] = field(default_factory=list)
+    summary: Dict[str, int] = field(default_factory=dict)
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return -1
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def build_columns(station_id: int, station_data: Dict[str, list]) -> MeasureColumns:
+    """Turn the API's {timestamp: [component, scope, value, end, index]} dict into columns"""
+    n = len(station_data)
+    raw_start = np.empty(n, dtype=object)
+    raw_values = np.empty(n, dtype=object)
+    component_id = np.full(n, -1, dtype=np.int64)
+    scope_id = np.full(n, -1, dtype=np.int64)
+    value = np.full(n, np.nan, dtype=np.float64)
+    end_raw = np.full(n, "", dtype=object)
+    index = np.full(n, None, dtype=object)
+    malformed = np.zeros(n, dtype=bool)
+
+    for i, (measure_ts, values) in enumerate(station_data.items()):
+        raw_start[i] = measure_ts
+        raw_values[i] = values
+        if not isinstance(values, (list, tuple)) or len(values) < 5:
+            malformed[i] = True
+            continue
+        component_id[i] = _to_int(values[0])
+        scope_id[i] = _to_int(values[1])
+        value[i] = _to_float(values[2])
+        end_raw[i] = values[3] if isinstance(values[3], str) else ""
+        index[i] = str(values[4]) if values[4] is not None else None
+
+    start = parse_airquality_timestamps(raw_start)
+    # JSON key order carries no meaning; stable, so repeats keep payload order
+    order = np.argsort(start, kind="stable")
+    return MeasureColumns(
+        station_id=station_id,
+        raw_start=raw_start[order],
+        raw_values=raw_values[order],
+        component_id=component_id[order],
+        scope_id=scope_id[order],
+        value=value[order],
+        start=start[order],
+        end=parse_airquality_timestamps(end_raw)[order],
+        index=index[order],
+        malformed=malformed[order],
+    )
+
+
+class MeasuresValidator:
+    """Batch data-quality checks over a columnar measures payload"""
+
+    def __init__(self, value_ranges: Dict[str, List[float]] = None):
+        self.value_ranges = value_ranges or constants.CONFIG["measure_value_ranges"]
+
+    def validate(self, component: Dict[str, Any], station_id: int,
+                 station_data: Dict[str, list]) -> ValidationResult:
+        """Validate one component's payload for a station"""
+        return self.validate_columns(component, build_columns(station_id, station_data))
+
+    def validate_columns(self, component: Dict[str, Any],
+                         cols: MeasureColumns) -> ValidationResult:
+        bad, reason, summary = self.classify(component, cols)
+        return ValidationResult(
+            rows=self._build_rows(cols, ~bad),
+            quarantine=self.build_quarantine(component, cols, bad, reason),
+            summary=summary,
+        )
+
+    def classify(self, component: Dict[str, Any], cols: MeasureColumns
+                 ) -> Tuple[np.ndarray, np.ndarray, Dict[str, int]]:
+        """Bad-row mask, per-row quarantine reason and summary counts"""
+        checks = self._run_checks(component, cols)
+
+        reason = np.full(len(cols), None, dtype=object)
+        bad = np.zeros(len(cols), dtype=bool)
+        summary = {"total": len(cols)}
+        for name in QUARANTINE_REASONS:
+            hit = checks[name] & ~bad
+            reason[hit] = name
+            bad |= hit
+            summary[name] = int(hit.sum())
+        summary["valid"] = int((~bad).sum())
+        return bad, reason, summary
+
+    def _run_checks(self, component: Dict[str, Any],
+                    cols: MeasureColumns) -> Dict[str, np.ndarray]:
+        low, high = self.value_ranges.get(component.get("unit"),
+                                          self.value_ranges["default"])
+        finite = np.isfinite(cols.value)
+        bad_ts = np.isnat(cols.start) | np.isnat(cols.end)
+
+        return {
+            "malformed": cols.malformed,
+            "component_mismatch": cols.component_id != component["id"],
+            "bad_timestamp": bad_ts,
+            "null_value": ~finite,
+            "out_of_range": finite & ((cols.value < low) | (cols.value > high)),
+            # Rows must cover a positive interval
+            "bad_interval": ~bad_ts & (cols.end <= cols.start),
+            "duplicate": self._duplicate_mask(cols, bad_ts),
+        }
+
+    @staticmethod
+    def _duplicate_mask(cols: MeasureColumns, bad_ts: np.ndarray) -> np.ndarray:
+        """Flag every repeat of a (component, scope, start) key after its first occurrence"""
+        duplicate = np.zeros(len(cols), dtype=bool)
+        candidates = np.flatnonzero(~bad_ts)
+        if candidates.size < 2:
+            return duplicate
+
+        start = cols.start[candidates].astype(np.int64)
+        scope = cols.scope_id[candidates]
+        comp = cols.component_id[candidates]
+        order = np.lexsort((candidates, start, scope, comp))
+        same_as_prev = (
+            (np.diff(comp[order]) == 0)
+            & (np.diff(scope[order]) == 0)
+            & (np.diff(start[order]) == 0)
+        )
+        duplicate[candidates[order[1:][same_as_prev]]] = True
+        return duplicate
+
+    @staticmethod
+    def _build_rows(cols: MeasureColumns, mask: np.ndarray) -> List[Dict[str, Any]]:
+        starts = np.datetime_as_string(cols.start[mask], unit="s")
+        ends = np.datetime_as_string(cols.end[mask], unit="s")
+        return [
+            {
+                "station_id": cols.station_id,
+                "measure_start_time": start,
+                "component_id": component_id,
+                "scope_id": scope_id,
+                "value": value,
+                "measure_end_time": end,
+                "index": index
+            }
+            for start, component_id, scope_id, value, end, index in zip(
+                starts.tolist(),
+                cols.component_id[mask].tolist(),
+                cols.scope_id[mask].tolist(),
+                cols.value[mask].tolist(),
+                ends.tolist(),
+                cols.index[mask].tolist(),
+            )
+        ]
+
+    @staticmethod
+    def build_quarantine(component: Dict[str, Any], cols: MeasureColumns,
+                         mask: np.ndarray, reason: np.ndarray) -> List[Dict[str, Any]]:
+        return [
+            {
+                "station_id": cols.station_id,
+                "component_id": component["id"],
+                "measure_start_time": measure_ts,
+                "values": values,
+                "reason": why
+            }
+            for measure_ts, values, why in zip(
+                cols.raw_start[mask].tolist(),
+                cols.raw_values[mask].tolist(),
+                reason[mask].tolist(),
+            )
+        ]
@@ -0,0 +1,154 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, List, Iterable, Iterator, Tuple
+import numpy as np
+from config import constants
+from core.measures_validator import MeasuresValidator, build_columns
+
+logger = logging.getLogger(__name__)
+
+# (component, station_id, station_data) for one measures payload
+TransformTask = Tuple[Dict[str, Any], int, Dict[str, list]]
+
+
+@dataclass
+class ColumnarBatch:
+    """Validated measures as flat NumPy buffers; cheap to pickle between processes"""
+    station_id: np.ndarray      # int64
+    component_id: np.ndarray    # int64
+    scope_id: np.ndarray        # int64
+    value: np.ndarray           # float64
+    start: np.ndarray           # datetime64[s]
+    end: np.ndarray             # datetime64[s]
+    index: np.ndarray           # fixed-width unicode
+    index_null: np.ndarray      # bool
+
+    def __len__(self) -> int:
+        return self.value.size
+
+    @classmethod
+    def concat(cls, batches: List["ColumnarBatch"]) -> "ColumnarBatch":
+        if not batches:
+            return cls.empty()
+        return cls(**{
+            name: np.concatenate([getattr(b, name) for b in batches])
+            for name in cls.__dataclass_fields__
+        })
+
+    @classmethod
+    def empty(cls) -> "ColumnarBatch":
+        return cls(
+            station_id=np.empty(0, dtype=np.int64),
+            component_id=np.empty(0, dtype=np.int64),
+            scope_id=np.empty(0, dtype=np.int64),
+            value=np.empty(0, dtype=np.float64),
+            start=np.empty(0, dtype="datetime64[s]"),
+            end=np.empty(0, dtype="datetime64[s]"),
+            index=np.empty(0, dtype="U1"),
+            index_null=np.empty(0, dtype=bool),
+        )
+
+    def select(self, indices: np.ndarray) -> "ColumnarBatch":
+        """Subset of rows by index array or boolean mask"""
+        return ColumnarBatch(**{
+            name: getattr(self, name)[indices] for name in self.__dataclass_fields__
+        })
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Expand into raw_measures rows in the parent process"""
+        index = np.where(self.index_null, None, self.index.astype(object))
+        return [
+            {
+                "station_id": station_id,
+                "measure_start_time": start,
+                "component_id": component_id,
+                "scope_id": scope_id,
+                "value": value,
+                "measure_end_time": end,
+                "index": idx
+            }
+            for station_id, start, component_id, scope_id, value, end, idx in zip(
+                self.station_id.tolist(),
+                np.datetime_as_string(self.start, unit="s").tolist(),
+                self.component_id.tolist(),
+                self.scope_id.tolist(),
+                self.value.tolist(),
+                np.datetime_as_string(self.end, unit="s").tolist(),
+                index.tolist(),
+            )
+        ]
+
+
+def _transform_chunk(chunk: List[TransformTask]
+                     ) -> Tuple[ColumnarBatch, List[Dict[str, Any]], Dict[str, int]]:
+    """Worker: validate a chunk of payloads and return columns, quarantine and counts"""
+    validator = MeasuresValidator()
+    batches, quarantine, summary = [], [], {}
+    for component, station_id, station_data in chunk:
+        cols = build_columns(station_id, station_data)
+        bad, reason, counts = validator.classify(component, cols)
+        good = ~bad
+        index = cols.index[good]
+        index_null = np.equal(index, None)
+        batches.append(ColumnarBatch(
+            station_id=np.full(int(good.sum()), station_id, dtype=np.int64),
+            component_id=cols.component_id[good],
+            scope_id=cols.scope_id[good],
+            value=cols.value[good],
+            start=cols.start[good],
+            end=cols.end[good],
+            index=np.where(index_null, "", index).astype(str),
+            index_null=index_null,
+        ))
+        quarantine.extend(validator.build_quarantine(component, cols, bad, reason))
+        for key, count in counts.items():
+            summary[key] = summary.get(key, 0) + count
+    return ColumnarBatch.concat(batches), quarantine, summary
+
+
+class ParallelTransformer:
+    """
+    Optional multi-core transform stage for large backfills.
+
+    Payloads are grouped into chunks of roughly ``chunk_rows`` measures and
+    spread across a process pool. Workers return ColumnarBatch buffers rather
+    than row dicts, so only flat arrays cross the process boundary. With a
+    single worker everything runs in-process.
+    """
+
+    def __init__(self, workers: int = None, chunk_rows: int = None):
+        self.workers = workers or constants.CONFIG["transform_workers"] or os.cpu_count() or 1
+        self.chunk_rows = chunk_rows or constants.CONFIG["transform_chunk_rows"]
+
+    def transform(self, tasks: Iterable[TransformTask]
+                  ) -> Tuple[ColumnarBatch, List[Dict[str, Any]], Dict[str, int]]:
+        """Validate all payloads; returns merged columns, quarantine rows and counts"""
+        chunks = self._chunk(tasks)
+        if self.workers == 1:
+            results = [_transform_chunk(chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(_transform_chunk, chunks))
+
+        batches, quarantine, summary = [], [], {}
+        for batch, chunk_quarantine, counts in results:
+            batches.append(batch)
+            quarantine.extend(chunk_quarantine)
+            for key, count in counts.items():
+                summary[key] = summary.get(key, 0) + count
+        logger.info(f"Transformed {summary.get('valid', 0)} of {summary.get('total', 0)} "
+                    f"measures on {self.workers} worker(s)")
+        return ColumnarBatch.concat(batches), quarantine, summary
+
+    def _chunk(self, tasks: Iterable[TransformTask]) -> Iterator[List[TransformTask]]:
+        chunk, rows = [], 0
+        for task in tasks:
+            chunk.append(task)
+            rows += len(task[2])
+            if rows >= self.chunk_rows:
+                yield chunk
+                chunk, rows = [], 0
+        if chunk:
+            yield chunk
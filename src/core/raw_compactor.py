@@ -0,0 +1,183 @@
+import io
+import json
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from typing import Dict, Any, List, Tuple
+import pyarrow as pa
+import pyarrow.parquet as pq
+from config import constants
+from services.gcs_uploader import GCSUploader
+
+logger = logging.getLogger(__name__)
+
+COMPACTED_SCHEMA = pa.schema([
+    ("station_id", pa.int64()),
+    ("component_id", pa.int64()),
+    ("scope_id", pa.int64()),
+    ("date_start", pa.string()),
+    ("value", pa.float64()),
+    ("date_end", pa.string()),
+    ("index", pa.string()),
+    ("fetched_at", pa.string()),
+    # Original JSON of entries that don't have the usual 5-value shape
+    ("raw_values", pa.string()),
+])
+
+
+def hive_fields(path: str) -> Dict[str, str]:
+    return dict(segment.split("=", 1) for segment in path.split("/") if "=" in segment)
+
+
+def _to_int(value: Any):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value: Any):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RawCompactor:
+    """
+    Merges a day's raw measures blobs into one Parquet file per partition.
+
+    Raw blobs live under raw/station_id=/component_id=/[scope_id=/]year=/month=/
+    with one JSON file per run. Every blob fetched on a given UTC day is merged
+    into compacted/<same partition>/year=/month=/day=/measures.parquet. Rows are
+    deduplicated on (component, scope, start), keeping the most recent fetch.
+    The file is written zstd-compressed next to a _manifest.json that lists
+    the compacted source blobs.
+
+    The Parquet keeps the raw UBA fields (timestamps as published, index,
+    unparsed odd entries), so it can be turned back into an API payload with
+    ``to_payload`` and replayed. Source blobs are only deleted when
+    CONFIG['compaction_delete_sources'] is set. Re-running a day merges any
+    late blobs into the existing file.
+    """
+
+    def __init__(self, gcs: GCSUploader, delete_sources: bool = None,
+                 io_workers: int = None):
+        self.gcs = gcs
+        self.delete_sources = (constants.CONFIG["compaction_delete_sources"]
+                               if delete_sources is None else delete_sources)
+        self.io_workers = io_workers or constants.CONFIG["gcs_io_workers"]
+
+    def compact_day(self, day: date) -> Dict[str, int]:
+        """Compact all raw blobs fetched on ``day``; returns summary counts"""
+        names = self.gcs.list_blobs(
+            "raw/",
+            match_glob=f"raw/**/year={day.year}/month={day.month:02}/{day.isoformat()}T*.json"
+        )
+        partitions: Dict[str, List[str]] = defaultdict(list)
+        for name in names:
+            partitions[name[:name.index("year=")]].append(name)
+
+        summary = {"partitions": 0, "sources": 0, "rows_in": 0, "rows_out": 0}
+        for partition, sources in sorted(partitions.items()):
+            counts = self._compact_partition(partition, day, sorted(sources))
+            for key, count in counts.items():
+                summary[key] += count
+        logger.info(f"Compacted raw archive for {day.isoformat()}: {summary}")
+        return summary
+
+    @staticmethod
+    def output_prefix(partition: str, day: date) -> str:
+        return (f"compacted/{partition[len('raw/'):]}"
+                f"year={day.year}/month={day.month:02}/day={day.day:02}/")
+
+    def _compact_partition(self, partition: str, day: date,
+                           sources: List[str]) -> Dict[str, int]:
+        prefix = self.output_prefix(partition, day)
+        manifest_name, parquet_name = f"{prefix}_manifest.json", f"{prefix}measures.parquet"
+
+        manifest = (self.gcs.download_json(manifest_name)
+                    if self.gcs.exists(manifest_name) else {"sources": []})
+        known = {source["name"] for source in manifest["sources"]}
+        new_sources = [name for name in sources if name not in known]
+        if not new_sources:
+            return {"partitions": 0, "sources": 0, "rows_in": 0, "rows_out": 0}
+
+        station_id = int(hive_fields(partition)["station_id"])
+        merged: Dict[Tuple, Dict[str, Any]] = {}
+        if known:
+            for row in pq.read_table(io.BytesIO(self.gcs.download_bytes(parquet_name))).to_pylist():
+                merged[(row["component_id"], row["scope_id"], row["date_start"])] = row
+
+        rows_in = 0
+        source_entries = []
+        with ThreadPoolExecutor(max_workers=self.io_workers) as pool:
+            payloads = pool.map(self.gcs.download_json, new_sources)
+            # Sources are in fetch order, so later fetches overwrite earlier ones
+            for name, payload in zip(new_sources, payloads):
+                rows = self._payload_rows(station_id, name, payload)
+                rows_in += len(rows)
+                source_entries.append({"name": name, "rows": len(rows)})
+                for row in rows:
+                    merged[(row["component_id"], row["scope_id"], row["date_start"])] = row
+
+        table = pa.Table.from_pylist(
+            sorted(merged.values(), key=lambda r: (r["scope_id"] or 0, r["date_start"])),
+            schema=COMPACTED_SCHEMA
+        )
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer, compression="zstd")
+        if not self.gcs.upload_bytes(buffer.getvalue(), parquet_name):
+            raise RuntimeError(f"Failed to write {parquet_name}")
+
+        manifest = {
+            "partition": partition,
+            "day": day.isoformat(),
+            "output": parquet_name,
+            "compacted_at": datetime.now(timezone.utc).isoformat(),
+            "rows": table.num_rows,
+            "sources_deleted": self.delete_sources,
+            "sources": manifest["sources"] + source_entries,
+        }
+        # Without its manifest the partition cannot be attributed, so keep the sources
+        if not self.gcs.upload_json(manifest, manifest_name):
+            raise RuntimeError(f"Failed to write {manifest_name}")
+
+        if self.delete_sources:
+            self.gcs.delete_blobs(new_sources)
+        return {"partitions": 1, "sources": len(new_sources),
+                "rows_in": rows_in, "rows_out": table.num_rows}
+
+    @staticmethod
+    def _payload_rows(station_id: int, source: str,
+                      payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        fetched_at = source.rsplit("/", 1)[-1][:-len(".json")]
+        station_data = payload.get("data", {}).get(str(station_id), {})
+        rows = []
+        for date_start, values in station_data.items():
+            row = dict.fromkeys(COMPACTED_SCHEMA.names)
+            row.update(station_id=station_id, date_start=date_start, fetched_at=fetched_at)
+            if isinstance(values, list) and len(values) >= 5:
+                row.update(
+                    component_id=_to_int(values[0]),
+                    scope_id=_to_int(values[1]),
+                    value=_to_float(values[2]),
+                    date_end=values[3],
+                    index=str(values[4]) if values[4] is not None else None,
+                )
+            else:
+                row["raw_values"] = json.dumps(values)
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def to_payload(parquet_bytes: bytes) -> Dict[str, Any]:
+        """Rebuild a measures/json-shaped payload from a compacted file"""
+        data: Dict[str, Dict[str, list]] = defaultdict(dict)
+        for row in pq.read_table(io.BytesIO(parquet_bytes)).to_pylist():
+            values = (json.loads(row["raw_values"]) if row["raw_values"] is not None else
+                      [row["component_id"], row["scope_id"], row["value"],
+                       row["date_end"], row["index"]])
+            data[str(row["station_id"])][row["date_start"]] = values
+        return {"data": dict(data)}
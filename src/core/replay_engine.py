@@ -0,0 +1,175 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from config import constants, schemas
+from core.dimension_manager import DimensionManager
+from core.measures_processor import MeasuresProcessor
+from core.parallel_transformer import ColumnarBatch, ParallelTransformer
+from core.raw_compactor import RawCompactor, hive_fields
+from services.gcs_uploader import GCSUploader
+from services.bigquery_client import BigQueryClient
+
+logger = logging.getLogger(__name__)
+
+
+def _days(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+class ReplayEngine:
+    """
+    Rebuilds BigQuery tables from the GCS archive without calling the UBA API.
+
+    For a measurement date range [start, end] it:
+      * optionally reloads each dimension table from its newest dimensions/
+        snapshot overall (never an older one, so range replays cannot roll
+        dimensions back),
+      * reads every compacted/ Parquet file, and the raw/ blobs of days that
+        were not compacted yet, fetched between start and end + the fetch
+        window, concurrently,
+      * runs the payloads through the current validation/transform code,
+      * keeps the latest fetch per (station, component, scope, start), and
+      * replaces each affected raw_measures day partition with WRITE_TRUNCATE
+        load jobs that run in parallel.
+    """
+
+    def __init__(self, gcs: GCSUploader, bq: BigQueryClient,
+                 io_workers: int = None, load_workers: int = None,
+                 transformer: ParallelTransformer = None):
+        self.gcs = gcs
+        self.bq = bq
+        self.io_workers = io_workers or constants.CONFIG["gcs_io_workers"]
+        self.load_workers = load_workers or constants.CONFIG["replay_load_workers"]
+        self.transformer = transformer or ParallelTransformer()
+        self.dimensions = DimensionManager(None, gcs, bq)
+
+    def replay(self, start: date, end: date, dimensions: bool = False) -> Dict[str, int]:
+        """Rebuild raw_measures partitions for start..end (inclusive), and dimensions if asked"""
+        snapshots = self._replay_dimensions() if dimensions else {}
+        components = self._components(
+            snapshots["components"] if "components" in snapshots else self._latest_snapshot("components"))
+
+        # A run fetches a trailing window, so a day's rows also sit in later blobs
+        fetch_end = end + timedelta(days=-(-constants.CONFIG["measure_hours_back"] // 24))
+        sources = self._list_measure_sources(start, fetch_end)
+        tasks = self._read_tasks(sources, components)
+
+        batch, quarantine, summary = self.transformer.transform(tasks)
+        batch = self._latest_per_key(batch)
+        partitions = self._partition(batch, start, end)
+        self._load_partitions(partitions)
+
+        result = {
+            "dimensions": len(snapshots),
+            "sources": len(sources),
+            "rows": sum(len(p) for p in partitions.values()),
+            "partitions": len(partitions),
+            "quarantined": len(quarantine),
+        }
+        logger.info(f"Replayed {start.isoformat()}..{end.isoformat()}: {result}")
+        return result
+
+    def _latest_snapshot(self, entity: str) -> Optional[Dict[str, Any]]:
+        """Newest archived snapshot of a dimension; blob names sort by fetch time"""
+        names = self.gcs.list_blobs(f"dimensions/{entity}/")
+        return self.gcs.download_json(max(names)) if names else None
+
+    def _replay_dimensions(self) -> Dict[str, Dict[str, Any]]:
+        """Reload each dimension from its newest snapshot"""
+        snapshots = {}
+        for entity in constants.CONFIG["dimension_tables"]:
+            snapshot = self._latest_snapshot(entity)
+            if snapshot is None:
+                logger.warning(f"No {entity} snapshot in the archive")
+                continue
+            snapshots[entity] = snapshot
+            self.dimensions.load_snapshot(entity, snapshot)
+        return snapshots
+
+    @staticmethod
+    def _components(raw_components: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+        if not raw_components:
+            return {}
+        return {c["id"]: c for c in MeasuresProcessor.parse_components(raw_components)}
+
+    def _list_measure_sources(self, start: date, end: date) -> List[str]:
+        """
+        Compacted files, plus raw blobs of partition days without one, in
+        fetch order (later wins). Compaction may keep its sources, so a raw
+        blob whose day was compacted is skipped rather than read twice.
+        """
+        months = sorted({(day.year, day.month) for day in _days(start, end)})
+        # Sort keys: a compacted day ("2025-04-01") precedes later raw fetches
+        sources: Dict[str, str] = {}
+        raw: List[str] = []
+        for year, month in months:
+            for name in self.gcs.list_blobs(
+                    "compacted/", match_glob=f"compacted/**/year={year}/month={month:02}/day=*/measures.parquet"):
+                day = date(year, month, int(hive_fields(name)["day"]))
+                if start <= day <= end:
+                    sources[name] = day.isoformat()
+            raw += [
+                name for name in self.gcs.list_blobs(
+                    "raw/", match_glob=f"raw/**/year={year}/month={month:02}/*.json")
+                if start.isoformat() <= name.rsplit("/", 1)[-1][:10] <= end.isoformat()
+            ]
+        for name in raw:
+            fetched = name.rsplit("/", 1)[-1]
+            compacted = RawCompactor.output_prefix(name[:name.index("year=")],
+                                                   date.fromisoformat(fetched[:10]))
+            if f"{compacted}measures.parquet" not in sources:
+                sources[name] = fetched
+        return sorted(sources, key=sources.get)
+
+    def _read_tasks(self, sources: List[str], components: Dict[int, Dict[str, Any]]
+                    ) -> List[Tuple[Dict[str, Any], int, Dict[str, list]]]:
+        def read(name: str) -> Dict[str, Any]:
+            if name.endswith(".parquet"):
+                return RawCompactor.to_payload(self.gcs.download_bytes(name))
+            return self.gcs.download_json(name)
+
+        tasks = []
+        with ThreadPoolExecutor(max_workers=self.io_workers) as pool:
+            for name, payload in zip(sources, pool.map(read, sources)):
+                fields = hive_fields(name)
+                station_id, component_id = int(fields["station_id"]), int(fields["component_id"])
+                component = components.get(component_id, {"id": component_id,
+                                                          "code": str(component_id),
+                                                          "unit": None})
+                station_data = payload.get("data", {}).get(str(station_id), {})
+                tasks.append((component, station_id, station_data))
+        return tasks
+
+    @staticmethod
+    def _latest_per_key(batch: ColumnarBatch) -> ColumnarBatch:
+        """Keep the last occurrence of each (station, component, scope, start)"""
+        if not len(batch):
+            return batch
+        keys = np.stack([batch.station_id, batch.component_id, batch.scope_id,
+                         batch.start.astype(np.int64)], axis=1)
+        _, first_from_end = np.unique(keys[::-1], axis=0, return_index=True)
+        return batch.select(np.sort(len(batch) - 1 - first_from_end))
+
+    @staticmethod
+    def _partition(batch: ColumnarBatch, start: date, end: date) -> Dict[date, ColumnarBatch]:
+        days = batch.start.astype("datetime64[D]")
+        return {
+            day.astype(object): batch.select(days == day)
+            for day in np.unique(days)
+            if start <= day.astype(object) <= end
+        }
+
+    def _load_partitions(self, partitions: Dict[date, ColumnarBatch]) -> None:
+        def load(item: Tuple[date, ColumnarBatch]) -> None:
+            day, batch = item
+            self.bq.load_table(
+                rows=batch.to_rows(),
+                table_id=f"raw_measures${day.strftime('%Y%m%d')}",
+                schema=schemas.RAW_MEASURES_SCHEMA,
+                write_disposition="WRITE_TRUNCATE"
+            )
+
+        with ThreadPoolExecutor(max_workers=self.load_workers) as pool:
+            list(pool.map(load, sorted(partitions.items())))
@@ -0,0 +1,160 @@
+import heapq
+import logging
+import math
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class _Node:
+    __slots__ = ("station", "lat", "lon", "axis", "left", "right")
+
+    def __init__(self, station, axis, left, right):
+        self.station = station
+        self.lat = station["latitude"]
+        self.lon = station["longitude"]
+        self.axis = axis
+        self.left = left
+        self.right = right
+
+
+class StationIndex:
+    """
+    2-d tree over the (latitude, longitude) of transformed dim_stations rows.
+
+    ``nearest`` returns stations by great-circle distance; pruning uses the
+    exact distance to the splitting parallel or meridian, so results match a
+    brute-force haversine scan. ``within_bbox`` answers rectangular lookups.
+    Stations without coordinates are skipped.
+    """
+
+    def __init__(self, stations: List[Dict[str, Any]]):
+        located = [s for s in stations
+                   if s.get("latitude") is not None and s.get("longitude") is not None]
+        self.fingerprint = self.fingerprint_of(stations)
+        self.size = len(located)
+        self._root = self._build(located, depth=0)
+
+    @staticmethod
+    def fingerprint_of(stations: List[Dict[str, Any]]) -> int:
+        return hash(tuple(sorted(
+            (s["station_id"], s.get("latitude"), s.get("longitude")) for s in stations
+        )))
+
+    def _build(self, stations: List[Dict[str, Any]], depth: int) -> Optional[_Node]:
+        if not stations:
+            return None
+        axis = depth % 2
+        key = "latitude" if axis == 0 else "longitude"
+        stations = sorted(stations, key=lambda s: s[key])
+        mid = len(stations) // 2
+        return _Node(stations[mid], axis,
+                     self._build(stations[:mid], depth + 1),
+                     self._build(stations[mid + 1:], depth + 1))
+
+    def nearest(self, lat: float, lon: float, k: int = 1,
+                max_km: float = None) -> List[Tuple[float, Dict[str, Any]]]:
+        """Up to k (distance_km, station) pairs, closest first"""
+        best: List[Tuple[float, int, Dict[str, Any]]] = []  # max-heap via negated distance
+        limit = max_km if max_km is not None else math.inf
+        cos_lat = math.cos(math.radians(lat))
+
+        def bound() -> float:
+            return -best[0][0] if len(best) == k else limit
+
+        def visit(node: Optional[_Node]) -> None:
+            if node is None:
+                return
+            distance = haversine_km(lat, lon, node.lat, node.lon)
+            if distance <= limit:
+                entry = (-distance, -node.station["station_id"], node.station)
+                if len(best) < k:
+                    heapq.heappush(best, entry)
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, entry)
+
+            if node.axis == 0:
+                diff = lat - node.lat
+                plane_km = math.radians(abs(diff)) * EARTH_RADIUS_KM
+            else:
+                diff = lon - node.lon
+                d_lambda = math.radians(abs(diff))
+                # Distance to the splitting meridian (a great circle)
+                plane_km = (EARTH_RADIUS_KM * math.asin(min(1.0, math.sin(d_lambda) * cos_lat))
+                            if d_lambda < math.pi / 2 else 0.0)
+
+            near, far = (node.left, node.right) if diff < 0 else (node.right, node.left)
+            visit(near)
+            if plane_km <= bound():
+                visit(far)
+
+        visit(self._root)
+        return [(-neg_distance, station)
+                for neg_distance, _, station in sorted(best, reverse=True)]
+
+    def within_bbox(self, min_lat: float, min_lon: float,
+                    max_lat: float, max_lon: float) -> List[Dict[str, Any]]:
+        """Stations inside the box, ordered by station_id"""
+        found: List[Dict[str, Any]] = []
+        lows, highs = (min_lat, min_lon), (max_lat, max_lon)
+
+        def visit(node: Optional[_Node]) -> None:
+            if node is None:
+                return
+            if min_lat <= node.lat <= max_lat and min_lon <= node.lon <= max_lon:
+                found.append(node.station)
+            value = node.lat if node.axis == 0 else node.lon
+            if lows[node.axis] <= value:
+                visit(node.left)
+            if value <= highs[node.axis]:
+                visit(node.right)
+
+        visit(self._root)
+        return sorted(found, key=lambda s: s["station_id"])
+
+
+_cached_index: Optional[StationIndex] = None
+
+
+def update_station_index(stations: List[Dict[str, Any]]) -> StationIndex:
+    """Return the cached index, rebuilding it only when the stations changed"""
+    global _cached_index
+    if _cached_index is None or _cached_index.fingerprint != StationIndex.fingerprint_of(stations):
+        _cached_index = StationIndex(stations)
+        logger.info(f"Built station index over {_cached_index.size} stations")
+    return _cached_index
+
+
+def current_station_index() -> Optional[StationIndex]:
+    return _cached_index
+
+
+def select_station_ids(selection: Optional[Dict[str, Any]], index: Optional[StationIndex],
+                       default: List[int]) -> List[int]:
+    """
+    Resolve CONFIG['station_selection'] into station ids:
+    {"near": [lat, lon], "k": 3, "max_km": 10} or
+    {"bbox": [min_lat, min_lon, max_lat, max_lon]}.
+    Falls back to ``default`` when unset, no index is available or nothing matches.
+    """
+    if not selection or index is None:
+        return default
+    if "near" in selection:
+        lat, lon = selection["near"]
+        matches = [s for _, s in index.nearest(lat, lon, k=selection.get("k", 1),
+                                               max_km=selection.get("max_km"))]
+    elif "bbox" in selection:
+        matches = index.within_bbox(*selection["bbox"])
+    else:
+        raise ValueError(f"Unsupported station selection: {selection}")
+    return [s["station_id"] for s in matches] or default
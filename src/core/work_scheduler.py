@@ -0,0 +1,142 @@
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Any, Callable, Iterator, List, Set, Tuple
+from config import constants
+from core.measures_processor import MeasuresProcessor
+from services.gcs_uploader import GCSUploader
+
+logger = logging.getLogger(__name__)
+
+STATE_BLOB = "state/work_queue.json"
+
+
+@dataclass
+class WorkItem:
+    station_id: int
+    component: Dict[str, Any]
+
+    @property
+    def key(self) -> str:
+        return f"{self.station_id}:{self.component['id']}"
+
+
+class WorkScheduler:
+    """
+    Runs (station, component) measures work inside a time budget.
+
+    Items are ordered by: work carried over from the previous run, priority
+    component codes (CONFIG['priority_components']), staleness (oldest last
+    success first) and the EWMA of past per-item seconds (cheapest first).
+    Before starting an item the scheduler checks that its estimated cost,
+    plus one load of the rows still buffered, fits in the remaining budget;
+    otherwise it stops and saves the rest to state/work_queue.json for the
+    next run to pick up first. Load time is measured separately from the
+    per-item fetch/transform cost so batch flushes do not skew either.
+    """
+
+    def __init__(self, gcs: GCSUploader, budget_seconds: float = None,
+                 started: float = None, clock: Callable[[], float] = time.monotonic):
+        self.gcs = gcs
+        self.clock = clock
+        self.started = clock() if started is None else started
+        self.budget = budget_seconds or constants.CONFIG["run_budget_seconds"]
+        self.safety = constants.CONFIG["run_safety_seconds"]
+        self.default_cost = constants.CONFIG["scheduler_default_cost_seconds"]
+        self.alpha = constants.CONFIG["scheduler_cost_alpha"]
+        self.default_load = constants.CONFIG["scheduler_default_load_seconds"]
+        self.state = self._load_state()
+        self.deferred: List[WorkItem] = []
+        self._loading = 0.0
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self.gcs.exists(STATE_BLOB):
+            return self.gcs.download_json(STATE_BLOB)
+        return {"pending": [], "cost_seconds": {}, "last_done": {}}
+
+    def _save_state(self) -> None:
+        self.state["pending"] = [item.key for item in self.deferred]
+        self.gcs.upload_json(self.state, STATE_BLOB)
+
+    def remaining(self) -> float:
+        return self.budget - (self.clock() - self.started)
+
+    def load_reserve(self) -> float:
+        """Seconds kept back for the final load of buffered rows"""
+        return self.state.get("load_seconds", self.default_load)
+
+    def plan(self, station_ids: List[int], components: List[Dict[str, Any]]) -> List[WorkItem]:
+        """All (station, component) items in execution order"""
+        pending = {key: rank for rank, key in enumerate(self.state["pending"])}
+        priority = {code: rank for rank, code in enumerate(constants.CONFIG["priority_components"])}
+        items = [WorkItem(station_id, component)
+                 for station_id in station_ids for component in components]
+        return sorted(items, key=lambda item: (
+            pending.get(item.key, len(pending)),
+            priority.get(item.component["code"], len(priority)),
+            self.state["last_done"].get(item.key, ""),
+            self.state["cost_seconds"].get(item.key, self.default_cost),
+        ))
+
+    def within_budget(self, items: List[WorkItem]) -> Iterator[WorkItem]:
+        """Yield items while their estimated cost fits; the rest become deferred"""
+        for position, item in enumerate(items):
+            estimate = self.state["cost_seconds"].get(item.key, self.default_cost)
+            if self.remaining() - self.safety - self.load_reserve() < estimate:
+                self.deferred = items[position:]
+                logger.warning(f"Time budget reached with {self.remaining():.1f}s left; "
+                               f"deferring {len(self.deferred)} items")
+                return
+            # The consumer processes the item before asking for the next one
+            yield item
+
+    def _ewma(self, previous: float, seconds: float) -> float:
+        return round(seconds if previous is None else self.alpha * seconds + (1 - self.alpha) * previous, 3)
+
+    def _record(self, item: WorkItem, seconds: float) -> None:
+        self.state["cost_seconds"][item.key] = self._ewma(self.state["cost_seconds"].get(item.key), seconds)
+        self.state["last_done"][item.key] = datetime.now(timezone.utc).isoformat()
+
+    def _load(self, loader: MeasuresProcessor, batch: List[Dict[str, Any]],
+              failed: Set[Tuple[int, int]]) -> None:
+        started = self.clock()
+        try:
+            loader.load_rows(batch)
+        except Exception as e:
+            logging.error(f"Failed loading {len(batch)} measures: {str(e)}")
+            failed.update((row["station_id"], row["component_id"]) for row in batch)
+        finally:
+            seconds = self.clock() - started
+            self._loading += seconds
+            self.state["load_seconds"] = self._ewma(self.state.get("load_seconds"), seconds)
+
+    def run(self, processors: Dict[int, MeasuresProcessor]) -> int:
+        """Process items in priority order through one batched load pipeline"""
+        loader = next(iter(processors.values()))
+        components = loader.fetch_components()
+        items = self.plan(list(processors), components)
+        processed: Dict[int, Set[int]] = {station_id: set() for station_id in processors}
+        failed: Set[Tuple[int, int]] = set()
+        buffer: List[Dict[str, Any]] = []
+
+        for item in self.within_budget(items):
+            processor = processors[item.station_id]
+            started, loading = self.clock(), self._loading
+            if not processor.component_available(item.component['id']):
+                continue
+            buffer.extend(processor.process_component(item.component, processed[item.station_id]))
+            while len(buffer) >= loader.load_batch_rows:
+                batch, buffer = buffer[:loader.load_batch_rows], buffer[loader.load_batch_rows:]
+                self._load(loader, batch, failed)
+            # Only items that ran count; loads are timed by _load, not charged to the item
+            if item.component['id'] in processed[item.station_id]:
+                self._record(item, self.clock() - started - (self._loading - loading))
+        if buffer:
+            # Covered by load_reserve() in every budget check
+            self._load(loader, buffer, failed)
+
+        self._save_state()
+        done = {(station_id, component_id)
+                for station_id, ids in processed.items() for component_id in ids}
+        return len(done - failed)
@@ -1,46 +1,322 @@
+import asyncio
 import logging
+import time
 import traceback
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
 from flask import jsonify
 from config import constants
 from core.dimension_manager import DimensionManager
+from core.freshness_probe import FreshnessProbe
+from core.gap_scanner import GapScanner
 from core.measures_processor import MeasuresProcessor
+from core.async_measures_processor import AsyncMeasuresProcessor
+from core.raw_compactor import RawCompactor
+from core.replay_engine import ReplayEngine
+from core.work_scheduler import WorkScheduler
+from core.station_index import (current_station_index, update_station_index,
+                                select_station_ids)
+from core.data_transformer import DataTransformer
+from core.dashboard_reader import DashboardReader
 from services.gcs_uploader import GCSUploader
 from services.api_client import LuftdatenAPIClient
+from services.async_api_client import AsyncLuftdatenAPIClient
 from services.bigquery_client import BigQueryClient
+from services.bigquery_stream_writer import BigQueryStreamWriter
+from services.query_cache import query_cache, record_table_writes
+from utils.instrumentation import metrics
+from utils.profiling import RunProfiler, profiling_requested
+
+SQL_DIR = Path(__file__).resolve().parent.parent / "sql"
 
 
 def main(request):
     """HTTP Cloud Function entry point"""
+    started = time.monotonic()
+    metrics.reset()
     try:
         api = LuftdatenAPIClient()
-        gcs = GCSUploader(constants.CONFIG["gcs_bucket"])
-        bq = BigQueryClient(project=constants.CONFIG["project"],
-                            dataset_id=constants.CONFIG["bq_dataset"])
-
-        process_dimensions(api, gcs, bq)
-        success_count = process_measures(api, gcs, bq)
+        gcs = build_archive()
+        with RunProfiler(gcs, enabled=profiling_requested(request)) as profiler:
+            probe = build_freshness_probe(api, gcs)
+            if probe is not None and not probe.has_new_data():
+                return json_no_new_data_response(probe)
+            bq = build_bigquery_sink()
+            success_count = None
+            try:
+                process_dimensions(api, gcs, bq)
+                scheduler = WorkScheduler(gcs, started=started)
+                success_count = process_measures(api, gcs, bq, scheduler)
+            finally:
+                try:
+                    # Commits pending Storage Write API streams even after a failure
+                    bq.close()
+                finally:
+                    # A failed run may have loaded batches before raising
+                    record_ingestion(gcs, measures_loaded=success_count != 0)
+            if probe is not None and success_count and not scheduler.deferred:
+                probe.mark_ingested()
 
-        return json_success_response(success_count)
+        return json_success_response(success_count, len(scheduler.deferred), profiler.link)
     
     except Exception as e:
         return json_error_response(e)
 
 
+def main_async(request):
+    """HTTP Cloud Function entry point running measures on asyncio"""
+    metrics.reset()
+    try:
+        api = LuftdatenAPIClient()
+        gcs = build_archive()
+        with RunProfiler(gcs, enabled=profiling_requested(request)) as profiler:
+            probe = build_freshness_probe(api, gcs)
+            if probe is not None and not probe.has_new_data():
+                return json_no_new_data_response(probe)
+            bq = build_bigquery_sink()
+            success_count = None
+            try:
+                process_dimensions(api, gcs, bq)
+                success_count = asyncio.run(process_measures_async(gcs, bq, selected_station_ids()))
+            finally:
+                try:
+                    bq.close()
+                finally:
+                    record_ingestion(gcs, measures_loaded=success_count != 0)
+            if probe is not None and success_count:
+                probe.mark_ingested()
+
+        return json_success_response(success_count, profile_url=profiler.link)
+
+    except Exception as e:
+        return json_error_response(e)
+
+
+def compact_raw_archive(request):
+    """HTTP Cloud Function entry point compacting one day of raw blobs (default: yesterday)"""
+    try:
+        day_param = request.args.get("date")
+        day = (date.fromisoformat(day_param) if day_param else
+               (datetime.now(timezone.utc) - timedelta(days=1)).date())
+        gcs = build_archive()
+        summary = RawCompactor(gcs).compact_day(day)
+        return jsonify({"status": "success", "day": day.isoformat(), **summary}), 200
+
+    except Exception as e:
+        return json_error_response(e)
+
+
+def replay_archive(request):
+    """HTTP Cloud Function entry point rebuilding raw_measures from the GCS archive
+    (?start=&end=[&dimensions=1] also reloads dimensions from their newest snapshots)"""
+    try:
+        start = date.fromisoformat(request.args["start"])
+        end = date.fromisoformat(request.args.get("end", request.args["start"]))
+        dimensions = request.args.get("dimensions") in ("1", "true")
+        gcs = build_archive()
+        bq = build_warehouse()
+        summary = None
+        try:
+            summary = ReplayEngine(gcs, bq).replay(start, end, dimensions=dimensions)
+        finally:
+            try:
+                bq.close()
+            finally:
+                record_measure_writes(gcs, summary)
+                if dimensions:
+                    record_ingestion(gcs, measures_loaded=False)
+        return jsonify({"status": "success", "start": start.isoformat(),
+                        "end": end.isoformat(), **summary}), 200
+
+    except Exception as e:
+        return json_error_response(e)
+
+
+def repair_gaps(request):
+    """HTTP Cloud Function entry point refetching hours missing from raw_measures (?days=)"""
+    try:
+        days = request.args.get("days")
+        api = LuftdatenAPIClient()
+        gcs = build_archive()
+        bq = build_warehouse()
+        summary = None
+        try:
+            # No dimensions step here, so a cold instance builds the index itself
+            summary = GapScanner(api, gcs, bq, station_ids=selected_station_ids(api),
+                                 lookback_days=int(days) if days else None).repair()
+        finally:
+            try:
+                bq.close()
+            finally:
+                record_measure_writes(gcs, summary)
+        return jsonify({"status": "success", **summary}), 200
+
+    except Exception as e:
+        return json_error_response(e)
+
+
+def stations_query(request):
+    """HTTP Cloud Function entry point: ?lat=&lon=[&k=&max_km=] or ?bbox=min_lat,min_lon,max_lat,max_lon"""
+    try:
+        index = station_index(LuftdatenAPIClient())
+
+        if "bbox" in request.args:
+            bbox = [float(v) for v in request.args["bbox"].split(",")]
+            if len(bbox) != 4:
+                raise ValueError("bbox needs min_lat,min_lon,max_lat,max_lon")
+            stations = index.within_bbox(*bbox)
+        else:
+            max_km = request.args.get("max_km")
+            stations = [
+                {**station, "distance_km": round(distance, 3)}
+                for distance, station in index.nearest(
+                    float(request.args["lat"]), float(request.args["lon"]),
+                    k=int(request.args.get("k", 1)),
+                    max_km=float(max_km) if max_km else None)
+            ]
+        return jsonify({"status": "success", "stations": stations}), 200
+
+    except Exception as e:
+        return json_error_response(e)
+
+
+def dashboard_query(request):
+    """HTTP Cloud Function entry point for dashboard reads: ?view=current|daily[&station_id=&days=]"""
+    try:
+        view = request.args.get("view", "current")
+        station_id = request.args.get("station_id")
+        station_id = int(station_id) if station_id else constants.CONFIG["station_id"]
+        if view not in ("current", "daily"):
+            raise ValueError(f"Unknown view {view!r}, expected 'current' or 'daily'")
+        reader = DashboardReader(build_warehouse, build_archive())
+        try:
+            if view == "current":
+                rows = reader.current_air_quality(station_id)
+            else:
+                days = request.args.get("days")
+                rows = reader.daily_cigarettes(station_id, int(days) if days else None)
+        finally:
+            reader.close()
+        return jsonify({"status": "success", "view": view, "station_id": station_id,
+                        "rows": rows, "cache": query_cache.stats()}), 200
+
+    except Exception as e:
+        return json_error_response(e)
+
+
+def build_freshness_probe(api, gcs):
+    """FreshnessProbe when CONFIG['freshness_probe_enabled'], else None (no state read)"""
+    if not constants.CONFIG["freshness_probe_enabled"]:
+        return None
+    return FreshnessProbe(api, gcs)
+
+
+def build_archive():
+    """GCS bucket, or a local directory when CONFIG['sink_backend'] is 'local'"""
+    if constants.CONFIG["sink_backend"] == "local":
+        from services.local_archive import LocalArchive
+        return LocalArchive(Path(constants.CONFIG["local_sink_root"]) / "archive")
+    return GCSUploader(constants.CONFIG["gcs_bucket"])
+
+
+def build_warehouse():
+    """BigQuery, or an embedded DuckDB file with the sql/ views when the backend is local"""
+    if constants.CONFIG["sink_backend"] == "local":
+        # Imported lazily: duckdb is a development-only dependency
+        from services.local_warehouse import LocalWarehouse
+        root = Path(constants.CONFIG["local_sink_root"])
+        root.mkdir(parents=True, exist_ok=True)
+        warehouse = LocalWarehouse(root / "warehouse.duckdb",
+                                   project=constants.CONFIG["project"],
+                                   dataset_id=constants.CONFIG["bq_dataset"])
+        warehouse.apply_sql_dir(SQL_DIR)
+        return warehouse
+    return BigQueryClient(project=constants.CONFIG["project"],
+                          dataset_id=constants.CONFIG["bq_dataset"])
+
+
+def build_bigquery_sink():
+    """Batch load jobs or Storage Write API streaming, per CONFIG['bq_sink_mode']"""
+    bq = build_warehouse()
+    if constants.CONFIG["bq_sink_mode"] == "stream" and constants.CONFIG["sink_backend"] != "local":
+        return BigQueryStreamWriter(project=constants.CONFIG["project"],
+                                    dataset_id=constants.CONFIG["bq_dataset"],
+                                    batch_client=bq)
+    return bq
+
+
 def process_dimensions(api, gcs, bq):
     """Process dimension tables"""
     DimensionManager(api, gcs, bq).process_dimensions()
 
 
-def process_measures(api, gcs, bq) -> int:
-    """Process measures data"""
-    return MeasuresProcessor(api, gcs, bq).process_measures()
+def record_ingestion(gcs, measures_loaded: bool) -> None:
+    """Invalidate cached dashboard results for the tables this run rewrote"""
+    tables = [f"dim_{entity}" for entity in constants.CONFIG["dimension_tables"]]
+    if measures_loaded:
+        tables.append("raw_measures")
+    record_table_writes(gcs, tables)
 
 
-def json_success_response(success_count: int):
-    return jsonify({
+def record_measure_writes(gcs, summary) -> None:
+    """Invalidate raw_measures results unless the run finished without loading rows"""
+    # summary is None when the run raised, possibly after loading some batches
+    if summary is None or summary["rows"]:
+        record_table_writes(gcs, ["raw_measures"])
+
+
+def station_index(api):
+    """Cached station index; a cold instance builds it once from the API"""
+    index = current_station_index()
+    if index is None:
+        index = update_station_index(DataTransformer.transform_stations(api.get_stations()))
+    return index
+
+
+def selected_station_ids(api=None):
+    """
+    Stations picked by CONFIG['station_selection'] from the cached index.
+    With ``api``, a configured selection builds a missing index first
+    instead of falling back to the default station.
+    """
+    selection = constants.CONFIG["station_selection"]
+    index = station_index(api) if selection and api is not None else current_station_index()
+    return select_station_ids(selection, index, default=[constants.CONFIG["station_id"]])
+
+
+def process_measures(api, gcs, bq, scheduler: WorkScheduler = None) -> int:
+    """Process measures data, within the scheduler's time budget when given"""
+    processors = {
+        station_id: MeasuresProcessor(api, gcs, bq, station_id=station_id)
+        for station_id in selected_station_ids()
+    }
+    if scheduler is not None:
+        return scheduler.run(processors)
+    return sum(processor.process_measures() for processor in processors.values())
+
+
+async def process_measures_async(gcs, bq, station_ids=None) -> int:
+    """Process measures for many stations with concurrent API requests"""
+    async with AsyncLuftdatenAPIClient() as api:
+        return await AsyncMeasuresProcessor(api, gcs, bq,
+                                            station_ids=station_ids).process_measures()
+
+
+def json_success_response(success_count: int, deferred_count: int = 0,
+                          profile_url: str = None):
+    body = {
         "status": "success",
-        "components_processed": success_count
-    }), 200
+        "components_processed": success_count,
+        "components_deferred": deferred_count,
+        "metrics": metrics.summary()
+    }
+    if profile_url:
+        body["profile"] = profile_url
+    return jsonify(body), 200
+
+
+def json_no_new_data_response(probe: FreshnessProbe):
+    return jsonify({"status": "no_new_data", **probe.report()}), 200
 
 
 def json_error_response(error: Exception):
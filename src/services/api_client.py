@@ -1,26 +1,36 @@
-import requests
 from tenacity import retry, stop_after_attempt, wait_exponential
 from datetime import datetime, timedelta, timezone
+from utils.instrumentation import metrics, count_retry
+from utils.json_codec import JSONPayload
+from utils.time_utils import UBA_TIMEZONE
+from services.transport import pooled_session
 
 
 class LuftdatenAPIClient:
     BASE_URL = "https://www.umweltbundesamt.de/api/air_data/v3/"
+    HEADERS = {
+        'accept': 'application/json',
+        'User-Agent': 'BerlinerLuft/1.0 (https://github.com/Berliner-Luft)'
+    }
 
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'accept': 'application/json',
-            'User-Agent': 'BerlinerLuft/1.0 (https://github.com/Berliner-Luft)'
-        })
+        self.session = pooled_session("uba")
+        self.session.headers.update(self.HEADERS)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, max=10))
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, max=10),
+           before_sleep=count_retry("fetch_retries"))
     def _get_data(self, endpoint, params=None):
-        response = self.session.get(
-            f"{self.BASE_URL}/{endpoint}",
-            params=params or {'lang': 'de', 'index': 'code'}
-        )
-        response.raise_for_status()
-        return response.json()
+        component = (params or {}).get('component')
+        with metrics.span("fetch", component):
+            response = self.session.get(
+                f"{self.BASE_URL}/{endpoint}",
+                params=params or {'lang': 'de', 'index': 'code'}
+            )
+            response.raise_for_status()
+        metrics.incr("fetch_requests")
+        metrics.incr("fetch_bytes", len(response.content))
+        with metrics.span("parse", component):
+            return JSONPayload.from_bytes(response.content)
 
     def get_components(self):
         return self._get_data("components/json")
@@ -31,18 +41,50 @@ class LuftdatenAPIClient:
     def get_scopes(self):
         return self._get_data("scopes/json")
 
-    def get_measures(self, component_id, station_id, hours_back=24):
+    def get_measures(self, component_id, station_id, hours_back=24,
+                     scope_id=2, now=None):
+        params = self.measures_params(component_id, station_id,
+                                      hours_back, scope_id, now)
+        return self._get_data("measures/json", params)
+
+    def get_measures_window(self, component_id, station_id, start, end, scope_id=2):
+        params = self.window_params(component_id, station_id, start, end, scope_id)
+        return self._get_data("measures/json", params)
+
+    @staticmethod
+    def measures_params(component_id, station_id, hours_back=24,
+                        scope_id=2, now=None):
+        """Query parameters for a measures/json request ending at the current UBA (Berlin) hour"""
         try:
-            now = datetime.now(timezone.utc)
-            params = {
+            now = (now or datetime.now(timezone.utc)).astimezone(UBA_TIMEZONE)
+            return {
                 'date_from': (now - timedelta(hours=hours_back)).strftime('%Y-%m-%d'),
                 'time_from': '0',
                 'date_to': now.strftime('%Y-%m-%d'),
                 'time_to': now.strftime('%H'),
                 'station': str(station_id),
                 'component': str(component_id),
-                'scope': '2'
+                'scope': str(scope_id)
+            }
+        except Exception as e:
+            raise ValueError("Invalid parameters for getting measures") from e
+
+    @staticmethod
+    def window_params(component_id, station_id, start, end, scope_id=2):
+        """
+        Query parameters for measures starting in the hours start..end (inclusive).
+        The API counts hours 1-24 by their end, so the window may include one
+        extra hour on either side.
+        """
+        try:
+            return {
+                'date_from': start.strftime('%Y-%m-%d'),
+                'time_from': str(start.hour),
+                'date_to': end.strftime('%Y-%m-%d'),
+                'time_to': str(end.hour + 1),
+                'station': str(station_id),
+                'component': str(component_id),
+                'scope': str(scope_id)
             }
         except Exception as e:
             raise ValueError("Invalid parameters for getting measures") from e
-        return self._get_data("measures/json", params)
@@ -0,0 +1,75 @@
+import aiohttp
+from tenacity import retry, stop_after_attempt, wait_exponential
+from config import constants
+from services.api_client import LuftdatenAPIClient
+from utils.instrumentation import metrics, count_retry
+from utils.json_codec import JSONPayload
+from services.transport import aiohttp_settings
+
+
+class AsyncLuftdatenAPIClient:
+    """asyncio counterpart of LuftdatenAPIClient sharing one pooled keep-alive session"""
+    BASE_URL = LuftdatenAPIClient.BASE_URL
+    HEADERS = LuftdatenAPIClient.HEADERS
+
+    def __init__(self, base_url: str = None, pool_size: int = None,
+                 keepalive_timeout: float = None):
+        self.base_url = base_url or self.BASE_URL
+        self.pool_size = pool_size or constants.CONFIG["async_pool_size"]
+        self.keepalive_timeout = keepalive_timeout or constants.CONFIG["async_keepalive_seconds"]
+        self.session = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def open(self) -> None:
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self.session = aiohttp.ClientSession(connector=connector, headers=self.HEADERS,
+                                                 **aiohttp_settings("uba"))
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, max=10),
+           before_sleep=count_retry("fetch_retries"))
+    async def _get_data(self, endpoint, params=None):
+        await self.open()
+        component = (params or {}).get('component')
+        with metrics.span("fetch", component):
+            async with self.session.get(
+                f"{self.base_url}/{endpoint}",
+                params=params or {'lang': 'de', 'index': 'code'}
+            ) as response:
+                response.raise_for_status()
+                body = await response.read()
+        metrics.incr("fetch_requests")
+        metrics.incr("fetch_bytes", len(body))
+        with metrics.span("parse", component):
+            return JSONPayload.from_bytes(body)
+
+    async def get_components(self):
+        return await self._get_data("components/json")
+
+    async def get_stations(self):
+        return await self._get_data("stations/json")
+
+    async def get_scopes(self):
+        return await self._get_data("scopes/json")
+
+    async def get_measures(self, component_id, station_id, hours_back=24,
+                           scope_id=2, now=None):
+        params = LuftdatenAPIClient.measures_params(component_id, station_id,
+                                                    hours_back, scope_id, now)
+        return await self._get_data("measures/json", params)
@@ -1,38 +1,108 @@
 # bigquery_client.py
 import logging
+import tempfile
+from datetime import datetime
 from google.cloud import bigquery
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 from google.cloud.bigquery import SchemaField
+from utils.instrumentation import metrics
+from utils import json_codec
+from services.transport import google_credentials, authorized_session
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
 class BigQueryClient:
-    def __init__(self, project: str = "berliner-luft-dez", dataset_id: str = "airquality"):
-        self.client = bigquery.Client(project=project)
+    def __init__(self, project: str = "berliner-luft-dez", dataset_id: str = "airquality",
+                 spool_bytes: int = 8 * 1024 * 1024):
+        self.client = bigquery.Client(project=project, credentials=google_credentials()[0],
+                                      _http=authorized_session())
         self.dataset_id = dataset_id
         self.project = project
+        self.spool_bytes = spool_bytes
 
     def load_table(
         self,
         *,
-        rows: List[Dict[str, Any]],
+        rows: Iterable[Dict[str, Any]],
         table_id: str,
         schema: List[SchemaField],
         write_disposition: str = "WRITE_TRUNCATE"
     ) -> None:
-        """Generic method to load data into BigQuery"""
+        """Generic method to load data into BigQuery
+
+        Rows are serialized one at a time into a newline-delimited JSON
+        spool (memory up to ``spool_bytes``, then a temp file), so a
+        generator of rows is never materialized as a list or one JSON string.
+        """
         # table_ref = self.client.dataset(self.dataset_id).table(table_id)
         table_ref = f"{self.project}.{self.dataset_id}.{table_id}"
 
         job_config = bigquery.LoadJobConfig(
             autodetect=True,
             schema=schema,
-            write_disposition=write_disposition
+            write_disposition=write_disposition,
+            source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON
         )
-        
-        load_job = self.client.load_table_from_json(rows, table_ref, 
-                                                    job_config=job_config)
-        load_job.result()
-        logging.info(f"Loaded {len(rows)} rows into {table_id}")
\ No newline at end of file
+
+        with tempfile.SpooledTemporaryFile(max_size=self.spool_bytes, mode="r+b") as spool:
+            row_count = 0
+            for row in rows:
+                spool.write(json_codec.dumps(row))
+                spool.write(b"\n")
+                row_count += 1
+
+            if not row_count:
+                logging.warning(f"No rows to load into {table_id}")
+                return
+
+            load_bytes = spool.tell()
+            with metrics.span("load"):
+                load_job = self.client.load_table_from_file(spool, table_ref, rewind=True,
+                                                            job_config=job_config)
+                load_job.result()
+        metrics.incr("load_rows", row_count)
+        metrics.incr("load_bytes", load_bytes)
+        logging.info(f"Loaded {row_count} rows into {table_id}")
+
+    def merge_table(self, *, rows: Iterable[Dict[str, Any]], table_id: str,
+                    schema: List[SchemaField], keys: List[str]) -> None:
+        """Upsert rows on ``keys`` via a staging table and a MERGE statement"""
+        staging = f"{table_id}__merge_staging"
+        self.load_table(rows=rows, table_id=staging, schema=schema,
+                        write_disposition="WRITE_TRUNCATE")
+        names = [field.name for field in schema]
+        match = " AND ".join(f"t.`{key}` = s.`{key}`" for key in keys)
+        updates = ", ".join(f"`{name}` = s.`{name}`" for name in names if name not in keys)
+        sql = (
+            f"MERGE `{self.project}.{self.dataset_id}.{table_id}` t "
+            f"USING `{self.project}.{self.dataset_id}.{staging}` s ON {match} "
+            + (f"WHEN MATCHED THEN UPDATE SET {updates} " if updates else "")
+            + "WHEN NOT MATCHED THEN INSERT ROW"
+        )
+        try:
+            self.client.query(sql).result()
+        finally:
+            self.client.delete_table(f"{self.project}.{self.dataset_id}.{staging}",
+                                     not_found_ok=True)
+        logging.info(f"Merged rows into {table_id} on {keys}")
+
+    def query(self, sql: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """Run a parameterized query and return the result rows as dicts"""
+        job_config = bigquery.QueryJobConfig(query_parameters=[
+            self._query_parameter(name, value) for name, value in (params or {}).items()
+        ])
+        return [dict(row.items()) for row in self.client.query(sql, job_config=job_config).result()]
+
+    @staticmethod
+    def _query_parameter(name: str, value: Any):
+        types = {bool: "BOOL", int: "INT64", float: "FLOAT64", str: "STRING", datetime: "TIMESTAMP"}
+        if isinstance(value, (list, tuple)):
+            element = types[type(value[0])] if value else "STRING"
+            return bigquery.ArrayQueryParameter(name, element, list(value))
+        return bigquery.ScalarQueryParameter(name, types[type(value)], value)
+
+    def close(self) -> None:
+        """Release the underlying HTTP transport"""
+        self.client.close()
@@ -1,27 +1,74 @@
-import json
+from typing import List
 from google.cloud import storage
 from google.api_core.exceptions import GoogleAPIError
 import logging
+from utils.instrumentation import metrics
+from utils import json_codec
+from services.transport import google_credentials, authorized_session
 
 logger = logging.getLogger(__name__)
 
 
 class GCSUploader:
     def __init__(self, bucket_name):
-        self.client = storage.Client()
+        credentials, project = google_credentials()
+        self.client = storage.Client(project=project, credentials=credentials,
+                                     _http=authorized_session())
         self.bucket = self.client.bucket(bucket_name)
     
     def upload_json(self, data, destination_blob_name):
-        """Upload JSON-serializable data directly to GCS"""
+        """Upload JSON-serializable data directly to GCS; decoded API payloads keep their original bytes"""
         try:
-            blob = self.bucket.blob(destination_blob_name)
-            blob.upload_from_string(
-                data=json.dumps(data),
-                content_type='application/json'
-            )
+            payload = json_codec.dumps(data)
+            with metrics.span("upload"):
+                blob = self.bucket.blob(destination_blob_name)
+                blob.upload_from_string(
+                    data=payload,
+                    content_type='application/json'
+                )
+            metrics.incr("upload_bytes", len(payload))
             logger.info(f"Uploaded {destination_blob_name} to GCS")
-            # logger.info("Sample transformed record: %s", json.dumps(data))
             return True
         except GoogleAPIError as e:
             logger.error(f"GCS upload failed: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+    def upload_bytes(self, data: bytes, destination_blob_name: str,
+                     content_type: str = 'application/octet-stream') -> bool:
+        """Upload pre-serialized bytes to GCS"""
+        try:
+            with metrics.span("upload"):
+                blob = self.bucket.blob(destination_blob_name)
+                blob.upload_from_string(data=data, content_type=content_type)
+            metrics.incr("upload_bytes", len(data))
+            logger.info(f"Uploaded {destination_blob_name} to GCS")
+            return True
+        except GoogleAPIError as e:
+            logger.error(f"GCS upload failed: {str(e)}")
+            return False
+
+    def list_blobs(self, prefix: str, match_glob: str = None) -> List[str]:
+        """Names of blobs under prefix, optionally filtered server-side by a glob"""
+        return [
+            blob.name
+            for blob in self.client.list_blobs(self.bucket, prefix=prefix,
+                                               match_glob=match_glob)
+        ]
+
+    def url(self, blob_name: str) -> str:
+        """Cloud Console link to a blob or prefix"""
+        return f"https://console.cloud.google.com/storage/browser/{self.bucket.name}/{blob_name}"
+
+    def exists(self, blob_name: str) -> bool:
+        return self.bucket.blob(blob_name).exists()
+
+    def download_bytes(self, blob_name: str) -> bytes:
+        return self.bucket.blob(blob_name).download_as_bytes()
+
+    def download_json(self, blob_name: str):
+        return json_codec.loads(self.download_bytes(blob_name))
+
+    def delete_blobs(self, blob_names: List[str]) -> None:
+        for blob_name in blob_names:
+            self.bucket.blob(blob_name).delete()
+        logger.info(f"Deleted {len(blob_names)} blobs from GCS")
@@ -0,0 +1,63 @@
+import logging
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import List
+from utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+
+class LocalArchive:
+    """Filesystem stand-in for GCSUploader; blob names map to paths under ``root``"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, blob_name: str) -> Path:
+        return self.root / blob_name
+
+    def upload_json(self, data, destination_blob_name):
+        return self.upload_bytes(json_codec.dumps(data), destination_blob_name,
+                                 content_type='application/json')
+
+    def upload_bytes(self, data: bytes, destination_blob_name: str,
+                     content_type: str = 'application/octet-stream') -> bool:
+        try:
+            path = self._path(destination_blob_name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            logger.info(f"Wrote {destination_blob_name} to {self.root}")
+            return True
+        except OSError as e:
+            logger.error(f"Local archive write failed: {str(e)}")
+            return False
+
+    def list_blobs(self, prefix: str, match_glob: str = None) -> List[str]:
+        """Same contract as GCSUploader.list_blobs; the glob's * also matches '/'"""
+        base = self._path(prefix.rsplit("/", 1)[0]) if "/" in prefix else self.root
+        if not base.is_dir():
+            return []
+        names = (path.relative_to(self.root).as_posix()
+                 for path in base.rglob("*") if path.is_file())
+        return sorted(
+            name for name in names
+            if name.startswith(prefix) and (match_glob is None or fnmatchcase(name, match_glob))
+        )
+
+    def url(self, blob_name: str) -> str:
+        return self._path(blob_name).resolve().as_uri()
+
+    def exists(self, blob_name: str) -> bool:
+        return self._path(blob_name).is_file()
+
+    def download_bytes(self, blob_name: str) -> bytes:
+        return self._path(blob_name).read_bytes()
+
+    def download_json(self, blob_name: str):
+        return json_codec.loads(self.download_bytes(blob_name))
+
+    def delete_blobs(self, blob_names: List[str]) -> None:
+        for blob_name in blob_names:
+            self._path(blob_name).unlink()
+        logger.info(f"Deleted {len(blob_names)} blobs from {self.root}")
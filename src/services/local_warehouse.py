@@ -0,0 +1,176 @@
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, List
+import duckdb
+import pyarrow as pa
+from google.cloud.bigquery import SchemaField
+from config import schemas
+from utils.batching import batched
+from utils.sql_dialect import to_duckdb, split_statements
+
+logger = logging.getLogger(__name__)
+
+# BigQuery type -> (DuckDB column type, Arrow staging type)
+_TYPES = {
+    "INTEGER": ("BIGINT", pa.int64()),
+    "INT64": ("BIGINT", pa.int64()),
+    "FLOAT": ("DOUBLE", pa.float64()),
+    "FLOAT64": ("DOUBLE", pa.float64()),
+    "NUMERIC": ("DECIMAL(38, 9)", pa.float64()),
+    "BOOLEAN": ("BOOLEAN", pa.bool_()),
+    "BOOL": ("BOOLEAN", pa.bool_()),
+    "STRING": ("VARCHAR", pa.string()),
+    # Staged as ISO strings and cast on insert
+    "TIMESTAMP": ("TIMESTAMP", pa.string()),
+    "DATE": ("DATE", pa.string()),
+}
+
+# Day-partitioned tables and their partition column (see terraform/main.tf)
+PARTITION_FIELDS = {"raw_measures": "measure_start_time"}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class LocalWarehouse:
+    """
+    Embedded DuckDB stand-in for BigQueryClient.
+
+    Tables live in a schema named after the dataset, are created from the
+    same SchemaField lists (REQUIRED becomes NOT NULL, unknown fields are
+    rejected like a BigQuery load job) and support WRITE_APPEND,
+    WRITE_TRUNCATE (also on ``table$YYYYMMDD`` partitions) and keyed merges.
+    Queries and the sql/ scripts are translated from BigQuery SQL, so the
+    dashboard views can be built and queried locally.
+    """
+
+    def __init__(self, path: str = None, project: str = "berliner-luft-dez",
+                 dataset_id: str = "airquality", batch_rows: int = 50000):
+        self.project = project
+        self.dataset_id = dataset_id
+        self.batch_rows = batch_rows
+        self.path = str(path) if path else ":memory:"
+        self.connection = duckdb.connect(self.path)
+        self._lock = threading.Lock()
+        with self._lock:
+            self.connection.execute("SET TimeZone = 'UTC'")
+            self.connection.execute(f"CREATE SCHEMA IF NOT EXISTS {_quote(dataset_id)}")
+        # Known tables exist up front so views over them can be created
+        for entity, schema in schemas.DIMENSION_SCHEMAS.items():
+            self._create_table(f"dim_{entity}", schema, replace=False)
+        self._create_table("raw_measures", schemas.RAW_MEASURES_SCHEMA, replace=False)
+
+    def _ref(self, table: str) -> str:
+        return f"{_quote(self.dataset_id)}.{_quote(table)}"
+
+    def _create_table(self, table: str, schema: List[SchemaField], replace: bool) -> None:
+        columns = ", ".join(
+            f"{_quote(field.name)} {_TYPES[field.field_type][0]}"
+            f"{' NOT NULL' if field.mode == 'REQUIRED' else ''}"
+            for field in schema
+        )
+        verb = "CREATE OR REPLACE TABLE" if replace else "CREATE TABLE IF NOT EXISTS"
+        with self._lock:
+            self.connection.execute(f"{verb} {self._ref(table)} ({columns})")
+
+    def load_table(
+        self,
+        *,
+        rows: Iterable[Dict[str, Any]],
+        table_id: str,
+        schema: List[SchemaField],
+        write_disposition: str = "WRITE_TRUNCATE"
+    ) -> None:
+        """Same contract as BigQueryClient.load_table"""
+        table, _, partition = table_id.partition("$")
+        batches = batched(rows, self.batch_rows)
+        first = next(batches, None)
+        if first is None:
+            logging.warning(f"No rows to load into {table_id}")
+            return
+
+        if write_disposition == "WRITE_TRUNCATE" and not partition:
+            self._create_table(table, schema, replace=True)
+        else:
+            self._create_table(table, schema, replace=False)
+        with self._lock:
+            if write_disposition == "WRITE_TRUNCATE" and partition:
+                day = datetime.strptime(partition, "%Y%m%d").date()
+                self.connection.execute(
+                    f"DELETE FROM {self._ref(table)} "
+                    f"WHERE CAST({_quote(PARTITION_FIELDS[table])} AS DATE) = ?", [day])
+            elif write_disposition == "WRITE_EMPTY":
+                if self.connection.execute(f"SELECT COUNT(*) FROM {self._ref(table)}").fetchone()[0]:
+                    raise ValueError(f"Table {table_id} is not empty")
+
+        row_count = self._insert(table, schema, [first], batches)
+        logging.info(f"Loaded {row_count} rows into local {table_id}")
+
+    def merge_table(self, *, rows: Iterable[Dict[str, Any]], table_id: str,
+                    schema: List[SchemaField], keys: List[str]) -> None:
+        """Upsert rows: replace existing rows with the same ``keys``, insert the rest"""
+        self._create_table(table_id, schema, replace=False)
+        staging = f"_merge_{table_id}"
+        self._create_table(staging, schema, replace=True)
+        try:
+            row_count = self._insert(staging, schema, [], batched(rows, self.batch_rows))
+            match = " AND ".join(
+                f"t.{_quote(key)} IS NOT DISTINCT FROM s.{_quote(key)}" for key in keys)
+            with self._lock:
+                self.connection.execute(
+                    f"DELETE FROM {self._ref(table_id)} AS t "
+                    f"USING {self._ref(staging)} AS s WHERE {match}")
+                self.connection.execute(
+                    f"INSERT INTO {self._ref(table_id)} SELECT * FROM {self._ref(staging)}")
+        finally:
+            with self._lock:
+                self.connection.execute(f"DROP TABLE IF EXISTS {self._ref(staging)}")
+        logging.info(f"Merged {row_count} rows into local {table_id}")
+
+    def _insert(self, table: str, schema: List[SchemaField],
+                head: List[List[Dict[str, Any]]], batches: Iterable[List[Dict[str, Any]]]) -> int:
+        names = [field.name for field in schema]
+        arrow_schema = pa.schema([(field.name, _TYPES[field.field_type][1]) for field in schema])
+        select = ", ".join(
+            f"CAST({_quote(field.name)} AS {_TYPES[field.field_type][0]})" for field in schema)
+        row_count = 0
+        for batch in (*head, *batches):
+            unknown = {key for row in batch for key in row} - set(names)
+            if unknown:
+                raise ValueError(f"No such field(s) {sorted(unknown)} in {table}")
+            staged = pa.Table.from_pylist(batch, schema=arrow_schema)
+            with self._lock:
+                self.connection.register("_staged_rows", staged)
+                try:
+                    self.connection.execute(
+                        f"INSERT INTO {self._ref(table)} ({', '.join(map(_quote, names))}) "
+                        f"SELECT {select} FROM _staged_rows")
+                finally:
+                    self.connection.unregister("_staged_rows")
+            row_count += len(batch)
+        return row_count
+
+    def query(self, sql: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """Run BigQuery-dialect SQL (with @params) and return rows as dicts"""
+        with self._lock:
+            cursor = self.connection.execute(to_duckdb(sql), params or None)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def apply_sql_dir(self, sql_dir) -> List[str]:
+        """Run every sql/*.sql script (tables, views) in name order"""
+        applied = []
+        for path in sorted(Path(sql_dir).glob("*.sql")):
+            with self._lock:
+                for statement in split_statements(path.read_text(encoding="utf-8")):
+                    self.connection.execute(to_duckdb(statement))
+            applied.append(path.name)
+        logger.info(f"Applied {applied} to the local warehouse")
+        return applied
+
+    def close(self) -> None:
+        with self._lock:
+            self.connection.close()
@@ -0,0 +1,100 @@
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from config import constants
+from services.sinks import ArchiveSink
+from utils.instrumentation import metrics
+
+logger = logging.getLogger(__name__)
+
+GENERATION_BLOB = "state/table_generations.json"
+
+
+def cache_key(sql: str, params: Dict[str, Any] = None) -> Tuple:
+    """Hashable (query, parameters) key; list parameters become tuples"""
+    return sql, tuple(sorted(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in (params or {}).items()
+    ))
+
+
+def table_generations(gcs: ArchiveSink) -> Dict[str, str]:
+    """Per-table write markers written by ingestion runs ({} before the first run)"""
+    if gcs.exists(GENERATION_BLOB):
+        return gcs.download_json(GENERATION_BLOB)
+    return {}
+
+
+def record_table_writes(gcs: ArchiveSink, tables: Iterable[str], now: datetime = None) -> None:
+    """Mark tables as rewritten; cached results that read them stop matching"""
+    tables = list(tables)
+    if not tables:
+        return
+    marker = (now or datetime.now(timezone.utc)).isoformat()
+    generations = table_generations(gcs)
+    generations.update({table: marker for table in tables})
+    gcs.upload_json(generations, GENERATION_BLOB)
+    logger.info(f"Recorded writes to {tables} at {marker}")
+
+
+class QueryCache:
+    """
+    Size-bounded LRU cache of query results.
+
+    Entries are keyed by (query, parameters) and stored with the write
+    markers of the tables the query reads. A lookup with different markers
+    is a miss, so results stay valid until an ingestion run rewrites one of
+    those tables rather than for a fixed TTL.
+    """
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or constants.CONFIG["query_cache_max_entries"]
+        self._entries: "OrderedDict[Tuple, Tuple[Tuple, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, key: Tuple, generation: Tuple) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                metrics.incr("query_cache_hits")
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+                self.invalidations += 1
+            self.misses += 1
+            metrics.incr("query_cache_misses")
+            return None
+
+    def put(self, key: Tuple, generation: Tuple, rows: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[key] = (generation, rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+# Process-wide cache, kept across invocations of a warm instance
+query_cache = QueryCache()
@@ -0,0 +1,44 @@
+from typing import Protocol, Dict, Any, Iterable, List, runtime_checkable
+from google.cloud.bigquery import SchemaField
+
+
+@runtime_checkable
+class ArchiveSink(Protocol):
+    """Blob storage for raw payloads and run state (GCSUploader, LocalArchive)"""
+
+    def upload_json(self, data, destination_blob_name: str) -> bool: ...
+
+    def upload_bytes(self, data: bytes, destination_blob_name: str,
+                     content_type: str = 'application/octet-stream') -> bool: ...
+
+    def list_blobs(self, prefix: str, match_glob: str = None) -> List[str]: ...
+
+    def url(self, blob_name: str) -> str: ...
+
+    def exists(self, blob_name: str) -> bool: ...
+
+    def download_bytes(self, blob_name: str) -> bytes: ...
+
+    def download_json(self, blob_name: str): ...
+
+    def delete_blobs(self, blob_names: List[str]) -> None: ...
+
+
+@runtime_checkable
+class TableSink(Protocol):
+    """Warehouse tables (BigQueryClient, BigQueryStreamWriter, LocalWarehouse)"""
+
+    def load_table(self, *, rows: Iterable[Dict[str, Any]], table_id: str,
+                   schema: List[SchemaField], write_disposition: str = "WRITE_TRUNCATE") -> None: ...
+
+    def close(self) -> None: ...
+
+
+@runtime_checkable
+class QueryableTableSink(TableSink, Protocol):
+    """Table sink that can also run queries and keyed merges"""
+
+    def query(self, sql: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]: ...
+
+    def merge_table(self, *, rows: Iterable[Dict[str, Any]], table_id: str,
+                    schema: List[SchemaField], keys: List[str]) -> None: ...
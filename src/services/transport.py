@@ -0,0 +1,146 @@
+import logging
+import socket
+import threading
+from typing import Dict, Tuple
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from config import constants
+from utils.instrumentation import metrics
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
+
+_lock = threading.Lock()
+_adapters: Dict[str, "PooledHTTPAdapter"] = {}
+_credentials = None
+
+
+def _keepalive_socket_options():
+    options = list(HTTPConnection.default_socket_options) + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        idle = constants.CONFIG["http_keepalive_idle_seconds"]
+        options += [(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle),
+                    (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, idle)]
+    return options
+
+
+def _counting_pool(pool_cls, name: str):
+    """Pool class counting new connections (handshakes) and requests that found no idle connection"""
+
+    class Connection(pool_cls.ConnectionCls):
+        def connect(self):
+            metrics.incr(f"{name}_handshakes")
+            super().connect()
+
+    class Pool(pool_cls):
+        ConnectionCls = Connection
+
+        def _get_conn(self, timeout=None):
+            if self.pool is not None and self.pool.empty():
+                metrics.incr(f"{name}_pool_saturated")
+            return super()._get_conn(timeout)
+
+    Pool.__name__ = f"Counting{pool_cls.__name__}"
+    return Pool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    Process-wide requests adapter: sized keep-alive pools, default
+    connect/read timeouts and handshake/saturation counters.
+
+    Sessions mounting it come and go, so ``close()`` keeps the pooled
+    connections for the next session; ``shutdown()`` really drops them.
+    """
+
+    def __init__(self, name: str, pool_connections: int, pool_maxsize: int,
+                 timeout: Tuple[float, float], max_retries: int = 0):
+        self.name = name
+        self.timeout = timeout
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                         max_retries=max_retries)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block=block,
+                                 socket_options=_keepalive_socket_options(), **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool(HTTPConnectionPool, self.name),
+            "https": _counting_pool(HTTPSConnectionPool, self.name),
+        }
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=self.timeout if timeout is None else timeout, **kwargs)
+
+    def close(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        super().close()
+
+
+def shared_adapter(name: str) -> PooledHTTPAdapter:
+    """The pooled adapter for one upstream ("uba", "google"), created on first use"""
+    with _lock:
+        if name not in _adapters:
+            _adapters[name] = PooledHTTPAdapter(
+                name,
+                pool_connections=constants.CONFIG["http_pool_connections"],
+                pool_maxsize=constants.CONFIG["http_pool_maxsize"],
+                timeout=(constants.CONFIG["http_connect_timeout"],
+                         constants.CONFIG["http_read_timeout"]),
+                # Connection-error retries as google-auth's own session uses;
+                # UBA requests are retried by tenacity in the API clients
+                max_retries=3 if name == "google" else 0,
+            )
+        return _adapters[name]
+
+
+def pooled_session(name: str) -> requests.Session:
+    """New Session (own headers/cookies) sharing the process-wide connection pool for ``name``"""
+    session = requests.Session()
+    adapter = shared_adapter(name)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def google_credentials():
+    """Application default credentials and project, resolved once per process"""
+    global _credentials
+    with _lock:
+        if _credentials is None:
+            import google.auth
+            _credentials = google.auth.default(scopes=GOOGLE_SCOPES)
+        return _credentials
+
+
+def authorized_session():
+    """AuthorizedSession for GCS/BigQuery clients on the shared "google" pool"""
+    from google.auth.transport.requests import AuthorizedSession, Request
+    credentials, _ = google_credentials()
+    session = AuthorizedSession(credentials, auth_request=Request(pooled_session("google")))
+    adapter = shared_adapter("google")
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def aiohttp_settings(name: str) -> Dict[str, object]:
+    """ClientSession timeout and trace hooks counting handshakes and pool waits like the requests pools"""
+    trace = aiohttp.TraceConfig()
+
+    async def on_connection_create_end(session, context, params):
+        metrics.incr(f"{name}_handshakes")
+
+    async def on_connection_queued_start(session, context, params):
+        metrics.incr(f"{name}_pool_saturated")
+
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_connection_queued_start.append(on_connection_queued_start)
+    timeout = aiohttp.ClientTimeout(sock_connect=constants.CONFIG["http_connect_timeout"],
+                                    sock_read=constants.CONFIG["http_read_timeout"])
+    return {"timeout": timeout, "trace_configs": [trace]}
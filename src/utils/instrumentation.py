@@ -0,0 +1,101 @@
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List
+from config import constants
+
+STAGES = ("fetch", "parse", "transform", "upload", "load")
+
+
+class Metrics:
+    """
+    Per-run spans and counters.
+
+    ``span(stage, component=...)`` times a block and adds it to the stage
+    totals and, when given, to that component's latency; pipeline spans key
+    components by their numeric UBA id. Counters track
+    bytes, rows, retries and cache hits. Thread-safe, so the asyncio
+    pipeline's worker threads can report into the same run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.perf_counter()
+            self.spans: Dict[str, Dict[str, float]] = defaultdict(
+                lambda: {"count": 0, "seconds": 0.0, "max_seconds": 0.0})
+            self.components: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+            self.counters: Dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def span(self, stage: str, component: Any = None) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, component)
+
+    def observe(self, stage: str, seconds: float, component: Any = None) -> None:
+        with self._lock:
+            span = self.spans[stage]
+            span["count"] += 1
+            span["seconds"] += seconds
+            span["max_seconds"] = max(span["max_seconds"], seconds)
+            if component is not None:
+                self.components[str(component)][stage] += seconds
+
+    def incr(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] += value
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-ready snapshot: wall time, stage spans, per-component seconds, counters"""
+        with self._lock:
+            elapsed = time.perf_counter() - self.started
+            spans = {
+                stage: {
+                    "count": span["count"],
+                    "seconds": round(span["seconds"], 4),
+                    "max_seconds": round(span["max_seconds"], 4),
+                }
+                for stage, span in self.spans.items()
+            }
+            rows = self.counters.get("load_rows", 0)
+            return {
+                "wall_seconds": round(elapsed, 3),
+                "rows_per_second": round(rows / elapsed, 1) if elapsed else 0.0,
+                "spans": spans,
+                "components": {
+                    component: {stage: round(seconds, 4) for stage, seconds in stages.items()}
+                    for component, stages in self.components.items()
+                },
+                "counters": dict(self.counters),
+            }
+
+
+# One registry per process; entry points reset it at the start of each run
+metrics = Metrics()
+
+
+def count_retry(counter: str):
+    """tenacity ``before_sleep`` hook counting each retry attempt"""
+    def before_sleep(retry_state) -> None:
+        metrics.incr(counter)
+    return before_sleep
+
+
+def log_sample(logger: logging.Logger, message: str, rows: List[Dict[str, Any]],
+               sample: int = None) -> None:
+    """Log a row count plus the first few rows as one structured line"""
+    sample = constants.CONFIG["log_sample_rows"] if sample is None else sample
+    logger.info(json.dumps({
+        "message": message,
+        "rows": len(rows),
+        "sample": rows[:sample],
+    }, default=str, ensure_ascii=False))
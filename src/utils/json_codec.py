@@ -0,0 +1,64 @@
+import json
+from typing import Any, Optional, Union
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _default(obj: Any) -> Any:
+    """stdlib counterpart of OPT_SERIALIZE_NUMPY"""
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """UTF-8 JSON bytes; a JSONPayload that still holds its source bytes is returned as-is"""
+    if isinstance(obj, JSONPayload) and obj.raw is not None:
+        return obj.raw
+    if orjson is not None:
+        return orjson.dumps(obj, option=_OPTIONS)
+    return json.dumps(obj, ensure_ascii=False, default=_default).encode("utf-8")
+
+
+def _invalidating(name: str):
+    method = getattr(dict, name)
+
+    def wrapper(self, *args, **kwargs):
+        self.raw = None
+        return method(self, *args, **kwargs)
+    wrapper.__name__ = name
+    return wrapper
+
+
+class JSONPayload(dict):
+    """
+    Decoded JSON object that remembers the bytes it was decoded from, so it
+    can be archived without re-encoding. Top-level mutation drops the bytes;
+    nested values must not be modified in place while ``raw`` is set.
+    """
+
+    raw: Optional[bytes] = None
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Any:
+        decoded = loads(data)
+        if not isinstance(decoded, dict):
+            return decoded
+        payload = cls(decoded)
+        payload.raw = bytes(data)
+        return payload
+
+    for _name in ("__setitem__", "__delitem__", "update", "pop", "popitem", "clear", "setdefault"):
+        locals()[_name] = _invalidating(_name)
+    del _name
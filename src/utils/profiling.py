@@ -0,0 +1,90 @@
+import cProfile
+import hmac
+import io
+import json
+import logging
+import marshal
+import pstats
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Optional
+from config import constants
+from services.gcs_uploader import GCSUploader
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile-Token"
+
+
+def profiling_requested(request) -> bool:
+    """True for ?profile=1 with a X-Profile-Token header matching PROFILE_TOKEN"""
+    if request.args.get("profile") not in ("1", "true"):
+        return False
+    token = constants.CONFIG["profile_token"]
+    supplied = request.headers.get(PROFILE_HEADER)
+    if not token or not supplied:
+        logger.warning("Profiling requested without a valid token; ignoring")
+        return False
+    return hmac.compare_digest(supplied.encode(), token.encode())
+
+
+class RunProfiler:
+    """
+    Wraps a run in cProfile and tracemalloc when enabled; a no-op otherwise.
+
+    On exit it uploads three files under profiles/year=/month=/<run>/ next to
+    the raw archive: the binary pstats dump (``python -m pstats``/snakeviz),
+    a text report of the top functions by cumulative time, and the top
+    allocation sites as JSON. ``link`` points at that folder.
+    """
+
+    def __init__(self, gcs: GCSUploader, enabled: bool = False, now: datetime = None):
+        self.gcs = gcs
+        self.enabled = enabled
+        self.top = constants.CONFIG["profile_top_entries"]
+        now = now or datetime.now(timezone.utc)
+        self.prefix = (f"profiles/year={now.year}/month={now.month:02}/"
+                       f"{now.strftime('%Y%m%dT%H%M%S')}/")
+        self.profile: Optional[cProfile.Profile] = None
+
+    @property
+    def link(self) -> Optional[str]:
+        return self.gcs.url(self.prefix) if self.enabled else None
+
+    def __enter__(self) -> "RunProfiler":
+        if self.enabled:
+            tracemalloc.start(constants.CONFIG["profile_traceback_frames"])
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if not self.enabled:
+            return
+        self.profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        try:
+            self._upload(snapshot)
+        except Exception as e:
+            logger.error(f"Failed uploading profile to {self.prefix}: {str(e)}")
+
+    def _upload(self, snapshot: tracemalloc.Snapshot) -> None:
+        self.profile.create_stats()
+        self.gcs.upload_bytes(marshal.dumps(self.profile.stats), f"{self.prefix}profile.pstats")
+
+        report = io.StringIO()
+        pstats.Stats(self.profile, stream=report).sort_stats("cumulative").print_stats(self.top)
+        self.gcs.upload_bytes(report.getvalue().encode(), f"{self.prefix}profile.txt",
+                              content_type="text/plain")
+
+        allocations = [
+            {
+                "site": str(stat.traceback[0]),
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[:self.top]
+        ]
+        self.gcs.upload_json(allocations, f"{self.prefix}allocations.json")
+        logger.info(f"Uploaded profile to {self.prefix}")
@@ -0,0 +1,70 @@
+import re
+from typing import Callable, List
+
+# BigQuery type names used in sql/ and their DuckDB equivalents
+_TYPES = {"STRING": "VARCHAR", "FLOAT64": "DOUBLE", "INT64": "BIGINT", "BOOL": "BOOLEAN"}
+
+
+def _split_args(body: str) -> List[str]:
+    args, depth, current = [], 0, []
+    for char in body:
+        if char == "," and depth == 0:
+            args.append("".join(current).strip())
+            current = []
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current.append(char)
+    args.append("".join(current).strip())
+    return args
+
+
+def _rewrite_calls(sql: str, name: str, rewrite: Callable[[List[str]], str]) -> str:
+    """Replace every NAME(...) call, innermost arguments first, with rewrite(args)"""
+    pattern = re.compile(rf"\b{name}\s*\(", re.IGNORECASE)
+    while True:
+        match = pattern.search(sql)
+        if not match:
+            return sql
+        depth, end = 1, match.end()
+        while depth:
+            depth += {"(": 1, ")": -1}.get(sql[end], 0)
+            end += 1
+        args = [_rewrite_calls(arg, name, rewrite) for arg in _split_args(sql[match.end():end - 1])]
+        sql = sql[:match.start()] + rewrite(args) + sql[end:]
+
+
+def to_duckdb(sql: str) -> str:
+    """
+    Translate the BigQuery SQL used in this repo (sql/ views, client queries)
+    to DuckDB: table references, parameters, type names and the few
+    BigQuery-only functions we rely on.
+    """
+    sql = re.sub(r"`(?:[\w-]+\.)?(\w+)\.(\w+)`", r"\1.\2", sql)
+    sql = re.sub(r"\bIN\s+UNNEST\s*\(\s*@(\w+)\s*\)", r"= ANY($\1)", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"@(\w+)", r"$\1", sql)
+    sql = _rewrite_calls(sql, "TIMESTAMP_TRUNC",
+                         lambda a: f"date_trunc('{a[1].lower()}', {a[0]})")
+    sql = _rewrite_calls(sql, "TIMESTAMP_DIFF",
+                         lambda a: f"date_diff('{a[2].lower()}', {a[1]}, {a[0]})")
+    sql = _rewrite_calls(sql, "FORMAT", lambda a: f"printf({', '.join(a)})")
+    for bigquery_type, duckdb_type in _TYPES.items():
+        sql = re.sub(rf"(?<!')\b{bigquery_type}\b(?!')", duckdb_type, sql)
+    return sql
+
+
+def split_statements(script: str) -> List[str]:
+    """Split a .sql file on top-level semicolons outside string literals"""
+    statements, current, quote = [], [], None
+    for char in script:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in ("'", '"'):
+            quote = char
+        elif char == ";":
+            statements.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    statements.append("".join(current).strip())
+    return [s for s in statements if s]
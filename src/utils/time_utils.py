@@ -1,4 +1,11 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+from zoneinfo import ZoneInfo
+import numpy as np
+
+# The UBA API reports measure times in German local time
+UBA_TIMEZONE = ZoneInfo("Europe/Berlin")
+
 
 def parse_airquality_timestamp(ts: str) -> datetime:
     """Parse timestamps with 24:00:00 handling"""
@@ -9,4 +16,33 @@ def parse_airquality_timestamp(ts: str) -> datetime:
             base_ts = ts.replace("24:00:00", "00:00:00")
             base_dt = datetime.strptime(base_ts, "%Y-%m-%d %H:%M:%S")
             return base_dt + timedelta(days=1)
-        raise
\ No newline at end of file
+        raise
+
+
+def airquality_timestamp_to_utc(ts: str) -> datetime:
+    """Parse a UBA (Europe/Berlin) timestamp into an aware UTC datetime"""
+    return parse_airquality_timestamp(ts).replace(tzinfo=UBA_TIMEZONE).astimezone(timezone.utc)
+
+
+def parse_airquality_timestamps(timestamps: Sequence[str]) -> np.ndarray:
+    """Vectorised parse_airquality_timestamp; unparseable entries become NaT"""
+    raw = np.asarray(timestamps, dtype=object).astype(str)
+    if not raw.size:
+        return np.empty(0, dtype="datetime64[s]")
+
+    rollover = np.char.find(raw, " 24:00:00") >= 0
+    normalised = np.where(rollover,
+                          np.char.replace(raw, " 24:00:00", " 00:00:00"), raw)
+    try:
+        parsed = normalised.astype("datetime64[s]")
+    except ValueError:
+        # At least one malformed entry: fall back to element-wise parsing
+        parsed = np.full(raw.size, np.datetime64("NaT"), dtype="datetime64[s]")
+        for i, ts in enumerate(normalised):
+            try:
+                parsed[i] = np.datetime64(ts, "s")
+            except ValueError:
+                pass
+
+    parsed[rollover] += np.timedelta64(1, "D")
+    return parsed
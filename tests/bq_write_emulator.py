@@ -0,0 +1,76 @@
+"""In-memory stand-in for the BigQuery Storage Write API used by offline tests."""
+from google.api_core import exceptions
+from google.cloud.bigquery_storage_v1 import types
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+from google.rpc import code_pb2, status_pb2
+
+
+class WriteAPIEmulator:
+    """
+    Implements the subset of BigQueryWriteClient the stream writer uses, with
+    the server's offset rules: appending below the end of a stream answers
+    ALREADY_EXISTS, appending past it answers OUT_OF_RANGE.
+    """
+
+    def __init__(self, lose_acks: int = 0):
+        self.streams = {}
+        self.lose_acks = lose_acks  # commit the next N appends but fail their response
+        self.append_calls = 0
+
+    @staticmethod
+    def table_path(project, dataset, table):
+        return f"projects/{project}/datasets/{dataset}/tables/{table}"
+
+    def create_write_stream(self, parent, write_stream):
+        name = f"{parent}/streams/{len(self.streams)}"
+        self.streams[name] = {"table": parent.rsplit("/", 1)[-1], "rows": [],
+                              "finalized": False, "type": write_stream.type_}
+        return types.WriteStream(name=name, type_=write_stream.type_)
+
+    def finalize_write_stream(self, name):
+        self.streams[name]["finalized"] = True
+        return types.FinalizeWriteStreamResponse(row_count=len(self.streams[name]["rows"]))
+
+    def append_rows(self, requests):
+        for request in requests:
+            self.append_calls += 1
+            yield self._append(request)
+
+    def rows(self, table_id):
+        return [row for stream in self.streams.values()
+                if stream["table"] == table_id for row in stream["rows"]]
+
+    def _append(self, request):
+        stream = self.streams[request.write_stream]
+        if stream["finalized"]:
+            return self._error(code_pb2.FAILED_PRECONDITION, "stream finalized")
+        if request.offset < len(stream["rows"]):
+            return self._error(code_pb2.ALREADY_EXISTS, f"offset {request.offset} exists")
+        if request.offset > len(stream["rows"]):
+            return self._error(code_pb2.OUT_OF_RANGE, f"offset {request.offset} past end")
+
+        decode = self._decoder(request.proto_rows.writer_schema.proto_descriptor)
+        stream["rows"].extend(decode(raw) for raw in request.proto_rows.rows.serialized_rows)
+
+        if self.lose_acks:
+            self.lose_acks -= 1
+            raise exceptions.ServiceUnavailable("connection reset before ack")
+        return types.AppendRowsResponse(
+            append_result=types.AppendRowsResponse.AppendResult(offset=request.offset))
+
+    @staticmethod
+    def _error(code, message):
+        return types.AppendRowsResponse(error=status_pb2.Status(code=code, message=message))
+
+    @staticmethod
+    def _decoder(descriptor: descriptor_pb2.DescriptorProto):
+        pool = descriptor_pool.DescriptorPool()
+        pool.Add(descriptor_pb2.FileDescriptorProto(
+            name="emulator.proto", syntax="proto2", message_type=[descriptor]))
+        message_cls = message_factory.GetMessageClass(
+            pool.FindMessageTypeByName(descriptor.name))
+
+        def decode(raw):
+            message = message_cls.FromString(raw)
+            return {field.name: value for field, value in message.ListFields()}
+        return decode
@@ -0,0 +1,43 @@
+"""In-memory stand-in for GCSUploader used by offline tests."""
+import json
+from fnmatch import fnmatchcase
+
+
+class FakeGCS:
+    def __init__(self, blobs=None):
+        self.blobs = dict(blobs or {})
+
+    def upload_json(self, data, destination_blob_name):
+        self.blobs[destination_blob_name] = json.dumps(data).encode()
+        return True
+
+    def upload_bytes(self, data, destination_blob_name,
+                     content_type='application/octet-stream'):
+        self.blobs[destination_blob_name] = bytes(data)
+        return True
+
+    def list_blobs(self, prefix, match_glob=None):
+        return sorted(
+            name for name in self.blobs
+            if name.startswith(prefix) and (match_glob is None or fnmatchcase(name, match_glob))
+        )
+
+    def url(self, blob_name):
+        return f"https://console.cloud.google.com/storage/browser/fake-bucket/{blob_name}"
+
+    def exists(self, blob_name):
+        return blob_name in self.blobs
+
+    def download_bytes(self, blob_name):
+        return self.blobs[blob_name]
+
+    def download_json(self, blob_name):
+        return json.loads(self.blobs[blob_name])
+
+    def delete_blobs(self, blob_names):
+        for blob_name in blob_names:
+            del self.blobs[blob_name]
+
+    def json_blobs(self, prefix=""):
+        return {name: self.download_json(name) for name in self.list_blobs(prefix)
+                if name.endswith(".json")}
@@ -1,3 +1,5 @@
+import json
+from datetime import datetime, timedelta, timezone
 from services.api_client import LuftdatenAPIClient
 import pytest
 import requests
@@ -20,6 +22,10 @@ class DummyResponse:
         if self.status_code != 200:
             raise requests.HTTPError(f"status code was {self.status_code}")
 
+    @property
+    def content(self):
+        return json.dumps(self._data).encode()
+
     def json(self):
         return self._data
 
@@ -182,3 +188,12 @@ def test_get_scopes_retry_error(monkeypatch):
 
     with pytest.raises(RetryError):
         client.get_scopes()
+
+
+def test_window_params_cover_requested_hours():
+    start = datetime(2025, 4, 7, 10, tzinfo=timezone.utc)
+    params = LuftdatenAPIClient.window_params(1, 175, start, start + timedelta(hours=5), scope_id=2)
+
+    assert params["date_from"] == params["date_to"] == "2025-04-07"
+    assert (params["time_from"], params["time_to"]) == ("10", "16")
+    assert params["station"] == "175"
@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime, timezone
+import aiohttp
+import pytest
+from tenacity import RetryError, wait_none
+from config import constants
+from core.async_measures_processor import AsyncMeasuresProcessor
+from services.api_client import LuftdatenAPIClient
+from services.async_api_client import AsyncLuftdatenAPIClient
+from uba_stub import UBAStub
+
+_NOW = datetime(2025, 4, 1, 12, tzinfo=timezone.utc)
+
+
+class DummyGCS:
+    def __init__(self):
+        self.uploaded = {}
+
+    def upload_json(self, data, blob_name):
+        self.uploaded[blob_name] = data
+        return True
+
+
+class DummyBQ:
+    def __init__(self):
+        self.loaded = []
+
+    def load_table(self, *, rows, table_id, schema, write_disposition):
+        self.loaded.append({"rows": rows, "table_id": table_id})
+
+
+@pytest.fixture
+def no_retry_wait(monkeypatch):
+    monkeypatch.setattr(AsyncLuftdatenAPIClient._get_data.retry, "wait", wait_none())
+
+
+async def _fetch_all(base_url):
+    async with AsyncLuftdatenAPIClient(base_url=base_url) as api:
+        return (await api.get_components(),
+                await api.get_stations(),
+                await api.get_measures(1, 175, scope_id=2, now=_NOW))
+
+
+def test_async_client_matches_sync_client():
+    with UBAStub() as stub:
+        sync_api = LuftdatenAPIClient()
+        sync_api.BASE_URL = stub.url
+        expected = (sync_api.get_components(),
+                    sync_api.get_stations(),
+                    sync_api.get_measures(1, 175, scope_id=2, now=_NOW))
+
+        assert asyncio.run(_fetch_all(stub.url)) == expected
+        # both clients send identical measures queries
+        measures_queries = [p for e, p in stub.requests if e == "measures/json"]
+        assert measures_queries[0] == measures_queries[1]
+
+
+def test_async_client_retries_server_errors(no_retry_wait):
+    with UBAStub(fail_first=2) as stub:
+        components, _, _ = asyncio.run(_fetch_all(stub.url))
+    assert "PM10" in components
+
+
+def test_async_client_gives_up_after_three_attempts(no_retry_wait):
+    async def fetch(base_url):
+        async with AsyncLuftdatenAPIClient(base_url=base_url) as api:
+            return await api.get_components()
+
+    with UBAStub(fail_first=3) as stub:
+        with pytest.raises(RetryError) as excinfo:
+            asyncio.run(fetch(stub.url))
+        assert len(stub.requests) == 3
+    assert isinstance(excinfo.value.last_attempt.exception(), aiohttp.ClientResponseError)
+
+
+def test_async_pipeline_processes_all_station_component_pairs(monkeypatch):
+    monkeypatch.setitem(constants.CONFIG, "measure_scopes", [2])
+    stations = [175, 176, 177]
+    gcs, bq = DummyGCS(), DummyBQ()
+
+    async def run(base_url):
+        async with AsyncLuftdatenAPIClient(base_url=base_url) as api:
+            processor = AsyncMeasuresProcessor(api, gcs, bq, station_ids=stations,
+                                               max_in_flight=4)
+            return await processor.process_measures()
+
+    with UBAStub(station_ids=stations, missing={(176, 2)}) as stub:
+        processed = asyncio.run(run(stub.url))
+
+    assert processed == 8
+    assert len(gcs.uploaded) == 8
+    # all validated rows go out in a single load job
+    assert len(bq.loaded) == 1
+    assert len(bq.loaded[0]["rows"]) == 8 * 24
+    assert {r["station_id"] for r in bq.loaded[0]["rows"]} == set(stations)
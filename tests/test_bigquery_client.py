@@ -0,0 +1,75 @@
+import json
+from datetime import datetime, timezone
+from google.cloud import bigquery
+from config import schemas
+from services.bigquery_client import BigQueryClient
+
+
+class FakeJob:
+    def result(self):
+        return None
+
+
+class FakeClient:
+    def __init__(self):
+        self.loads = []
+
+    def load_table_from_file(self, file_obj, destination, rewind=False, job_config=None):
+        if rewind:
+            file_obj.seek(0)
+        self.loads.append((destination, file_obj.read(), job_config))
+        return FakeJob()
+
+
+def _client(spool_bytes=64):
+    bq = BigQueryClient.__new__(BigQueryClient)
+    bq.client = FakeClient()
+    bq.project, bq.dataset_id, bq.spool_bytes = "p", "d", spool_bytes
+    return bq
+
+
+def test_load_table_streams_generator_as_ndjson():
+    bq = _client()
+    rows = ({"station_id": i, "name": "Mitte ü"} for i in range(10))
+
+    bq.load_table(rows=rows, table_id="dim_stations",
+                  schema=schemas.DIMENSION_SCHEMAS["stations"],
+                  write_disposition="WRITE_TRUNCATE")
+
+    [(destination, payload, job_config)] = bq.client.loads
+    assert destination == "p.d.dim_stations"
+    assert job_config.source_format == bigquery.SourceFormat.NEWLINE_DELIMITED_JSON
+    assert job_config.write_disposition == "WRITE_TRUNCATE"
+    lines = payload.decode("utf-8").splitlines()
+    assert [json.loads(line)["station_id"] for line in lines] == list(range(10))
+    assert json.loads(lines[0])["name"] == "Mitte ü"
+
+
+def test_load_table_skips_empty_input():
+    bq = _client()
+    bq.load_table(rows=iter(()), table_id="raw_measures",
+                  schema=schemas.RAW_MEASURES_SCHEMA, write_disposition="WRITE_APPEND")
+    assert bq.client.loads == []
+
+
+def test_query_builds_typed_parameters():
+    class FakeQueryJob:
+        def result(self):
+            return [bigquery.Row((175, 3), {"station_id": 0, "hour": 1})]
+
+    captured = {}
+
+    def query(sql, job_config=None):
+        captured["params"] = {p.name: p for p in job_config.query_parameters}
+        return FakeQueryJob()
+
+    bq = _client()
+    bq.client.query = query
+    start = datetime(2025, 4, 7, tzinfo=timezone.utc)
+
+    rows = bq.query("SELECT 1", {"scope_id": 2, "station_ids": [175], "window_start": start})
+
+    assert rows == [{"station_id": 175, "hour": 3}]
+    assert captured["params"]["scope_id"].type_ == "INT64"
+    assert captured["params"]["station_ids"].array_type == "INT64"
+    assert captured["params"]["window_start"].type_ == "TIMESTAMP"
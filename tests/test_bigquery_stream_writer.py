@@ -0,0 +1,94 @@
+import pytest
+from tenacity import wait_none
+from config import schemas
+from services.bigquery_stream_writer import BigQueryStreamWriter
+from bq_write_emulator import WriteAPIEmulator
+
+_ROWS = [
+    {
+        "station_id": 175,
+        "measure_start_time": f"2025-04-01T{h:02}:00:00",
+        "component_id": 1,
+        "scope_id": 2,
+        "value": 10.0 + h,
+        "measure_end_time": f"2025-04-01T{h + 1:02}:00:00",
+        "index": None if h % 2 else "1"
+    }
+    for h in range(5)
+]
+
+
+class DummyBQ:
+    def __init__(self):
+        self.loaded = []
+        self.closed = False
+
+    def load_table(self, *, rows, table_id, schema, write_disposition):
+        self.loaded.append((table_id, write_disposition, rows))
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def no_retry_wait(monkeypatch):
+    monkeypatch.setattr(BigQueryStreamWriter._append.retry, "wait", wait_none())
+
+
+def _writer(emulator, batch_client=None):
+    return BigQueryStreamWriter(project="p", dataset_id="d", write_client=emulator,
+                                batch_client=batch_client or DummyBQ(), max_batch_rows=2)
+
+
+def test_append_streams_rows_in_offset_batches():
+    emulator = WriteAPIEmulator()
+    writer = _writer(emulator)
+
+    writer.load_table(rows=_ROWS, table_id="raw_measures",
+                      schema=schemas.RAW_MEASURES_SCHEMA, write_disposition="WRITE_APPEND")
+
+    stored = emulator.rows("raw_measures")
+    assert emulator.append_calls == 3
+    assert [r["value"] for r in stored] == [10.0, 11.0, 12.0, 13.0, 14.0]
+    # 2025-04-01T00:00:00Z in microseconds
+    assert stored[0]["measure_start_time"] == 1743465600 * 1_000_000
+    assert "index" not in stored[1]
+    assert stored[0]["index"] == "1"
+
+
+def test_retry_after_lost_ack_is_exactly_once(no_retry_wait):
+    emulator = WriteAPIEmulator(lose_acks=1)
+    writer = _writer(emulator)
+
+    writer.load_table(rows=_ROWS, table_id="raw_measures",
+                      schema=schemas.RAW_MEASURES_SCHEMA, write_disposition="WRITE_APPEND")
+    writer.load_table(rows=_ROWS[:1], table_id="raw_measures",
+                      schema=schemas.RAW_MEASURES_SCHEMA, write_disposition="WRITE_APPEND")
+
+    # first batch was committed, then retried and answered ALREADY_EXISTS
+    assert emulator.append_calls == 5
+    assert len(emulator.rows("raw_measures")) == 6
+
+
+def test_truncating_loads_fall_back_to_batch_client():
+    emulator, batch = WriteAPIEmulator(), DummyBQ()
+    writer = _writer(emulator, batch_client=batch)
+
+    writer.load_table(rows=[{"id": 1}], table_id="dim_components",
+                      schema=schemas.DIMENSION_SCHEMAS["components"],
+                      write_disposition="WRITE_TRUNCATE")
+
+    assert batch.loaded == [("dim_components", "WRITE_TRUNCATE", [{"id": 1}])]
+    assert emulator.streams == {}
+
+
+def test_close_finalizes_streams():
+    emulator, batch = WriteAPIEmulator(), DummyBQ()
+    writer = _writer(emulator, batch_client=batch)
+    writer.load_table(rows=_ROWS[:1], table_id="raw_measures",
+                      schema=schemas.RAW_MEASURES_SCHEMA, write_disposition="WRITE_APPEND")
+
+    writer.close()
+
+    assert all(stream["finalized"] for stream in emulator.streams.values())
+    assert batch.closed
@@ -0,0 +1,93 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from config import schemas
+from core.dashboard_reader import DashboardReader
+from services.local_warehouse import LocalWarehouse
+from services.query_cache import QueryCache, cache_key, record_table_writes
+from fake_gcs import FakeGCS
+
+SQL_DIR = Path(__file__).resolve().parents[1] / "sql"
+NOW = datetime(2025, 4, 2, 10, 30, tzinfo=timezone.utc)
+
+
+class CountingWarehouse:
+    """Opens one LocalWarehouse and counts the queries that reach it"""
+
+    def __init__(self, warehouse):
+        self.warehouse = warehouse
+        self.queries = 0
+        self.connects = 0
+
+    def connect(self):
+        self.connects += 1
+        return self
+
+    def query(self, sql, params=None):
+        self.queries += 1
+        return self.warehouse.query(sql, params)
+
+    def close(self):
+        pass
+
+
+def _warehouse():
+    warehouse = LocalWarehouse()
+    warehouse.load_table(rows=[{"id": 9, "code": "PM2", "symbol": "PM2", "unit": "µg/m³",
+                                "name": "Feinstaub"}],
+                         table_id="dim_components", schema=schemas.DIMENSION_SCHEMAS["components"])
+    _load(warehouse, [(1, h, 44.0) for h in range(24)] + [(2, 8, 11.0), (2, 9, 12.0)])
+    warehouse.apply_sql_dir(SQL_DIR)
+    return CountingWarehouse(warehouse)
+
+
+def _load(warehouse, measures):
+    warehouse.load_table(rows=[
+        {"station_id": 175, "measure_start_time": f"2025-04-{day:02}T{hour:02}:00:00",
+         "measure_end_time": f"2025-04-{day:02}T{hour:02}:59:59", "component_id": 9,
+         "scope_id": 2, "value": value, "index": "1"}
+        for day, hour, value in measures
+    ], table_id="raw_measures", schema=schemas.RAW_MEASURES_SCHEMA, write_disposition="WRITE_APPEND")
+
+
+def test_views_are_served_from_cache_until_a_table_is_rewritten():
+    bq, gcs, cache = _warehouse(), FakeGCS(), QueryCache(max_entries=8)
+
+    reader = DashboardReader(bq.connect, gcs, cache=cache, now=NOW)
+    [current] = reader.current_air_quality(175)
+    assert (current["component_code"], current["value"]) == ("PM2", 12.0)
+    assert current["measure_start_time"].startswith("2025-04-02T09:00:00")
+    days = reader.daily_cigarettes(175, days=2)
+    assert [d["cigarettes_equivalent"] for d in days] == [0.52, 2.0]
+
+    again = DashboardReader(bq.connect, gcs, cache=cache, now=NOW.replace(minute=59))
+    assert again.current_air_quality(175) == [current]
+    assert again.daily_cigarettes(175, days=2) == days
+    assert bq.queries == 2 and bq.connects == 1
+
+    _load(bq.warehouse, [(2, 10, 30.0)])
+    record_table_writes(gcs, ["raw_measures"])
+    fresh = DashboardReader(bq.connect, gcs, cache=cache, now=NOW)
+    assert fresh.current_air_quality(175)[0]["value"] == 30.0
+    assert bq.queries == 3
+    assert cache.stats() == {"entries": 2, "max_entries": 8, "hits": 2, "misses": 3,
+                             "evictions": 0, "invalidations": 1, "hit_rate": 0.4}
+
+
+def test_unrelated_table_writes_keep_entries():
+    bq, gcs, cache = _warehouse(), FakeGCS(), QueryCache(max_entries=8)
+    DashboardReader(bq.connect, gcs, cache=cache, now=NOW).current_air_quality(175)
+    record_table_writes(gcs, ["dim_scopes"])
+    DashboardReader(bq.connect, gcs, cache=cache, now=NOW).current_air_quality(175)
+    assert bq.queries == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryCache(max_entries=2)
+    for name in ("a", "b"):
+        cache.put(cache_key(name, {"ids": [1, 2]}), ("g",), [name])
+    assert cache.get(cache_key("a", {"ids": [1, 2]}), ("g",)) == ["a"]
+    cache.put(cache_key("c"), ("g",), ["c"])
+
+    assert cache.get(cache_key("b", {"ids": [1, 2]}), ("g",)) is None
+    assert cache.get(cache_key("a", {"ids": [1, 2]}), ("g",)) == ["a"]
+    assert cache.stats()["evictions"] == 1
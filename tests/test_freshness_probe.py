@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from core.freshness_probe import FreshnessProbe, STATE_BLOB
+from fake_gcs import FakeGCS
+from services.api_client import LuftdatenAPIClient
+
+
+class DummyAPI:
+    """Publishes ``hours`` (Berlin time), but only those the requested window reaches"""
+
+    def __init__(self, hours):
+        self.hours = hours
+        self.calls = []
+
+    def get_measures(self, component_id, station_id, hours_back=24, scope_id=2, now=None):
+        params = LuftdatenAPIClient.measures_params(component_id, station_id, hours_back, scope_id, now)
+        self.calls.append(params)
+        # The API counts hours by their end
+        return {"data": {str(station_id): {
+            f"2025-04-01 {h:02}:00:00": [component_id, scope_id, 10.0, f"2025-04-01 {h + 1:02}:00:00", "1"]
+            for h in self.hours
+            if params["date_to"] > "2025-04-01" or h + 1 <= int(params["time_to"])
+        }}}
+
+
+def _probe(gcs, hours, now):
+    return FreshnessProbe(DummyAPI(hours), gcs, station_id=175, component_id=1,
+                          now=datetime(2025, 4, 1, *now, tzinfo=timezone.utc))
+
+
+def test_first_run_has_new_data_with_single_request():
+    gcs = FakeGCS()
+    probe = _probe(gcs, [8, 9], now=(8, 20))
+
+    assert probe.has_new_data()
+    # 08:20 UTC is 10:20 in Berlin
+    [params] = probe.api.calls
+    assert (params["date_to"], params["time_to"]) == ("2025-04-01", "10")
+    probe.mark_ingested()
+    # 09:00 Berlin summer time is 07:00 UTC; it ended at 08:00 UTC and was seen 20 minutes later
+    state = gcs.download_json(STATE_BLOB)
+    assert state["last_ingested_hour"] == "2025-04-01T07:00:00+00:00"
+    assert state["delays_minutes"] == [20.0]
+
+
+def test_short_circuits_until_next_hour_is_published():
+    gcs = FakeGCS()
+    first = _probe(gcs, [8, 9], now=(8, 20))
+    first.has_new_data()
+    first.mark_ingested()
+
+    stale = _probe(gcs, [8, 9], now=(9, 10))
+    assert not stale.has_new_data()
+    assert stale.report()["latest_published_hour"] == "2025-04-01T07:00:00+00:00"
+
+    fresh = _probe(gcs, [8, 9, 10], now=(9, 30))
+    assert fresh.has_new_data()
+    fresh.mark_ingested()
+    # hour 10 Berlin ended at 09:00 UTC; missed at 09:10, seen at 09:30 -> ~20 minutes
+    assert gcs.download_json(STATE_BLOB)["delays_minutes"] == [20.0, 20.0]
+
+
+def test_publication_delay_drives_next_run():
+    gcs = FakeGCS({STATE_BLOB: b'{"last_ingested_hour": null, "last_empty_probe": null, '
+                               b'"delays_minutes": [10, 20, 30, 40, 50]}'})
+    probe = _probe(gcs, [], now=(11, 5))
+
+    assert not probe.has_new_data()
+    report = probe.report()
+    assert report["publication_delay_minutes"]["median"] == 30.0
+    assert report["next_run_at"] == "2025-04-01T12:46:00+00:00"
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from config import constants
+from core.gap_scanner import GapScanner, HourBitmap
+from fake_gcs import FakeGCS
+
+_NOW = datetime(2025, 4, 8, 3, 30, tzinfo=timezone.utc)
+# window_end = 00:00 on 2025-04-08 with 3 settle hours, window_start a day earlier
+_START = datetime(2025, 4, 7, tzinfo=timezone.utc)
+
+
+class DummyBQ:
+    project, dataset_id = "p", "d"
+
+    def __init__(self, present):
+        self.present = present
+        self.queries = []
+        self.loaded = []
+
+    def query(self, sql, params=None):
+        self.queries.append((sql, params))
+        return [{"station_id": s, "component_id": c, "hour": h}
+                for (s, c), hours in self.present.items() for h in hours]
+
+    def load_table(self, *, rows, table_id, schema, write_disposition):
+        self.loaded.extend(rows)
+
+
+class DummyAPI:
+    def __init__(self, missing=()):
+        self.missing = set(missing)
+        self.windows = []
+        self.probes = []
+
+    def get_components(self):
+        return {"count": 2, "PM10": ["1", "PM10", "PM10", "µg/m³", "Feinstaub"],
+                "NO2": ["5", "NO2", "NO2", "µg/m³", "Stickstoffdioxid"]}
+
+    def get_measures(self, component_id, station_id, hours_back=24, scope_id=2, now=None):
+        self.probes.append((station_id, component_id))
+        if (station_id, component_id) in self.missing:
+            return {"data": {}}
+        return {"data": {str(station_id): {"2025-04-08 02:00:00": [
+            component_id, scope_id, 12.0, "2025-04-08 03:00:00", "1"]}}}
+
+    def get_measures_window(self, component_id, station_id, start, end, scope_id=2):
+        self.windows.append((station_id, component_id, start, end))
+        hours = int((end - start).total_seconds() // 3600) + 1
+        data = {}
+        for h in range(-1, hours + 1):
+            ts = start + timedelta(hours=h)
+            data[ts.strftime("%Y-%m-%d %H:%M:%S")] = [
+                component_id, scope_id, 12.0, (ts + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"), "1"]
+        return {"data": {str(station_id): data}}
+
+
+@pytest.fixture
+def config(monkeypatch):
+    monkeypatch.setitem(constants.CONFIG, "gap_settle_hours", 3)
+    monkeypatch.setitem(constants.CONFIG, "gap_merge_hours", 2)
+    monkeypatch.setitem(constants.CONFIG, "gap_max_window_hours", 6)
+
+
+def _scanner(present, station_ids=(175,), missing=()):
+    return GapScanner(DummyAPI(missing), FakeGCS(), DummyBQ(present), station_ids=list(station_ids),
+                      lookback_days=1, now=_NOW)
+
+
+def test_bitmap_missing_runs():
+    bitmap = HourBitmap.from_hours([0, 1, 4, 5, 6, 9], size=12)
+    assert bitmap.bits.nbytes == 2
+    assert bitmap.missing_runs(12) == [(2, 3), (7, 8), (10, 11)]
+
+
+def test_plan_merges_close_gaps_and_caps_window_length(config):
+    scanner = _scanner({})
+    present = [h for h in range(24) if h not in {3, 5, 6, 12, 14, 15, 16, 17, 18, 19, 20, 21, 22}]
+    windows = scanner.plan({(175, 1): HourBitmap.from_hours(present, 24)})
+
+    assert [(w.first_hour, w.last_hour) for w in windows] == [(3, 6), (12, 17), (18, 22)]
+    assert windows[0].missing == [3, 5, 6]
+
+
+def test_repair_refetches_and_loads_only_missing_hours(config):
+    scanner = _scanner({(175, 1): [h for h in range(24) if h not in (10, 11)],
+                        (175, 5): list(range(24))})
+
+    summary = scanner.repair()
+
+    assert summary == {"gaps": 2, "windows": 1, "failed_windows": 0, "rows": 2}
+    assert scanner.api.windows == [(175, 1, _START + timedelta(hours=10), _START + timedelta(hours=11))]
+    assert [r["measure_start_time"] for r in scanner.bq.loaded] == [
+        "2025-04-07T10:00:00", "2025-04-07T11:00:00"]
+    assert scanner.gcs.list_blobs("raw/station_id=175/component_id=1/scope_id=2/")
+    assert scanner.api.probes == []
+    _, params = scanner.bq.queries[0]
+    assert params["window_start"] == _START and params["station_ids"] == [175]
+
+
+def test_pairs_without_any_rows_are_repaired_in_full(config):
+    scanner = _scanner({(175, 1): list(range(24))})
+
+    summary = scanner.repair()
+
+    assert summary == {"gaps": 24, "windows": 4, "failed_windows": 0, "rows": 24}
+    assert {component_id for _, component_id, _, _ in scanner.api.windows} == {5}
+
+
+def test_components_a_station_never_measures_are_not_refetched(config):
+    scanner = _scanner({(175, 1): list(range(24)), (282, 1): list(range(24))},
+                       station_ids=(175, 282), missing={(282, 5)})
+
+    summary = scanner.repair()
+
+    assert scanner.api.probes == [(175, 5), (282, 5)]
+    assert {(s, c) for s, c, _, _ in scanner.api.windows} == {(175, 5)}
+    assert summary["gaps"] == 24
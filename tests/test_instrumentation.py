@@ -0,0 +1,96 @@
+import json
+import logging
+import requests
+from tenacity import wait_none
+from utils.instrumentation import Metrics, metrics, log_sample
+from services.api_client import LuftdatenAPIClient
+from core.dimension_manager import DimensionManager
+from core.measures_processor import MeasuresProcessor
+
+
+class DummyResponse:
+    content = b'{"ok": true}'
+
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def raise_for_status(self):
+        if self.fail:
+            raise requests.HTTPError("503")
+
+    def json(self):
+        return {"ok": True}
+
+
+def test_spans_and_counters_summary():
+    run = Metrics()
+    with run.span("fetch", component="PM10"):
+        pass
+    with run.span("fetch", component="NO2"):
+        pass
+    run.observe("load", 0.5)
+    run.incr("load_rows", 100)
+
+    summary = run.summary()
+
+    assert summary["spans"]["fetch"]["count"] == 2
+    assert summary["spans"]["load"] == {"count": 1, "seconds": 0.5, "max_seconds": 0.5}
+    assert set(summary["components"]) == {"PM10", "NO2"}
+    assert summary["counters"] == {"load_rows": 100}
+    json.dumps(summary)
+
+
+def test_api_client_reports_fetch_bytes_and_retries(monkeypatch):
+    monkeypatch.setattr(LuftdatenAPIClient._get_data.retry, "wait", wait_none())
+    responses = iter([DummyResponse(fail=True), DummyResponse()])
+    client = LuftdatenAPIClient()
+    client.session.get = lambda url, params: next(responses)
+    metrics.reset()
+
+    client.get_measures(component_id=1, station_id=175)
+
+    summary = metrics.summary()
+    assert summary["counters"]["fetch_retries"] == 1
+    assert summary["counters"]["fetch_bytes"] == len(DummyResponse.content)
+    assert summary["spans"]["fetch"]["count"] == 2
+    assert "parse" in summary["components"]["1"]
+
+
+def test_pipeline_spans_share_one_component_key():
+    class DummyGCS:
+        def upload_json(self, data, blob_path):
+            pass
+
+    client = LuftdatenAPIClient()
+    client.session.get = lambda url, params: DummyResponse()
+    processor = MeasuresProcessor(client, DummyGCS(), None, station_id=175)
+    metrics.reset()
+
+    measures = client.get_measures(component_id=1, station_id=175)
+    processor.archive_and_transform({"id": 1, "code": "PM10", "unit": "µg/m³"}, 2, measures)
+
+    assert set(metrics.summary()["components"]) == {"1"}
+    assert set(metrics.summary()["components"]["1"]) == {"fetch", "parse", "transform"}
+
+
+def test_dimension_rows_are_logged_as_a_sample(caplog):
+    class DummyBQ:
+        def load_table(self, **kwargs):
+            pass
+
+    data = {"count": 5, **{f"C{i}": [str(i), f"C{i}", "C", "µg/m³", "Test"] for i in range(5)}}
+
+    with caplog.at_level(logging.INFO, logger="core.dimension_manager"):
+        DimensionManager(None, None, DummyBQ())._load_to_bigquery("components", data)
+
+    [record] = [r for r in caplog.records if r.name == "core.dimension_manager"]
+    entry = json.loads(record.getMessage())
+    assert entry["rows"] == 5
+    assert len(entry["sample"]) == 3
+
+
+def test_log_sample_respects_explicit_size(caplog):
+    logger = logging.getLogger("test.sample")
+    with caplog.at_level(logging.INFO, logger="test.sample"):
+        log_sample(logger, "rows", [{"a": 1}, {"a": 2}], sample=1)
+    assert json.loads(caplog.records[0].getMessage())["sample"] == [{"a": 1}]
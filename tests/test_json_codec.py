@@ -0,0 +1,45 @@
+import pytest
+import numpy as np
+from services.local_archive import LocalArchive
+from utils import json_codec
+from utils.json_codec import JSONPayload
+
+BODY = b'{"data": {"175": {"2025-04-01 10:00:00": [9, 2, 12.5, "2025-04-01 11:00:00", "1"]}}}'
+
+
+def test_payload_archives_its_original_bytes(tmp_path):
+    payload = JSONPayload.from_bytes(BODY)
+    assert payload["data"]["175"]["2025-04-01 10:00:00"][2] == 12.5
+    assert json_codec.dumps(payload) is payload.raw
+
+    archive = LocalArchive(tmp_path)
+    archive.upload_json(payload, "raw/a.json")
+    assert archive.download_bytes("raw/a.json") == BODY
+
+
+def test_top_level_mutation_drops_raw_bytes():
+    payload = JSONPayload.from_bytes(BODY)
+    payload["extra"] = 1
+    assert payload.raw is None
+    assert json_codec.loads(json_codec.dumps(payload))["extra"] == 1
+
+
+def test_non_object_bodies_decode_to_plain_values():
+    assert JSONPayload.from_bytes(b"[1, 2]") == [1, 2]
+
+
+def test_stdlib_fallback_matches_native_output(monkeypatch):
+    row = {"station_id": np.int64(175), "value": np.float64(1.5), "unit": "µg/m³",
+           "flags": np.array([1, 0], dtype=np.int8)}
+    native = json_codec.loads(json_codec.dumps(row))
+    monkeypatch.setattr(json_codec, "orjson", None)
+    fallback = json_codec.dumps(row)
+    assert fallback.decode("utf-8").count("µ") == 1
+    assert json_codec.loads(fallback) == native == {
+        "station_id": 175, "value": 1.5, "unit": "µg/m³", "flags": [1, 0]}
+
+
+def test_stdlib_fallback_rejects_unknown_types(monkeypatch):
+    monkeypatch.setattr(json_codec, "orjson", None)
+    with pytest.raises(TypeError):
+        json_codec.dumps({"when": object()})
@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import pytest
+from config import schemas
+from core.gap_scanner import PRESENT_HOURS_SQL
+from services.local_archive import LocalArchive
+from services.local_warehouse import LocalWarehouse
+from services.sinks import ArchiveSink, QueryableTableSink
+from utils.sql_dialect import to_duckdb
+
+SQL_DIR = Path(__file__).resolve().parents[1] / "sql"
+
+
+def _measure(day, hour, value, component_id=9):
+    return {"station_id": 175, "measure_start_time": f"2025-04-{day:02}T{hour:02}:00:00",
+            "measure_end_time": f"2025-04-{day:02}T{hour:02}:59:59", "component_id": component_id,
+            "scope_id": 2, "value": value, "index": "1"}
+
+
+def _load(warehouse, rows, table_id="raw_measures", disposition="WRITE_APPEND"):
+    warehouse.load_table(rows=iter(rows), table_id=table_id,
+                         schema=schemas.RAW_MEASURES_SCHEMA, write_disposition=disposition)
+
+
+def _values(warehouse):
+    return [r["value"] for r in warehouse.query(
+        "SELECT value FROM `airquality.raw_measures` ORDER BY measure_start_time, value")]
+
+
+def test_local_backends_satisfy_sink_protocols(tmp_path):
+    assert isinstance(LocalArchive(tmp_path), ArchiveSink)
+    assert isinstance(LocalWarehouse(), QueryableTableSink)
+
+
+def test_local_archive_round_trip_and_glob(tmp_path):
+    archive = LocalArchive(tmp_path)
+    archive.upload_json({"a": 1}, "raw/station_id=175/year=2025/month=04/2025-04-01T10:00:00.json")
+    archive.upload_bytes(b"x", "raw/station_id=175/year=2025/month=04/2025-04-02T10:00:00.json")
+
+    names = archive.list_blobs("raw/", match_glob="raw/**/2025-04-01T*.json")
+
+    assert names == ["raw/station_id=175/year=2025/month=04/2025-04-01T10:00:00.json"]
+    assert archive.download_json(names[0]) == {"a": 1}
+    archive.delete_blobs(names)
+    assert not archive.exists(names[0])
+    assert archive.list_blobs("missing/") == []
+
+
+def test_append_partition_truncate_and_merge():
+    warehouse = LocalWarehouse()
+    _load(warehouse, [_measure(1, 10, 1.0), _measure(2, 10, 2.0)])
+    _load(warehouse, [_measure(2, 11, 3.0)], table_id="raw_measures$20250402",
+          disposition="WRITE_TRUNCATE")
+    assert _values(warehouse) == [1.0, 3.0]
+
+    warehouse.merge_table(rows=[_measure(1, 10, 9.0), _measure(1, 12, 4.0)],
+                          table_id="raw_measures", schema=schemas.RAW_MEASURES_SCHEMA,
+                          keys=["station_id", "component_id", "scope_id", "measure_start_time"])
+    assert _values(warehouse) == [9.0, 4.0, 3.0]
+
+
+def test_load_rejects_unknown_fields_and_skips_empty_input():
+    warehouse = LocalWarehouse()
+    with pytest.raises(ValueError, match="scope_id"):
+        warehouse.load_table(rows=[{"scope_id": 2, "name": "x", "description": "y"}],
+                             table_id="dim_scopes", schema=schemas.DIMENSION_SCHEMAS["scopes"])
+    _load(warehouse, [_measure(1, 10, 1.0)])
+    _load(warehouse, [], disposition="WRITE_TRUNCATE")
+    assert _values(warehouse) == [1.0]
+
+
+def test_sql_views_run_locally():
+    warehouse = LocalWarehouse()
+    warehouse.load_table(rows=[{"id": 9, "code": "PM2", "symbol": "PM2", "unit": "µg/m³",
+                                "name": "Feinstaub"}],
+                         table_id="dim_components", schema=schemas.DIMENSION_SCHEMAS["components"])
+    _load(warehouse, [_measure(1, h, 44.0) for h in range(24)])
+
+    assert warehouse.apply_sql_dir(SQL_DIR) == ["air_quality_limits.sql", "daily_pm_to_cigarettes.sql"]
+    [day] = warehouse.query("SELECT * FROM `berliner-luft-dez.airquality.v_daily_pm_to_cigarettes`")
+    assert day["measure_count"] == 24
+    assert day["cigarettes_equivalent"] == 2.0
+    assert day["data_quality"] == "vollständig"
+
+    hours = warehouse.query(
+        PRESENT_HOURS_SQL.format(project="p", dataset="airquality"),
+        {"scope_id": 2, "station_ids": [175],
+         "window_start": datetime(2025, 4, 1, tzinfo=timezone.utc),
+         "window_end": datetime(2025, 4, 1, 6, tzinfo=timezone.utc)})
+    assert sorted(r["hour"] for r in hours) == [0, 1, 2, 3, 4, 5]
+
+
+def test_to_duckdb_rewrites_nested_bigquery_functions():
+    sql = ("SELECT TIMESTAMP_DIFF(TIMESTAMP_TRUNC(t, HOUR), @start, HOUR), FORMAT('%.1f', x) "
+           "FROM `p.d.tbl` WHERE id IN UNNEST(@ids)")
+    assert to_duckdb(sql) == (
+        "SELECT date_diff('hour', $start, date_trunc('hour', t)), printf('%.1f', x) "
+        "FROM d.tbl WHERE id = ANY($ids)")
@@ -0,0 +1,148 @@
+import flask
+import pytest
+import main
+from config import constants
+from core import station_index
+from fake_gcs import FakeGCS
+from services.query_cache import table_generations
+
+
+class DummySink:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class DummyRequest:
+    args = {}
+    headers = {}
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Entry points wired to fake sinks with the freshness probe off"""
+    gcs, bq = FakeGCS(), DummySink()
+    monkeypatch.setattr(main, "LuftdatenAPIClient", lambda: None)
+    monkeypatch.setattr(main, "build_archive", lambda: gcs)
+    monkeypatch.setattr(main, "build_bigquery_sink", lambda: bq)
+    monkeypatch.setattr(main, "build_warehouse", lambda: bq)
+    monkeypatch.setattr(main, "process_dimensions", lambda api, gcs, bq: None)
+    monkeypatch.setitem(constants.CONFIG, "freshness_probe_enabled", False)
+    with flask.Flask("test").app_context():
+        yield gcs, bq
+
+
+def _fail(*args, **kwargs):
+    raise RuntimeError("load failed")
+
+
+def test_sink_is_closed_when_measures_fail(pipeline, monkeypatch):
+    gcs, bq = pipeline
+    monkeypatch.setattr(main, "process_measures", _fail)
+
+    _, status = main.main(DummyRequest())
+
+    assert status == 500
+    assert bq.closed
+
+
+def test_failed_run_still_invalidates_measures_cache(pipeline, monkeypatch):
+    gcs, bq = pipeline
+    monkeypatch.setattr(main, "process_measures", _fail)
+
+    main.main(DummyRequest())
+
+    assert "raw_measures" in table_generations(gcs)
+
+
+def test_repair_closes_warehouse_on_failure(pipeline, monkeypatch):
+    gcs, bq = pipeline
+    monkeypatch.setattr(main, "GapScanner", _fail)
+    monkeypatch.setattr(main, "selected_station_ids", lambda api=None: [175])
+
+    _, status = main.repair_gaps(DummyRequest())
+
+    assert status == 500
+    assert bq.closed
+    assert "raw_measures" in table_generations(gcs)
+
+
+def test_repair_without_rows_keeps_measures_cache(pipeline, monkeypatch):
+    class EmptyScanner:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def repair(self):
+            return {"rows": 0}
+
+    gcs, bq = pipeline
+    monkeypatch.setattr(main, "GapScanner", EmptyScanner)
+    monkeypatch.setattr(main, "selected_station_ids", lambda api=None: [175])
+
+    _, status = main.repair_gaps(DummyRequest())
+
+    assert status == 200
+    assert "raw_measures" not in table_generations(gcs)
+
+
+def test_repair_builds_station_index_for_a_selection_on_a_cold_instance(pipeline, monkeypatch):
+    class StationsAPI:
+        def get_stations(self):
+            return {"count": 2, "indices": [], "data": {
+                str(sid): [str(sid), f"DE{sid}", f"Station {sid}", "Berlin", "", "", "",
+                           str(13.0 + sid / 1000), str(52.0 + sid / 1000)]
+                for sid in (175, 282)}}
+
+    scanned = []
+
+    class RecordingScanner:
+        def __init__(self, api, gcs, bq, station_ids, lookback_days):
+            scanned.extend(station_ids)
+
+        def repair(self):
+            return {"rows": 0}
+
+    monkeypatch.setattr(station_index, "_cached_index", None)
+    monkeypatch.setitem(constants.CONFIG, "station_selection", {"bbox": [52.2, 13.0, 53.0, 14.0]})
+    monkeypatch.setattr(main, "LuftdatenAPIClient", StationsAPI)
+    monkeypatch.setattr(main, "GapScanner", RecordingScanner)
+
+    _, status = main.repair_gaps(DummyRequest())
+
+    assert status == 200
+    assert scanned == [282]
+
+
+class DummyProbe:
+    def __init__(self, api, gcs):
+        self.marked = False
+        DummyProbe.last = self
+
+    def has_new_data(self):
+        return True
+
+    def mark_ingested(self):
+        self.marked = True
+
+
+def test_probe_is_not_built_when_disabled(pipeline, monkeypatch):
+    monkeypatch.setattr(main, "FreshnessProbe", _fail)
+    monkeypatch.setattr(main, "process_measures", lambda api, gcs, bq, scheduler: 1)
+
+    _, status = main.main(DummyRequest())
+
+    assert status == 200
+
+
+@pytest.mark.parametrize("success_count, marked", [(0, False), (2, True)])
+def test_watermark_only_advances_after_a_load(pipeline, monkeypatch, success_count, marked):
+    monkeypatch.setitem(constants.CONFIG, "freshness_probe_enabled", True)
+    monkeypatch.setattr(main, "FreshnessProbe", DummyProbe)
+    monkeypatch.setattr(main, "process_measures", lambda api, gcs, bq, scheduler: success_count)
+
+    _, status = main.main(DummyRequest())
+
+    assert status == 200
+    assert DummyProbe.last.marked is marked
@@ -0,0 +1,94 @@
+from core.measures_processor import MeasuresProcessor
+from config import constants, schemas
+
+
+class DummyGCS:
+    def __init__(self):
+        self.uploaded = {}
+
+    def upload_json(self, data, blob_name):
+        self.uploaded[blob_name] = data
+        return True
+
+
+class DummyAPI:
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.calls = []
+
+    def get_components(self):
+        return {
+            "count": 2,
+            "indices": ["0", "1", "2", "3", "4"],
+            "PM10": ["1", "PM10", "PM10", "µg/m³", "Feinstaub"],
+            "CO": ["2", "CO", "CO", "mg/m³", "Kohlenmonoxid"],
+        }
+
+    def get_measures(self, component_id, station_id, hours_back=24,
+                     scope_id=2, now=None):
+        self.calls.append((component_id, scope_id, now))
+        return self.payloads.get((component_id, scope_id), {"data": {}})
+
+
+class DummyBQ:
+    def __init__(self):
+        self.loaded = []
+
+    def load_table(self, *, rows, table_id, schema, write_disposition):
+        self.loaded.append({
+            "rows": rows,
+            "table_id": table_id,
+            "schema": schema,
+            "write_disposition": write_disposition
+        })
+
+
+def test_process_component_quarantines_bad_rows(monkeypatch):
+    monkeypatch.setitem(constants.CONFIG, "measure_scopes", [2])
+    station = str(constants.CONFIG["station_id"])
+    api = DummyAPI({(5, 2): {"data": {station: {
+        "2025-04-01 10:00:00": [5, 2, 21.0, "2025-04-01 11:00:00", "1"],
+        "2025-04-01 11:00:00": [5, 2, None, "2025-04-01 12:00:00", None],
+    }}}})
+    gcs, bq = DummyGCS(), DummyBQ()
+    processor = MeasuresProcessor(api, gcs=gcs, bq=bq)
+    component = {"id": 5, "code": "NO2", "unit": "µg/m³"}
+    processed = set()
+
+    processor.load_rows(list(processor.process_component(component, processed)))
+
+    assert processed == {5}
+    assert len(bq.loaded) == 1
+    assert bq.loaded[0]["table_id"] == "raw_measures"
+    assert bq.loaded[0]["schema"] == schemas.RAW_MEASURES_SCHEMA
+    assert [r["value"] for r in bq.loaded[0]["rows"]] == [21.0]
+
+    [blob_name] = [name for name in gcs.uploaded if name.startswith("quarantine/")]
+    quarantine = gcs.uploaded[blob_name]
+    assert blob_name.startswith(f"quarantine/station_id={processor.station_id}/component_id=5/scope_id=2/")
+    assert quarantine[0]["reason"] == "null_value"
+
+
+def test_process_measures_reuses_availability_fetch_across_scopes(monkeypatch):
+    monkeypatch.setitem(constants.CONFIG, "measure_scopes", [2, 4])
+    station = str(constants.CONFIG["station_id"])
+    payloads = {
+        (1, 2): {"data": {station: {
+            "2025-04-01 10:00:00": [1, 2, 8.0, "2025-04-01 11:00:00", "1"]}}},
+        (1, 4): {"data": {station: {
+            "2025-04-01 10:00:00": [1, 4, 7.5, "2025-04-01 11:00:00", "1"]}}},
+    }
+    api, gcs, bq = DummyAPI(payloads), DummyGCS(), DummyBQ()
+    processor = MeasuresProcessor(api, gcs, bq)
+
+    assert processor.process_measures() == 1
+
+    # CO has no data and is only checked once; PM10 scope 2 is not refetched
+    assert sorted((c, s) for c, s, _ in api.calls) == [(1, 2), (1, 4), (2, 2)]
+    assert len({now for _, _, now in api.calls}) == 1
+    # both scopes go out together in one batched load
+    assert len(bq.loaded) == 1
+    assert [row["scope_id"] for row in bq.loaded[0]["rows"]] == [2, 4]
+    assert len(gcs.uploaded) == 2
+    assert all(name.startswith(f"raw/station_id={station}/component_id=1/scope_id=")
+               for name in gcs.uploaded)
@@ -0,0 +1,73 @@
+import numpy as np
+from core.measures_validator import MeasuresValidator, build_columns
+
+_COMPONENT = {"id": 1, "code": "PM10", "unit": "µg/m³"}
+
+
+def _measure(value, start_hour, component_id=1):
+    end = f"2025-04-01 {start_hour + 1:02}:00:00"
+    return [component_id, 2, value, end, "1"]
+
+
+def test_validate_keeps_clean_rows():
+    station_data = {
+        "2025-04-01 10:00:00": _measure(12.5, 10),
+        "2025-04-01 11:00:00": _measure(14, 11),
+    }
+    result = MeasuresValidator().validate(_COMPONENT, 175, station_data)
+
+    assert result.quarantine == []
+    assert result.summary["valid"] == 2
+    assert result.rows[0] == {
+        "station_id": 175,
+        "measure_start_time": "2025-04-01T10:00:00",
+        "component_id": 1,
+        "scope_id": 2,
+        "value": 12.5,
+        "measure_end_time": "2025-04-01T11:00:00",
+        "index": "1"
+    }
+
+
+def test_validate_quarantines_each_failure_kind():
+    station_data = {
+        "2025-04-01 01:00:00": _measure(10, 1),
+        "2025-04-01 02:00:00": _measure(10, 2, component_id=99),
+        "not a timestamp": _measure(10, 3),
+        "2025-04-01 04:00:00": _measure(None, 4),
+        "2025-04-01 05:00:00": _measure(-3, 5),
+        "2025-04-01 06:00:00": [1, 2],
+        "2025-03-31 22:00:00": [1, 2, 10, "2025-03-31 23:00:00", "1"],
+        "2025-04-01 07:00:00": _measure(10, 7),
+        "2025-04-01 08:00:00": [1, 2, 10, "2025-04-01 08:00:00", "1"],
+    }
+    result = MeasuresValidator().validate(_COMPONENT, 175, station_data)
+
+    reasons = {q["measure_start_time"]: q["reason"] for q in result.quarantine}
+    assert reasons == {
+        "2025-04-01 02:00:00": "component_mismatch",
+        "not a timestamp": "bad_timestamp",
+        "2025-04-01 04:00:00": "null_value",
+        "2025-04-01 05:00:00": "out_of_range",
+        "2025-04-01 06:00:00": "malformed",
+        "2025-04-01 08:00:00": "bad_interval",
+    }
+    # An hour listed out of key order is valid and comes out sorted by start
+    assert [r["measure_start_time"] for r in result.rows] == [
+        "2025-03-31T22:00:00", "2025-04-01T01:00:00", "2025-04-01T07:00:00"
+    ]
+    assert result.summary["total"] == 9
+    assert result.summary["valid"] == 3
+
+
+def test_build_columns_detects_duplicate_keys_after_rollover():
+    station_data = {
+        "2025-04-01 24:00:00": [1, 2, 10, "2025-04-02 01:00:00", "1"],
+        "2025-04-02 00:00:00": [1, 2, 11, "2025-04-02 01:00:00", "1"],
+    }
+    cols = build_columns(175, station_data)
+    result = MeasuresValidator().validate_columns(_COMPONENT, cols)
+
+    assert result.summary["duplicate"] == 1
+    assert result.quarantine[0]["measure_start_time"] == "2025-04-02 00:00:00"
+    assert result.rows[0]["value"] == 10.0
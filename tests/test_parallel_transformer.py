@@ -0,0 +1,40 @@
+import pytest
+from core.measures_validator import MeasuresValidator
+from core.parallel_transformer import ColumnarBatch, ParallelTransformer
+
+_COMPONENT = {"id": 1, "code": "PM10", "unit": "µg/m³"}
+
+
+def _tasks():
+    good = {
+        f"2025-04-01 {h:02}:00:00": [1, 2, float(h), f"2025-04-01 {h + 1:02}:00:00", "1"]
+        for h in range(1, 23)
+    }
+    bad = {
+        "2025-04-01 01:00:00": [1, 2, None, "2025-04-01 02:00:00", None],
+        "2025-04-01 02:00:00": [1, 2, 5.0, "2025-04-01 03:00:00", None],
+    }
+    return [(_COMPONENT, 175, good), (_COMPONENT, 176, bad)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_transform_matches_validator(workers):
+    batch, quarantine, summary = ParallelTransformer(
+        workers=workers, chunk_rows=10).transform(_tasks())
+
+    expected_rows, expected_quarantine = [], []
+    for component, station_id, station_data in _tasks():
+        result = MeasuresValidator().validate(component, station_id, station_data)
+        expected_rows += result.rows
+        expected_quarantine += result.quarantine
+
+    assert batch.to_rows() == expected_rows
+    assert quarantine == expected_quarantine
+    assert summary["total"] == 24
+    assert summary["valid"] == 23
+    assert summary["null_value"] == 1
+
+
+def test_concat_of_nothing_is_empty():
+    assert len(ColumnarBatch.concat([])) == 0
+    assert ColumnarBatch.empty().to_rows() == []
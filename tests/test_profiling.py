@@ -0,0 +1,59 @@
+import json
+import marshal
+from datetime import datetime, timezone
+import pytest
+from config import constants
+from utils.profiling import RunProfiler, profiling_requested, PROFILE_HEADER
+from utils.time_utils import parse_airquality_timestamp
+from fake_gcs import FakeGCS
+
+_NOW = datetime(2025, 4, 1, 10, 5, tzinfo=timezone.utc)
+
+
+class DummyRequest:
+    def __init__(self, args=None, headers=None):
+        self.args = args or {}
+        self.headers = headers or {}
+
+
+@pytest.fixture
+def token(monkeypatch):
+    monkeypatch.setitem(constants.CONFIG, "profile_token", "s3cret")
+
+
+def test_profiling_requires_flag_and_matching_token(token):
+    assert profiling_requested(DummyRequest({"profile": "1"}, {PROFILE_HEADER: "s3cret"}))
+    assert not profiling_requested(DummyRequest({"profile": "1"}, {PROFILE_HEADER: "wrong"}))
+    assert not profiling_requested(DummyRequest({"profile": "1"}))
+    assert not profiling_requested(DummyRequest({}, {PROFILE_HEADER: "s3cret"}))
+
+
+def test_profiling_disabled_without_configured_token(monkeypatch):
+    monkeypatch.setitem(constants.CONFIG, "profile_token", None)
+    assert not profiling_requested(DummyRequest({"profile": "1"}, {PROFILE_HEADER: ""}))
+
+
+def test_enabled_profiler_uploads_profile_and_allocations():
+    gcs = FakeGCS()
+
+    with RunProfiler(gcs, enabled=True, now=_NOW) as profiler:
+        stamps = [parse_airquality_timestamp(f"2025-04-01 {h % 24:02}:00:00") for h in range(2000)]
+
+    prefix = "profiles/year=2025/month=04/20250401T100500/"
+    assert profiler.link.endswith(prefix)
+    assert sorted(gcs.blobs) == [f"{prefix}allocations.json", f"{prefix}profile.pstats",
+                                 f"{prefix}profile.txt"]
+    stats = marshal.loads(gcs.blobs[f"{prefix}profile.pstats"])
+    assert any(func[2] == "parse_airquality_timestamp" for func in stats)
+    assert b"parse_airquality_timestamp" in gcs.blobs[f"{prefix}profile.txt"]
+    allocations = json.loads(gcs.blobs[f"{prefix}allocations.json"])
+    assert allocations and {"site", "size_bytes", "count"} <= set(allocations[0])
+    assert len(stamps) == 2000
+
+
+def test_disabled_profiler_is_a_no_op():
+    gcs = FakeGCS()
+    with RunProfiler(gcs, enabled=False) as profiler:
+        pass
+    assert profiler.link is None
+    assert gcs.blobs == {}
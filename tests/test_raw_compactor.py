@@ -0,0 +1,92 @@
+from datetime import date
+import pytest
+from core.raw_compactor import RawCompactor
+from fake_gcs import FakeGCS
+
+_PARTITION = "raw/station_id=175/component_id=1/scope_id=2/"
+_DAY = date(2025, 4, 1)
+
+
+def _payload(hours, value):
+    return {"data": {"175": {
+        f"2025-04-01 {h:02}:00:00": [1, 2, value, f"2025-04-01 {h + 1:02}:00:00", "1"]
+        for h in hours
+    }}}
+
+
+def _archive():
+    gcs = FakeGCS()
+    gcs.upload_json(_payload(range(0, 3), 10.0),
+                    f"{_PARTITION}year=2025/month=04/2025-04-01T03:00:05+00:00.json")
+    gcs.upload_json(_payload(range(1, 4), 20.0),
+                    f"{_PARTITION}year=2025/month=04/2025-04-01T04:00:05+00:00.json")
+    # fetched on another day: not part of this compaction
+    gcs.upload_json(_payload(range(0, 2), 30.0),
+                    f"{_PARTITION}year=2025/month=04/2025-04-02T00:00:05+00:00.json")
+    return gcs
+
+
+def test_compact_day_dedupes_to_latest_fetch_and_writes_manifest():
+    gcs = _archive()
+
+    summary = RawCompactor(gcs, io_workers=2).compact_day(_DAY)
+
+    assert summary == {"partitions": 1, "sources": 2, "rows_in": 6, "rows_out": 4}
+    prefix = "compacted/station_id=175/component_id=1/scope_id=2/year=2025/month=04/day=01/"
+    payload = RawCompactor.to_payload(gcs.download_bytes(f"{prefix}measures.parquet"))
+    values = {ts: v[2] for ts, v in payload["data"]["175"].items()}
+    assert values == {
+        "2025-04-01 00:00:00": 10.0,
+        "2025-04-01 01:00:00": 20.0,
+        "2025-04-01 02:00:00": 20.0,
+        "2025-04-01 03:00:00": 20.0,
+    }
+
+    manifest = gcs.download_json(f"{prefix}_manifest.json")
+    assert [s["name"] for s in manifest["sources"]] == sorted(
+        n for n in gcs.list_blobs(_PARTITION) if "2025-04-01T" in n)
+    # raw blobs stay in place for replay
+    assert len(gcs.list_blobs("raw/")) == 3
+
+
+def test_compact_day_is_incremental_and_can_delete_sources():
+    gcs = _archive()
+    compactor = RawCompactor(gcs, delete_sources=True, io_workers=1)
+    compactor.compact_day(_DAY)
+
+    assert compactor.compact_day(_DAY)["sources"] == 0
+
+    gcs.upload_json(_payload([5], 50.0),
+                    f"{_PARTITION}year=2025/month=04/2025-04-01T06:00:05+00:00.json")
+    summary = compactor.compact_day(_DAY)
+
+    assert summary["sources"] == 1
+    assert summary["rows_out"] == 5
+    assert len(gcs.list_blobs("raw/")) == 1
+
+
+def test_failed_manifest_write_keeps_sources():
+    class ManifestFailingGCS(FakeGCS):
+        def upload_json(self, data, destination_blob_name):
+            if destination_blob_name.endswith("_manifest.json"):
+                return False
+            return super().upload_json(data, destination_blob_name)
+
+    gcs = ManifestFailingGCS()
+    gcs.blobs.update(_archive().blobs)
+
+    with pytest.raises(RuntimeError, match="_manifest.json"):
+        RawCompactor(gcs, delete_sources=True).compact_day(_DAY)
+
+    assert len(gcs.list_blobs(_PARTITION)) == 3
+
+
+def test_to_payload_roundtrips_malformed_entries():
+    gcs = FakeGCS()
+    gcs.upload_json({"data": {"175": {"2025-04-01 01:00:00": ["broken"]}}},
+                    f"{_PARTITION}year=2025/month=04/2025-04-01T02:00:00+00:00.json")
+    RawCompactor(gcs).compact_day(_DAY)
+
+    [parquet] = [n for n in gcs.list_blobs("compacted/") if n.endswith(".parquet")]
+    payload = RawCompactor.to_payload(gcs.download_bytes(parquet))
+    assert payload == {"data": {"175": {"2025-04-01 01:00:00": ["broken"]}}}
@@ -0,0 +1,93 @@
+from datetime import date
+from core.parallel_transformer import ParallelTransformer
+from core.raw_compactor import RawCompactor
+from core.replay_engine import ReplayEngine
+from fake_gcs import FakeGCS
+
+_PARTITION = "raw/station_id=175/component_id=1/scope_id=2/year=2025/month=04/"
+
+
+class DummyBQ:
+    def __init__(self):
+        self.loaded = {}
+
+    def load_table(self, *, rows, table_id, schema, write_disposition):
+        self.loaded[table_id] = (write_disposition, rows)
+
+
+def _series(day, hours, value):
+    return {f"2025-04-{day:02} {h:02}:00:00":
+            [1, 2, value, f"2025-04-{day:02} {h + 1:02}:00:00", "1"] for h in hours}
+
+
+def _archive():
+    gcs = FakeGCS()
+    gcs.upload_json({"count": 1, "indices": [], "PM10": ["1", "PM10", "PM10", "µg/m³", "Feinstaub"]},
+                    "dimensions/components/20250401/components_2025-04-01T10:00:00+00:00.json")
+    gcs.upload_json({"data": {"175": _series(1, range(0, 3), 10.0)}},
+                    f"{_PARTITION}2025-04-01T03:00:00+00:00.json")
+    gcs.upload_json({"data": {"175": {**_series(1, range(2, 4), 20.0),
+                                      **_series(2, range(0, 2), 30.0)}}},
+                    f"{_PARTITION}2025-04-02T02:00:00+00:00.json")
+    return gcs
+
+
+def _engine(gcs, bq):
+    return ReplayEngine(gcs, bq, io_workers=2, load_workers=2,
+                        transformer=ParallelTransformer(workers=1))
+
+
+def test_replay_rebuilds_partitions_from_archive_with_latest_fetch():
+    gcs, bq = _archive(), DummyBQ()
+
+    summary = _engine(gcs, bq).replay(date(2025, 4, 1), date(2025, 4, 1))
+
+    assert summary == {"dimensions": 0, "sources": 2, "rows": 4,
+                       "partitions": 1, "quarantined": 0}
+    assert "dim_components" not in bq.loaded
+    disposition, rows = bq.loaded["raw_measures$20250401"]
+    assert disposition == "WRITE_TRUNCATE"
+    assert [(r["measure_start_time"], r["value"]) for r in rows] == [
+        ("2025-04-01T00:00:00", 10.0),
+        ("2025-04-01T01:00:00", 10.0),
+        ("2025-04-01T02:00:00", 20.0),
+        ("2025-04-01T03:00:00", 20.0),
+    ]
+    assert "raw_measures$20250402" not in bq.loaded
+
+
+def test_replay_reads_compacted_files_when_raw_blobs_were_removed():
+    gcs, bq = _archive(), DummyBQ()
+    RawCompactor(gcs, delete_sources=True).compact_day(date(2025, 4, 1))
+    assert not any(name.startswith("raw/") and "2025-04-01T" in name for name in gcs.blobs)
+
+    summary = _engine(gcs, bq).replay(date(2025, 4, 1), date(2025, 4, 1))
+
+    assert summary["rows"] == 4
+    values = [r["value"] for r in bq.loaded["raw_measures$20250401"][1]]
+    assert values == [10.0, 10.0, 20.0, 20.0]
+
+
+def test_replay_prefers_compacted_day_over_its_kept_raw_blobs():
+    gcs, bq = _archive(), DummyBQ()
+    RawCompactor(gcs, delete_sources=False).compact_day(date(2025, 4, 1))
+
+    summary = _engine(gcs, bq).replay(date(2025, 4, 1), date(2025, 4, 1))
+
+    # The compacted 04-01 file replaces its raw blob; the 04-02 fetch still wins
+    assert summary["sources"] == 2
+    values = [r["value"] for r in bq.loaded["raw_measures$20250401"][1]]
+    assert values == [10.0, 10.0, 20.0, 20.0]
+
+
+def test_dimensions_replay_uses_the_newest_snapshot_overall():
+    gcs, bq = _archive(), DummyBQ()
+    gcs.upload_json({"count": 1, "indices": [], "NO2": ["5", "NO2", "NO2", "µg/m³", "Stickstoffdioxid"]},
+                    "dimensions/components/20250501/components_2025-05-01T10:00:00+00:00.json")
+
+    summary = _engine(gcs, bq).replay(date(2025, 4, 1), date(2025, 4, 1), dimensions=True)
+
+    assert summary["dimensions"] == 1
+    disposition, rows = bq.loaded["dim_components"]
+    assert disposition == "WRITE_TRUNCATE"
+    assert [row["code"] for row in rows] == ["NO2"]
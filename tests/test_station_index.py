@@ -0,0 +1,95 @@
+import random
+import pytest
+from core import station_index
+from core.station_index import StationIndex, haversine_km, select_station_ids, update_station_index
+from core.dimension_manager import DimensionManager
+
+
+def _stations(n=300, seed=7):
+    rng = random.Random(seed)
+    stations = [
+        {"station_id": i, "name": f"S{i}",
+         "latitude": rng.uniform(47.2, 55.1), "longitude": rng.uniform(5.8, 15.1)}
+        for i in range(1, n + 1)
+    ]
+    stations.append({"station_id": n + 1, "name": "no coords", "latitude": None, "longitude": None})
+    return stations
+
+
+@pytest.fixture(autouse=True)
+def reset_cache(monkeypatch):
+    monkeypatch.setattr(station_index, "_cached_index", None)
+
+
+def test_nearest_matches_brute_force():
+    stations = _stations()
+    index = StationIndex(stations)
+    located = [s for s in stations if s["latitude"] is not None]
+    rng = random.Random(1)
+
+    for _ in range(50):
+        lat, lon = rng.uniform(47, 55), rng.uniform(6, 15)
+        expected = sorted(located, key=lambda s: haversine_km(lat, lon, s["latitude"], s["longitude"]))[:5]
+        found = index.nearest(lat, lon, k=5)
+        assert [s["station_id"] for _, s in found] == [s["station_id"] for s in expected]
+        assert [d for d, _ in found] == sorted(d for d, _ in found)
+
+
+def test_nearest_respects_max_km():
+    index = StationIndex([
+        {"station_id": 1, "latitude": 52.52, "longitude": 13.40},   # Berlin Mitte
+        {"station_id": 2, "latitude": 52.40, "longitude": 13.06},   # Potsdam
+        {"station_id": 3, "latitude": 48.14, "longitude": 11.58},   # Munich
+    ])
+
+    found = index.nearest(52.52, 13.40, k=3, max_km=50)
+
+    assert [s["station_id"] for _, s in found] == [1, 2]
+    assert found[1][0] == pytest.approx(27, abs=2)
+
+
+def test_within_bbox_matches_brute_force():
+    stations = _stations()
+    index = StationIndex(stations)
+
+    found = index.within_bbox(52.0, 12.5, 53.0, 14.0)
+
+    expected = [s["station_id"] for s in stations
+                if s["latitude"] is not None
+                and 52.0 <= s["latitude"] <= 53.0 and 12.5 <= s["longitude"] <= 14.0]
+    assert [s["station_id"] for s in found] == expected
+    assert index.size == 300
+
+
+def test_index_is_rebuilt_only_when_stations_change():
+    stations = _stations(n=20)
+
+    first = update_station_index(stations)
+    assert update_station_index(list(reversed(stations))) is first
+
+    moved = [dict(s) for s in stations]
+    moved[0]["latitude"] = 50.0
+    assert update_station_index(moved) is not first
+
+
+def test_dimension_manager_refreshes_index():
+    class DummyBQ:
+        def load_table(self, **kwargs):
+            pass
+
+    data = {"data": {"175": ["175", "DEBE010", "Wedding", "", "", "", "", "13.349", "52.543"]}}
+    DimensionManager(None, None, DummyBQ())._load_to_bigquery("stations", data)
+
+    index = station_index.current_station_index()
+    assert [s["station_id"] for _, s in index.nearest(52.5, 13.4)] == [175]
+
+
+def test_select_station_ids():
+    index = StationIndex(_stations(n=50))
+
+    assert select_station_ids(None, index, default=[175]) == [175]
+    assert select_station_ids({"near": [52.5, 13.4], "k": 3}, None, default=[175]) == [175]
+    assert len(select_station_ids({"near": [52.5, 13.4], "k": 3}, index, default=[175])) == 3
+    assert select_station_ids({"bbox": [0, 0, 1, 1]}, index, default=[175]) == [175]
+    with pytest.raises(ValueError):
+        select_station_ids({"circle": 1}, index, default=[175])
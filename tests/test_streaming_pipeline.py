@@ -0,0 +1,66 @@
+import tracemalloc
+from datetime import datetime, timedelta
+from config import constants
+from core.measures_processor import MeasuresProcessor
+
+_HOURS = 240
+
+
+class GeneratingAPI:
+    """Builds each payload on request, so only the pipeline can hold data in memory"""
+    def __init__(self, components):
+        self.components = components
+
+    def get_components(self):
+        return {f"C{i}": [str(i), f"C{i}", "C", "µg/m³", "Synthetic"]
+                for i in range(1, self.components + 1)}
+
+    def get_measures(self, component_id, station_id, hours_back=24,
+                     scope_id=2, now=None):
+        start = datetime(2025, 1, 1)
+        series = {}
+        for h in range(_HOURS):
+            begin = start + timedelta(hours=h)
+            series[begin.strftime("%Y-%m-%d %H:%M:%S")] = [
+                component_id, scope_id, float(h % 50),
+                (begin + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"), "1"]
+        return {"data": {str(station_id): series}}
+
+
+class DiscardingGCS:
+    def upload_json(self, data, blob_name):
+        return True
+
+
+class CountingBQ:
+    def __init__(self):
+        self.rows = 0
+        self.jobs = 0
+
+    def load_table(self, *, rows, table_id, schema, write_disposition):
+        self.rows += sum(1 for _ in rows)
+        self.jobs += 1
+
+
+def _run(components):
+    bq = CountingBQ()
+    processor = MeasuresProcessor(GeneratingAPI(components), DiscardingGCS(), bq)
+    tracemalloc.start()
+    processed = processor.process_measures()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert processed == components
+    assert bq.rows == components * _HOURS
+    return peak, bq
+
+
+def test_peak_memory_stays_flat_as_run_size_grows(monkeypatch):
+    monkeypatch.setitem(constants.CONFIG, "measure_scopes", [2])
+    monkeypatch.setitem(constants.CONFIG, "load_batch_rows", 500)
+
+    small_peak, _ = _run(10)
+    large_peak, bq = _run(100)
+
+    assert bq.jobs == 100 * _HOURS // 500
+    # ten times the data must not mean noticeably more memory
+    assert large_peak < small_peak * 1.5
@@ -0,0 +1,16 @@
+import numpy as np
+from utils.time_utils import parse_airquality_timestamps, airquality_timestamp_to_utc
+
+
+def test_parse_airquality_timestamps_handles_rollover_and_garbage():
+    parsed = parse_airquality_timestamps(
+        ["2025-04-01 23:00:00", "2025-04-01 24:00:00", "garbage"]
+    )
+    assert parsed[0] == np.datetime64("2025-04-01T23:00:00")
+    assert parsed[1] == np.datetime64("2025-04-02T00:00:00")
+    assert np.isnat(parsed[2])
+
+
+def test_airquality_timestamp_to_utc_follows_berlin_offsets():
+    assert airquality_timestamp_to_utc("2025-01-15 24:00:00").isoformat() == "2025-01-15T23:00:00+00:00"
+    assert airquality_timestamp_to_utc("2025-07-15 12:00:00").isoformat() == "2025-07-15T10:00:00+00:00"
@@ -0,0 +1,60 @@
+import asyncio
+import requests
+from requests.adapters import HTTPAdapter
+from services.api_client import LuftdatenAPIClient
+from services.async_api_client import AsyncLuftdatenAPIClient
+from services.transport import PooledHTTPAdapter, pooled_session, shared_adapter
+from utils.instrumentation import metrics
+from uba_stub import UBAStub
+
+
+def _client(url):
+    api = LuftdatenAPIClient()
+    api.BASE_URL = url
+    return api
+
+
+def test_sessions_reuse_pooled_connections_across_clients():
+    with UBAStub() as stub:
+        metrics.reset()
+        first = _client(stub.url)
+        first.get_components()
+        first.session.close()
+        _client(stub.url).get_stations()
+
+        assert metrics.summary()["counters"]["uba_handshakes"] == 1
+        assert first.session.get_adapter(stub.url) is shared_adapter("uba")
+
+
+def test_default_timeouts_apply_unless_given(monkeypatch):
+    seen = []
+    monkeypatch.setattr(HTTPAdapter, "send", lambda self, request, timeout=None, **kw:
+                        seen.append(timeout) or requests.Response())
+    session = pooled_session("uba")
+    session.get("http://127.0.0.1:1/")
+    session.get("http://127.0.0.1:1/", timeout=2)
+
+    assert seen == [shared_adapter("uba").timeout, 2]
+
+
+def test_pool_saturation_is_counted():
+    metrics.reset()
+    adapter = PooledHTTPAdapter("test", pool_connections=1, pool_maxsize=1, timeout=(1, 1))
+    pool = adapter.poolmanager.connection_from_url("http://127.0.0.1:1/")
+    pool._get_conn()
+    pool._get_conn()
+
+    assert metrics.summary()["counters"]["test_pool_saturated"] == 1
+
+
+async def _components_twice(url):
+    async with AsyncLuftdatenAPIClient(base_url=url) as api:
+        await api.get_components()
+        await api.get_components()
+
+
+def test_async_client_counts_handshakes():
+    with UBAStub() as stub:
+        metrics.reset()
+        asyncio.run(_components_twice(stub.url))
+        assert metrics.summary()["counters"]["uba_handshakes"] == 1
@@ -0,0 +1,135 @@
+import pytest
+from config import constants
+from core.measures_processor import MeasuresProcessor
+from core.work_scheduler import WorkScheduler, STATE_BLOB
+from fake_gcs import FakeGCS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class DummyAPI:
+    """Every measures request advances the clock by ``cost`` seconds"""
+
+    def __init__(self, clock, cost=10.0, missing=()):
+        self.clock = clock
+        self.cost = cost
+        self.missing = set(missing)
+        self.calls = []
+
+    def get_components(self):
+        return {
+            "count": 4,
+            "CO": ["2", "CO", "CO", "mg/m³", "Kohlenmonoxid"],
+            "NO2": ["5", "NO2", "NO2", "µg/m³", "Stickstoffdioxid"],
+            "O3": ["3", "O3", "O3", "µg/m³", "Ozon"],
+            "PM10": ["1", "PM10", "PM10", "µg/m³", "Feinstaub"],
+        }
+
+    def get_measures(self, component_id, station_id, hours_back=24, scope_id=2, now=None):
+        self.clock.now += self.cost
+        self.calls.append((station_id, component_id))
+        if component_id in self.missing:
+            return {"data": {}}
+        return {"data": {str(station_id): {
+            "2025-04-01 10:00:00": [component_id, scope_id, 12.0, "2025-04-01 11:00:00", "1"]}}}
+
+
+class DummyBQ:
+    """Every load advances the clock by ``cost`` seconds"""
+
+    def __init__(self, clock=None, cost=0.0):
+        self.clock = clock
+        self.cost = cost
+        self.loaded = []
+
+    def load_table(self, *, rows, table_id, schema, write_disposition):
+        if self.clock is not None:
+            self.clock.now += self.cost
+        self.loaded.extend(rows)
+
+
+@pytest.fixture(autouse=True)
+def config(monkeypatch):
+    monkeypatch.setitem(constants.CONFIG, "measure_scopes", [2])
+    monkeypatch.setitem(constants.CONFIG, "run_safety_seconds", 5)
+    monkeypatch.setitem(constants.CONFIG, "scheduler_default_cost_seconds", 10)
+    monkeypatch.setitem(constants.CONFIG, "scheduler_default_load_seconds", 0)
+
+
+def _run(gcs, budget, stations=(175,)):
+    clock = FakeClock()
+    api, bq = DummyAPI(clock), DummyBQ()
+    scheduler = WorkScheduler(gcs, budget_seconds=budget, clock=clock)
+    processors = {s: MeasuresProcessor(api, gcs, bq, station_id=s) for s in stations}
+    return scheduler, scheduler.run(processors), api
+
+
+def test_priority_components_run_first_and_rest_is_deferred():
+    gcs = FakeGCS()
+
+    scheduler, processed, api = _run(gcs, budget=30)
+
+    # PM10 then NO2 (priority), then the budget no longer fits another item
+    assert api.calls == [(175, 1), (175, 5)]
+    assert processed == 2
+    assert [item.key for item in scheduler.deferred] == ["175:2", "175:3"]
+    state = gcs.download_json(STATE_BLOB)
+    assert state["pending"] == ["175:2", "175:3"]
+    assert state["cost_seconds"]["175:1"] == 10.0
+
+
+def test_carried_over_work_runs_first_next_time():
+    gcs = FakeGCS()
+    _run(gcs, budget=30)
+
+    scheduler, processed, api = _run(gcs, budget=30)
+
+    assert api.calls == [(175, 2), (175, 3)]
+    assert scheduler.deferred[0].key == "175:1"
+
+
+def test_unlimited_budget_processes_everything_across_stations():
+    gcs = FakeGCS()
+
+    scheduler, processed, api = _run(gcs, budget=1000, stations=(175, 10))
+
+    assert processed == 8
+    assert scheduler.deferred == []
+    # Priority ordering holds across stations
+    assert [c for _, c in api.calls[:4]] == [1, 1, 5, 5]
+    assert gcs.download_json(STATE_BLOB)["pending"] == []
+
+
+def test_load_time_is_reserved_and_not_charged_to_items(monkeypatch):
+    monkeypatch.setitem(constants.CONFIG, "load_batch_rows", 1)
+    gcs, clock = FakeGCS(), FakeClock()
+    api, bq = DummyAPI(clock), DummyBQ(clock, cost=8.0)
+    scheduler = WorkScheduler(gcs, budget_seconds=40, clock=clock)
+
+    scheduler.run({175: MeasuresProcessor(api, gcs, bq, station_id=175)})
+
+    # 18s used; 22s left minus 5s safety and an 8s load reserve no longer fits a 10s item
+    assert api.calls == [(175, 1)]
+    state = gcs.download_json(STATE_BLOB)
+    assert state["cost_seconds"]["175:1"] == 10.0
+    assert state["load_seconds"] == 8.0
+
+
+def test_unavailable_items_are_not_recorded_as_done():
+    gcs, clock = FakeGCS(), FakeClock()
+    api = DummyAPI(clock, missing={3})
+    scheduler = WorkScheduler(gcs, budget_seconds=1000, clock=clock)
+
+    processed = scheduler.run({175: MeasuresProcessor(api, gcs, DummyBQ(), station_id=175)})
+
+    assert processed == 3
+    state = gcs.download_json(STATE_BLOB)
+    assert "175:3" not in state["last_done"]
+    assert "175:3" not in state["cost_seconds"]
+    assert set(state["last_done"]) == {"175:1", "175:2", "175:5"}
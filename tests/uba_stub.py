@@ -0,0 +1,140 @@
+"""Local HTTP stand-in for the UBA air_data API used by offline tests."""
+import json
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+DEFAULT_COMPONENTS = {
+    "PM10": ["1", "PM10", "PM10", "µg/m³", "Feinstaub"],
+    "CO": ["2", "CO", "CO", "mg/m³", "Kohlenmonoxid"],
+    "NO2": ["5", "NO2", "NO2", "µg/m³", "Stickstoffdioxid"],
+}
+
+
+class _StubServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops SYNs when the async client opens its pool
+    # at once, and each dropped SYN costs a 1 s retransmit
+    request_queue_size = 128
+
+
+class UBAStub:
+    """
+    Serves components/stations/scopes/measures with synthetic, deterministic payloads.
+
+    ``recorded`` maps request keys (see ``recorded_key``) to captured response
+    bodies, which are replayed instead of the synthetic ones.
+    """
+
+    def __init__(self, station_ids=(175,), components=None, hours=24,
+                 missing=(), fail_first=0, recorded=None):
+        self.station_ids = [int(s) for s in station_ids]
+        self.recorded = recorded or {}
+        self.components = components or DEFAULT_COMPONENTS
+        self.hours = hours
+        self.missing = set(missing)  # (station_id, component_id) pairs without data
+        self.fail_first = fail_first
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self) -> None:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Buffer headers and body so each response leaves in one write; separate
+            # small writes on a keep-alive connection hit the Nagle/delayed-ACK stall
+            # (~40 ms per request). handle_one_request flushes after do_GET.
+            wbufsize = 64 * 1024
+
+            def do_GET(self):
+                status, body = stub._respond(self.path)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = _StubServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _respond(self, path: str):
+        parsed = urlparse(path)
+        endpoint = parsed.path.strip("/")
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        with self._lock:
+            self.requests.append((endpoint, params))
+            if len(self.requests) <= self.fail_first:
+                return 500, {"error": "stub failure"}
+
+        key = self.recorded_key(endpoint, params)
+        if key in self.recorded:
+            return 200, self.recorded[key]
+
+        if endpoint == "components/json":
+            return 200, {"count": len(self.components),
+                         "indices": ["0: Id", "1: Code", "2: Symbol", "3: Unit", "4: Name"],
+                         **self.components}
+        if endpoint == "stations/json":
+            return 200, self.stations_payload()
+        if endpoint == "scopes/json":
+            return 200, {"count": 1, "indices": [],
+                         "2": ["2", "1SMW", "hour", "3600", "x", "Stundenmittel", "y"]}
+        if endpoint == "measures/json":
+            return 200, self.measures_payload(params)
+        return 404, {"error": f"unknown endpoint {endpoint}"}
+
+    @staticmethod
+    def recorded_key(endpoint, params):
+        """components/json, stations/json, scopes/json or measures/<station>/<component>/<scope>"""
+        if endpoint == "measures/json":
+            return f"measures/{params['station']}/{params['component']}/{params.get('scope', 2)}"
+        return endpoint
+
+    def stations_payload(self):
+        return {"request": {}, "indices": [], "count": len(self.station_ids), "data": {
+            str(sid): [str(sid), f"DE{sid}", f"Station {sid}", "Berlin", "", "", "",
+                       str(13.0 + sid / 1000), str(52.0 + sid / 1000)]
+            for sid in self.station_ids
+        }}
+
+    def measures_payload(self, params):
+        station_id = int(params["station"])
+        component_id = int(params["component"])
+        scope_id = int(params.get("scope", 2))
+        if (station_id, component_id) in self.missing:
+            return {"request": params, "indices": [], "data": {}}
+
+        end = datetime.strptime(f"{params['date_to']} {int(params['time_to']):02}",
+                                "%Y-%m-%d %H")
+        series = {}
+        for h in range(self.hours, 0, -1):
+            start = end - timedelta(hours=h)
+            value = round(((station_id * 7 + component_id * 3 + start.hour) % 40) + 0.5, 1)
+            series[start.strftime("%Y-%m-%d %H:%M:%S")] = [
+                component_id, scope_id, value,
+                (start + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"), "1"
+            ]
+        return {"request": params, "indices": [], "data": {str(station_id): series}}